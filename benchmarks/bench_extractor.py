@@ -0,0 +1,130 @@
+"""Benchmark the per-row cost of pulling transaction fields out of CSV records.
+
+Compares the column-name lookups CSVReader used before column schemas with
+the compiled RowExtractor, and with an ``operator.itemgetter`` extractor
+for reference. Each mode skips blank rows and strips the seven fields.
+
+Usage:
+    python benchmarks/bench_extractor.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import logging
+import operator
+import time
+from collections.abc import Callable
+
+from csv2iif.schema import COLUMNS, ColumnSchema
+
+HEADERS = ["Txn Date", "Memo", "Amount", "Debit Acct", "Credit Acct", "Check No", "Payee"]
+SCHEMA = ColumnSchema(
+    aliases={
+        "date": ["Txn Date"],
+        "debit-account": ["Debit Acct"],
+        "credit-account": ["Credit Acct"],
+        "number": ["Check No"],
+        "name": ["Payee"],
+    }
+)
+
+
+def make_rows(rows: int) -> list[list[str]]:
+    """Build synthetic CSV records in HEADERS order, with a blank row every 50."""
+    records = []
+    for i in range(rows):
+        records.append(
+            [
+                f"{i % 12 + 1:02d}/{i % 28 + 1:02d}/2024",
+                f" Synthetic memo {i} ",
+                f"{i % 5000 + 1}.{i % 100:02d}",
+                "Expenses:Tools:Owner Contributed",
+                "Equity:Member's Equity",
+                str(1000 + i),
+                "Office Depot ",
+            ]
+        )
+        if i % 50 == 49:
+            records.append(["", " ", "", "", "", "", ""])
+    return records
+
+
+def extract_by_name(records: list[list[str]], mapping: dict[str, int]) -> list[tuple]:
+    """Extract fields the way CSVReader did: a column-name lookup per field."""
+    fields = []
+    for row in records:
+        if not row or all(not cell.strip() for cell in row):
+            continue
+        fields.append(
+            (
+                row[mapping["date"]].strip(),
+                row[mapping["credit-account"]].strip(),
+                row[mapping["debit-account"]].strip(),
+                row[mapping["number"]].strip(),
+                row[mapping["name"]].strip(),
+                row[mapping["amount"]].strip(),
+                row[mapping["memo"]].strip(),
+            )
+        )
+    return fields
+
+
+def extract_itemgetter(records: list[list[str]], mapping: dict[str, int]) -> list[tuple]:
+    """Extract fields with operator.itemgetter, then strip each value."""
+    get = operator.itemgetter(*[mapping[column] for column in COLUMNS])
+    strip = str.strip
+    return [tuple(map(strip, get(row))) for row in records if row and "".join(row).strip()]
+
+
+def extract_compiled(records: list[list[str]], extract: Callable) -> list[tuple]:
+    """Extract fields with the compiled RowExtractor."""
+    return [extract(row) for row in records if row and "".join(row).strip()]
+
+
+def best_times(modes: dict[str, Callable[[], object]], repeat: int) -> dict[str, float]:
+    """
+    Return the fastest run of each mode, in seconds.
+
+    Modes are run round-robin so background load affects them equally.
+    """
+    best = dict.fromkeys(modes, float("inf"))
+    for _ in range(repeat):
+        for label, run in modes.items():
+            start = time.perf_counter()
+            run()
+            best[label] = min(best[label], time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print the cost per row of each mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows to extract")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode (best is kept)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    records = make_rows(args.rows)
+    extractor = SCHEMA.compile(HEADERS)
+    mapping = extractor.column_mapping
+
+    expected = extract_by_name(records, mapping)
+    assert extract_compiled(records, extractor.extract) == expected
+    assert extract_itemgetter(records, mapping) == expected
+
+    modes = {
+        "column-name lookups": lambda: extract_by_name(records, mapping),
+        "itemgetter + strip": lambda: extract_itemgetter(records, mapping),
+        "compiled extractor": lambda: extract_compiled(records, extractor.extract),
+    }
+    timings = best_times(modes, args.repeat)
+
+    baseline = timings["column-name lookups"]
+    for label, elapsed in timings.items():
+        print(
+            f"{label:<22} {elapsed / len(records) * 1e9:>8.0f} ns/row  "
+            f"({baseline / elapsed:.2f}x vs column-name lookups)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark IIFWriter throughput with and without buffering.
+
+Usage:
+    python benchmarks/bench_iif_writer.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from csv2iif.csv_reader import DEFAULT_BATCH_SIZE
+from csv2iif.iif_writer import DEFAULT_BUFFER_SIZE, IIFWriter
+from csv2iif.models import TransactionBatch, TransactionRow
+
+
+def write_legacy(path: Path, rows: list[TransactionRow]) -> None:
+    """Write rows the way IIFWriter did before buffering: three writes per block."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("!TRNS\tTRNSID\tTRNSTYPE\tDATE\tACCNT\tNAME\tAMOUNT\tDOCNUM\tMEMO\n")
+        f.write("!SPL\tSPLID\tTRNSTYPE\tDATE\tACCNT\tNAME\tAMOUNT\tDOCNUM\tMEMO\n")
+        f.write("!ENDTRNS\n")
+        for t in rows:
+            trns_line = (
+                f"TRNS\t\tGENERAL JOURNAL\t{t.date}\t"
+                f"{t.debit_account}\t{t.name}\t"
+                f"{t.amount}\t{t.number}\t{t.memo}"
+            )
+            spl_line = (
+                f"SPL\t\tGENERAL JOURNAL\t{t.date}\t"
+                f"{t.credit_account}\t{t.name}\t"
+                f"-{t.amount}\t{t.number}\t{t.memo}"
+            )
+            f.write(f"{trns_line}\n")
+            f.write(f"{spl_line}\n")
+            f.write("ENDTRNS\n")
+
+
+def make_batches(rows: int) -> list[TransactionBatch]:
+    """Build validated batches of synthetic transactions."""
+    batches = []
+    for first in range(0, rows, DEFAULT_BATCH_SIZE):
+        batch = TransactionBatch()
+        for i in range(first, min(first + DEFAULT_BATCH_SIZE, rows)):
+            batch.append(
+                f"{i % 12 + 1:02d}/{i % 28 + 1:02d}/2024",
+                "Equity:Member's Equity",
+                "Expenses:Tools:Owner Contributed",
+                str(1000 + i),
+                "Office Depot",
+                f"{i % 5000 + 1}.{i % 100:02d}",
+                f"Synthetic memo {i}",
+                i + 2,
+            )
+        batch.validate(backend="python")
+        batches.append(batch)
+    return batches
+
+
+def best_times(modes: dict[str, Callable[[], object]], repeat: int) -> dict[str, float]:
+    """
+    Return the fastest run of each mode, in seconds.
+
+    Modes are run round-robin so background load affects them equally.
+    """
+    best = dict.fromkeys(modes, float("inf"))
+    for _ in range(repeat):
+        for label, run in modes.items():
+            start = time.perf_counter()
+            run()
+            best[label] = min(best[label], time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print rows/sec for each writer mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows to write")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode (best is kept)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    batches = make_batches(args.rows)
+    rows = [row for batch in batches for row in batch]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        out = Path(temp_dir) / "bench.iif"
+        buffered = f"buffered {DEFAULT_BUFFER_SIZE // 1024} KiB"
+        modes = {
+            "legacy, 3 writes/row": lambda: write_legacy(out, rows),
+            "unbuffered, per row": lambda: IIFWriter(str(out), buffer_size=0).write(rows),
+            f"{buffered}, per row": lambda: IIFWriter(str(out)).write(rows),
+            f"{buffered}, batches": lambda: IIFWriter(str(out)).write_batches(batches),
+        }
+
+        timings = best_times(modes, args.repeat)
+
+    baseline = timings["legacy, 3 writes/row"]
+    for label, elapsed in timings.items():
+        print(
+            f"{label:<28} {args.rows / elapsed:>12,.0f} rows/s  "
+            f"({baseline / elapsed:.2f}x vs legacy)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Benchmark every pipeline stage across several input sizes.
+
+Runs ``csv2iif.bench.run_benchmarks`` once per size and writes a single JSON
+document keyed by row count, so results can be compared between commits.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 10000 100000] [--repeat N] [-o FILE]
+"""
+
+import argparse
+import json
+
+from csv2iif.bench import run_benchmarks
+
+
+def main() -> None:
+    """Run the benchmark at each size and print or save the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Row counts to run"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best is kept)")
+    parser.add_argument("-o", "--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {str(rows): run_benchmarks(rows=rows, repeat=args.repeat) for rows in args.sizes}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,54 @@
 """CSV to IIF converter for QuickBooks 2010."""
 
-from csv2iif.converter import Converter
-from csv2iif.csv_reader import CSVReader
-from csv2iif.iif_writer import IIFWriter
-from csv2iif.models import Transaction
+# Equivalent to typing.TYPE_CHECKING without importing typing at startup;
+# type checkers recognize this assignment.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from csv2iif.aio import aconvert_many
+    from csv2iif.converter import Converter
+    from csv2iif.csv_reader import CSVReader
+    from csv2iif.iif_writer import IIFWriter
+    from csv2iif.metrics import ConversionResult
+    from csv2iif.models import Transaction
+    from csv2iif.schema import ColumnSchema
 
 __version__ = "1.7.0"
-__all__ = ["Converter", "CSVReader", "IIFWriter", "Transaction"]
+__all__ = [
+    "aconvert_many",
+    "ColumnSchema",
+    "Converter",
+    "ConversionResult",
+    "CSVReader",
+    "IIFWriter",
+    "Transaction",
+]
+
+# Public names are imported on first access so that importing the package (and
+# with it every CLI invocation) does not load the whole conversion pipeline.
+_EXPORTS = {
+    "aconvert_many": "csv2iif.aio",
+    "ColumnSchema": "csv2iif.schema",
+    "Converter": "csv2iif.converter",
+    "ConversionResult": "csv2iif.metrics",
+    "CSVReader": "csv2iif.csv_reader",
+    "IIFWriter": "csv2iif.iif_writer",
+    "Transaction": "csv2iif.models",
+}
+
+
+def __getattr__(name: str):
+    """Import a public name from its module on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including the lazily imported exports."""
+    return sorted({*globals(), *__all__})
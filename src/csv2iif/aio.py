@@ -0,0 +1,82 @@
+"""Asyncio conversion API for csv2iif."""
+
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+
+from csv2iif.cache import ConversionCache
+from csv2iif.converter import Converter
+from csv2iif.logger import setup_logger
+from csv2iif.metrics import ConversionResult
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 4
+
+
+@dataclass
+class FileConversion:
+    """Outcome of converting a single file with ``aconvert_many``."""
+
+    input_path: Path
+    output_path: Path
+    result: ConversionResult | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was converted."""
+        return self.error is None
+
+
+async def aconvert_many(
+    files: Iterable[tuple[str | Path, str | Path]],
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    executor: Executor | None = None,
+    backend: str | None = None,
+    cache: ConversionCache | None = None,
+) -> list[FileConversion]:
+    """
+    Convert many files concurrently without blocking the event loop.
+
+    Each file is converted with ``Converter.convert_async`` in ``executor``
+    (default: the event loop's default thread pool); at most
+    ``max_concurrent`` conversions are submitted at a time. A failing file
+    is recorded in its result and does not stop the others. Cancelling the
+    awaiting task cancels every conversion that has not finished.
+
+    Args:
+        files: Pairs of input CSV path and output IIF path
+        max_concurrent: Maximum number of conversions in progress
+        executor: Thread or process pool to run conversions in
+        backend: Validation backend, see ``backends.select_backend``
+        cache: Optional conversion cache shared by every file
+
+    Returns:
+        One FileConversion per input, in input order
+
+    Raises:
+        ValueError: If max_concurrent is less than 1
+    """
+    if max_concurrent < 1:
+        raise ValueError(f"max_concurrent must be at least 1, got: {max_concurrent}")
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def convert_one(input_path: Path, output_path: Path) -> FileConversion:
+        async with semaphore:
+            try:
+                converter = Converter(
+                    str(input_path), str(output_path), backend=backend, cache=cache
+                )
+                result = await converter.convert_async(executor)
+            except Exception as e:
+                logger.error("Failed to convert %s: %s", input_path, e)
+                return FileConversion(input_path, output_path, error=e)
+        return FileConversion(input_path, output_path, result=result)
+
+    pairs = [(Path(input_path), Path(output_path)) for input_path, output_path in files]
+    logger.info("Converting %s files, at most %s at a time", len(pairs), max_concurrent)
+    return list(await asyncio.gather(*(convert_one(*pair) for pair in pairs)))
@@ -0,0 +1,325 @@
+"""Column validation backends for csv2iif.
+
+Dates and amounts in a block of rows can be validated either one value at a
+time in pure Python, or with vectorized NumPy or PyArrow operations when one
+of those optional libraries is installed. The vectorized backends only
+decide which values are plainly valid (zero-padded MM/DD/YYYY dates and
+amounts such as "$1,234.50"); everything else is handed to the pure-Python
+parsers, so all backends produce identical results and error messages.
+"""
+
+import importlib.util
+import os
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from csv2iif.parsing import normalize_amount, validate_date, validate_required_fields
+
+BACKENDS = ("pyarrow", "numpy", "python")
+
+# Blocks smaller than this are validated in pure Python when the backend is
+# chosen automatically, so tiny files never pay for importing NumPy/PyArrow.
+VECTORIZE_MIN_ROWS = 2048
+
+
+class FieldError(NamedTuple):
+    """A validation failure for one row of a block."""
+
+    index: int
+    field: str
+    message: str
+
+
+class ValidationResult(NamedTuple):
+    """Normalized amounts and every row error found in a block."""
+
+    amounts: list[str]
+    errors: list[FieldError]
+
+
+def available_backends() -> list[str]:
+    """
+    List the backends that can run in this environment.
+
+    Returns:
+        Backend names in order of preference
+    """
+    return [
+        name for name in BACKENDS if name == "python" or importlib.util.find_spec(name) is not None
+    ]
+
+
+def select_backend(name: str | None = None, rows: int | None = None) -> str:
+    """
+    Resolve a backend name.
+
+    Args:
+        name: "numpy", "pyarrow", "python", "auto" or None. None reads the
+            ``CSV2IIF_BACKEND`` environment variable and defaults to "auto".
+        rows: Block size, used by "auto" to skip vectorizing tiny blocks
+
+    Returns:
+        Name of an installed backend
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name is None:
+        name = os.getenv("CSV2IIF_BACKEND", "auto")
+    name = name.lower()
+
+    if name == "auto":
+        if rows is not None and rows < VECTORIZE_MIN_ROWS:
+            return "python"
+        return available_backends()[0]
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of: auto, {', '.join(BACKENDS)}")
+    if name not in available_backends():
+        raise ValueError(f"Backend '{name}' is not installed")
+
+    return name
+
+
+def validate_columns(
+    dates: Sequence[str],
+    credit_accounts: Sequence[str],
+    debit_accounts: Sequence[str],
+    amounts: Sequence[str],
+    memos: Sequence[str],
+    backend: str | None = None,
+) -> ValidationResult:
+    """
+    Validate a block of rows given as columns.
+
+    Each row is checked in the same order as Transaction (date, amount,
+    required fields) and reports only its first failure, with the same
+    message Transaction would raise.
+
+    Args:
+        dates: Date column
+        credit_accounts: Credit account column
+        debit_accounts: Debit account column
+        amounts: Raw amount column
+        memos: Memo column
+        backend: Backend name, see ``select_backend``
+
+    Returns:
+        ValidationResult with normalized amounts (raw value for failing rows)
+        and errors sorted by row index
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    backend = select_backend(backend, rows=len(dates))
+    if backend == "numpy":
+        date_ok, fast_amounts = _numpy_fast_paths(dates, amounts)
+    elif backend == "pyarrow":
+        date_ok, fast_amounts = _pyarrow_fast_paths(dates, amounts)
+    else:
+        date_ok, fast_amounts = [False] * len(dates), [None] * len(amounts)
+
+    normalized = list(amounts)
+    errors = []
+    for i, (
+        date,
+        credit_account,
+        debit_account,
+        amount,
+        memo,
+        date_valid,
+        fast_amount,
+    ) in enumerate(
+        zip(
+            dates,
+            credit_accounts,
+            debit_accounts,
+            amounts,
+            memos,
+            date_ok,
+            fast_amounts,
+            strict=True,
+        )
+    ):
+        if (
+            date_valid
+            and fast_amount is not None
+            and credit_account.strip()
+            and debit_account.strip()
+            and memo.strip()
+        ):
+            normalized[i] = fast_amount
+            continue
+
+        field = "date"
+        try:
+            if not date_valid:
+                validate_date(date)
+            field = "amount"
+            amount = fast_amount or normalize_amount(amount)
+            normalized[i] = amount
+            field = "required"
+            validate_required_fields(
+                {
+                    "date": date,
+                    "credit_account": credit_account,
+                    "debit_account": debit_account,
+                    "amount": amount,
+                    "memo": memo,
+                }
+            )
+        except ValueError as e:
+            errors.append(FieldError(i, field, str(e)))
+
+    return ValidationResult(normalized, errors)
+
+
+def _numpy_fast_paths(
+    dates: Sequence[str], amounts: Sequence[str]
+) -> tuple[list[bool], list[str | None]]:
+    """
+    Find plainly valid dates and normalize plain amounts with NumPy.
+
+    Args:
+        dates: Date column
+        amounts: Raw amount column
+
+    Returns:
+        Per-row flag for dates known to be valid, and per-row normalized
+        amount or None where the pure-Python parser must decide
+    """
+    import numpy as np
+
+    if not dates:
+        return [], []
+
+    date_array = np.array(dates, dtype=str)
+    date_codes = _numpy_codepoints(np, date_array)
+    date_lengths = np.fromiter(map(len, dates), dtype=np.int64, count=len(dates))
+    date_lengths[date_lengths != np.char.str_len(date_array)] = -1
+    date_ok = date_lengths == 10
+    if date_codes.shape[1] >= 10:
+        digits = date_codes[:, [0, 1, 3, 4, 6, 7, 8, 9]] - 48
+        date_ok &= (date_codes[:, 2] == 47) & (date_codes[:, 5] == 47)
+        date_ok &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        month = digits[:, 0] * 10 + digits[:, 1]
+        day = digits[:, 2] * 10 + digits[:, 3]
+        year = digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_days = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        max_day = month_days[np.clip(month, 0, 12)] + ((month == 2) & leap)
+        date_ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= max_day) & (year >= 1)
+    else:
+        date_ok[:] = False
+
+    raw_amounts = np.array(amounts, dtype=str)
+    raw_lengths = np.fromiter(map(len, amounts), dtype=np.int64, count=len(amounts))
+    stripped = np.char.replace(np.char.lstrip(raw_amounts, "$"), ",", "")
+    codes = _numpy_codepoints(np, stripped)
+    lengths = np.char.str_len(stripped).astype(np.int64)
+    lengths[raw_lengths != np.char.str_len(raw_amounts)] = -1
+    in_string = np.arange(codes.shape[1]) < lengths[:, None]
+    is_digit = (codes >= 48) & (codes <= 57) & in_string
+    is_dot = (codes == 46) & in_string
+    dot_count = is_dot.sum(axis=1)
+    dot_pos = np.where(dot_count > 0, is_dot.argmax(axis=1), lengths)
+    amount_ok = (
+        (lengths > 0)
+        & (is_digit.sum(axis=1) + dot_count == lengths)
+        & (dot_count <= 1)
+        & (dot_pos >= 1)
+        & (lengths - dot_pos <= 3)
+        & (is_digit & (codes != 48)).any(axis=1)
+    )
+
+    fast_amounts: list[str | None] = [None] * len(amounts)
+    indexes = np.flatnonzero(amount_ok)
+    if len(indexes):
+        parts = np.char.partition(stripped[indexes], ".")
+        whole = np.char.lstrip(parts[:, 0], "0")
+        whole = np.where(whole == "", "0", whole)
+        fraction = np.char.ljust(parts[:, 2], 2, "0")
+        for i, value in zip(
+            indexes.tolist(), np.char.add(np.char.add(whole, "."), fraction).tolist(), strict=True
+        ):
+            fast_amounts[i] = value
+
+    return date_ok.tolist(), fast_amounts
+
+
+def _numpy_codepoints(np, array):
+    """
+    View a NumPy string array as a 2-D array of Unicode code points.
+
+    Values whose length differs from what NumPy stores (trailing NULs are
+    dropped by NumPy) are flagged by the callers, which compare against the
+    Python string lengths.
+
+    Args:
+        np: The numpy module
+        array: 1-D array with a ``<U`` dtype
+
+    Returns:
+        Array of shape (len(array), width) holding int64 code points
+    """
+    width = max(array.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(array).view(np.uint32).reshape(len(array), width)
+    return codes.astype(np.int64)
+
+
+def _pyarrow_fast_paths(
+    dates: Sequence[str], amounts: Sequence[str]
+) -> tuple[list[bool], list[str | None]]:
+    """
+    Find plainly valid dates and normalize plain amounts with PyArrow compute.
+
+    Args:
+        dates: Date column
+        amounts: Raw amount column
+
+    Returns:
+        Per-row flag for dates known to be valid, and per-row normalized
+        amount or None where the pure-Python parser must decide
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not dates:
+        return [], []
+
+    date_array = pa.array(dates, type=pa.string())
+    shaped = pc.match_substring_regex(
+        date_array, r"^(0[1-9]|1[0-2])/(0[1-9]|[12][0-9]|3[01])/[0-9]{4}$"
+    )
+    date_array = pc.if_else(shaped, date_array, "01/01/2000")
+    month = pc.cast(pc.utf8_slice_codeunits(date_array, 0, 2), pa.int64(), safe=False)
+    day = pc.cast(pc.utf8_slice_codeunits(date_array, 3, 5), pa.int64(), safe=False)
+    year = pc.cast(pc.utf8_slice_codeunits(date_array, 6, 10), pa.int64(), safe=False)
+    leap = pc.and_(
+        pc.equal(pc.bit_wise_and(year, 3), 0),
+        pc.or_(
+            pc.not_equal(pc.subtract(year, pc.multiply(pc.divide(year, 100), 100)), 0),
+            pc.equal(pc.subtract(year, pc.multiply(pc.divide(year, 400), 400)), 0),
+        ),
+    )
+    month_days = pc.take(pa.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]), month)
+    max_day = pc.add(month_days, pc.cast(pc.and_(pc.equal(month, 2), leap), pa.int64()))
+    date_ok = pc.and_(
+        shaped,
+        pc.and_(pc.less_equal(day, max_day), pc.greater_equal(year, 1)),
+    )
+
+    stripped = pc.replace_substring(
+        pc.utf8_ltrim(pa.array(amounts, type=pa.string()), characters="$"), ",", ""
+    )
+    parts = pc.extract_regex(stripped, r"^(?P<whole>[0-9]+)(?:\.(?P<fraction>[0-9]{0,2}))?$")
+    amount_ok = pc.and_(pc.is_valid(parts), pc.match_substring_regex(stripped, r"[1-9]"))
+    whole = pc.utf8_ltrim(pc.struct_field(parts, "whole"), characters="0")
+    whole = pc.if_else(pc.equal(whole, ""), "0", whole)
+    fraction = pc.utf8_rpad(pc.struct_field(parts, "fraction"), width=2, padding="0")
+    normalized = pc.binary_join_element_wise(whole, fraction, ".")
+    normalized = pc.if_else(
+        pc.fill_null(amount_ok, False), normalized, pa.scalar(None, pa.string())
+    )
+
+    return pc.fill_null(date_ok, False).to_pylist(), normalized.to_pylist()
@@ -0,0 +1,150 @@
+"""Batch directory conversion for csv2iif."""
+
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from csv2iif.cache import ConversionCache
+from csv2iif.compression import compression_from_suffix
+from csv2iif.converter import Converter
+from csv2iif.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CSV_SUFFIXES = (".csv", ".csv.gz", ".csv.bz2", ".csv.xz")
+
+
+@dataclass
+class BatchResult:
+    """Outcome of converting a single file in a batch."""
+
+    input_path: Path
+    output_path: Path
+    ok: bool
+    elapsed: float
+    transactions: int = 0
+    error: str | None = None
+
+
+def find_csv_files(input_dir: Path) -> list[Path]:
+    """
+    Find all CSV files below a directory.
+
+    Plain and compressed exports (see ``CSV_SUFFIXES``) are found; suffixes
+    are matched case-insensitively.
+
+    Args:
+        input_dir: Directory to search recursively
+
+    Returns:
+        Sorted list of CSV file paths
+
+    Raises:
+        NotADirectoryError: If input_dir is not a directory
+    """
+    if not input_dir.is_dir():
+        raise NotADirectoryError(f"Input directory not found: {input_dir}")
+
+    return sorted(
+        p for p in input_dir.rglob("*") if p.is_file() and p.name.lower().endswith(CSV_SUFFIXES)
+    )
+
+
+def iif_path(csv_path: Path) -> Path:
+    """
+    Return the IIF path for a CSV file, dropping any compression suffix.
+
+    Args:
+        csv_path: Path to CSV file, such as ``bank.csv`` or ``bank.csv.gz``
+
+    Returns:
+        Path with the ``.iif`` suffix, such as ``bank.iif``
+    """
+    if compression_from_suffix(csv_path) is not None:
+        csv_path = csv_path.with_suffix("")
+    return csv_path.with_suffix(".iif")
+
+
+def convert_directory(
+    input_dir: str,
+    output_dir: str | None = None,
+    jobs: int = 1,
+    cache: ConversionCache | None = None,
+) -> list[BatchResult]:
+    """
+    Convert every CSV file below a directory to IIF.
+
+    Each input produces one IIF file at the same relative path under
+    ``output_dir`` (or next to the input when no output directory is given),
+    with compression suffixes dropped, so ``bank.csv.gz`` becomes
+    ``bank.iif``. A failing file is recorded in its result and does not stop
+    the others.
+
+    Args:
+        input_dir: Directory containing CSV files
+        output_dir: Directory for IIF files, defaults to input_dir
+        jobs: Number of worker processes
+        cache: Optional conversion cache shared by every file
+
+    Returns:
+        One BatchResult per input file, in sorted input order
+
+    Raises:
+        NotADirectoryError: If input_dir is not a directory
+        ValueError: If jobs is less than 1, or two inputs (such as
+            ``bank.csv`` and ``bank.csv.gz``) would write the same IIF file
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got: {jobs}")
+
+    input_root = Path(input_dir)
+    output_root = Path(output_dir) if output_dir else input_root
+    inputs = find_csv_files(input_root)
+    outputs = [output_root / iif_path(p.relative_to(input_root)) for p in inputs]
+    duplicates = sorted(str(p) for p, n in Counter(outputs).items() if n > 1)
+    if duplicates:
+        raise ValueError(f"Several inputs would be written to: {', '.join(duplicates)}")
+
+    logger.info("Converting %s CSV files from %s with %s workers", len(inputs), input_root, jobs)
+
+    if jobs == 1 or len(inputs) <= 1:
+        return [_convert_one(src, dst, cache) for src, dst in zip(inputs, outputs, strict=True)]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_convert_one, inputs, outputs, [cache] * len(inputs)))
+
+
+def _convert_one(
+    input_path: Path, output_path: Path, cache: ConversionCache | None = None
+) -> BatchResult:
+    """
+    Convert a single file, capturing any error in the result.
+
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path to output IIF file
+        cache: Optional conversion cache
+
+    Returns:
+        BatchResult describing the outcome
+    """
+    start = time.perf_counter()
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        converter = Converter(str(input_path), str(output_path), cache=cache)
+        transactions = converter.convert().transactions
+    except Exception as e:
+        logger.error("Failed to convert %s: %s", input_path, e)
+        return BatchResult(
+            input_path, output_path, ok=False, elapsed=time.perf_counter() - start, error=str(e)
+        )
+
+    return BatchResult(
+        input_path,
+        output_path,
+        ok=True,
+        elapsed=time.perf_counter() - start,
+        transactions=transactions,
+    )
@@ -0,0 +1,238 @@
+"""Throughput benchmarks and synthetic data for csv2iif."""
+
+import csv
+import gc
+import logging
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from csv2iif.cleaner import clean_csv
+from csv2iif.converter import Converter
+from csv2iif.csv_reader import CSVReader
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.models import Transaction
+
+STAGES = ("read", "validate", "write", "convert", "clean")
+
+_COLUMNS = ["date", "credit-account", "debit-account", "number", "name", "amount", "memo"]
+_ACCOUNT_PARTS = [
+    ["Assets", "Liabilities", "Equity", "Income", "Expenses"],
+    ["Checking", "Savings", "Member's Equity", "Sales", "Tools", "Office", "Travel"],
+    ["Owner Contributed", "Supplies", "Hardware", "Software", "Meals", "Lodging"],
+]
+_NAMES = ["John Doe", "Office Depot", "Acme Corp", "Hardware Store", "Jane Smith"]
+_MEMOS = ["Payment received", "Printer paper", "Drill set contribution", "Monthly fee"]
+
+
+def generate_csv(
+    path: str | Path,
+    rows: int,
+    seed: int = 0,
+    shuffle_columns: bool = True,
+    blank_every: int = 50,
+    account_depth: int = 3,
+) -> int:
+    """
+    Write a synthetic CSV file that CSVReader accepts.
+
+    The data mixes the shapes seen in real exports: headers in a shuffled
+    order with stray whitespace and capitals plus an extra unused column,
+    amounts such as "$1,275.00", "75.5" and "500", colon-separated
+    hierarchical accounts, empty numbers and names, and empty or
+    whitespace-only rows.
+
+    Args:
+        path: Output CSV path
+        rows: Number of transaction rows
+        seed: Random seed, so the same arguments always give the same file
+        shuffle_columns: Shuffle the column order
+        blank_every: Insert a blank row after every N transactions (0 = none)
+        account_depth: Maximum number of levels in account names (1-3)
+
+    Returns:
+        Number of blank rows written
+    """
+    rng = random.Random(seed)
+    columns = [*_COLUMNS, "notes"]
+    if shuffle_columns:
+        rng.shuffle(columns)
+    headers = [f" {c.title()} " if rng.random() < 0.3 else c for c in columns]
+    depth = max(1, min(account_depth, len(_ACCOUNT_PARTS)))
+    accounts = [
+        ":".join(rng.choice(part) for part in _ACCOUNT_PARTS[: rng.randint(1, depth)])
+        for _ in range(64)
+    ]
+
+    blanks = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for i in range(rows):
+            cents = rng.randint(1, 500_000)
+            shape = i % 4
+            if shape == 0:
+                amount = f"${cents / 100:,.2f}"
+            elif shape == 1:
+                amount = f"{cents // 100 + 1}.{cents % 100 // 10}"
+            elif shape == 2:
+                amount = str(cents // 100 + 1)
+            else:
+                amount = f"{cents / 100:.2f}"
+            month, day, year = rng.randint(1, 12), rng.randint(1, 28), rng.randint(2000, 2030)
+            values = {
+                "date": f"{month:02d}/{day:02d}/{year}",
+                "credit-account": rng.choice(accounts),
+                "debit-account": rng.choice(accounts),
+                "number": str(1000 + i) if i % 3 else "",
+                "name": rng.choice(_NAMES) if i % 5 else "",
+                "amount": amount,
+                "memo": f"{rng.choice(_MEMOS)} {i}",
+                "notes": "",
+            }
+            writer.writerow([values[c] for c in columns])
+            if blank_every and (i + 1) % blank_every == 0:
+                writer.writerow([] if blanks % 2 else [" "] * len(columns))
+                blanks += 1
+
+    return blanks
+
+
+def run_benchmarks(
+    rows: int = 100_000,
+    repeat: int = 3,
+    stages: list[str] | None = None,
+    seed: int = 0,
+    csv_path: str | Path | None = None,
+    **shape: Any,
+) -> dict[str, Any]:
+    """
+    Time each pipeline stage on a synthetic CSV file.
+
+    Stages are "read" (``CSVReader.read``), "validate" (building Transaction
+    objects from already-parsed rows), "write" (``IIFWriter.write``),
+    "convert" (``Converter.convert``, end to end) and "clean" (the clean
+    command). Each stage keeps its fastest of ``repeat`` runs, then runs once
+    more under tracemalloc to record its peak Python memory. Log output is
+    suppressed while timing.
+
+    Args:
+        rows: Number of transaction rows to generate
+        repeat: Timed runs per stage
+        stages: Stages to run, defaults to all of ``STAGES``
+        seed: Random seed for the generated data
+        csv_path: Keep the generated CSV at this path instead of a temp dir
+        **shape: Extra keyword arguments for ``generate_csv``
+
+    Returns:
+        JSON-serializable report with one entry per stage
+
+    Raises:
+        ValueError: If a stage name is unknown or repeat is less than 1
+    """
+    stages = list(stages or STAGES)
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark stage: {', '.join(unknown)}")
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got: {repeat}")
+
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work = Path(temp_dir)
+            input_path = Path(csv_path) if csv_path else work / "bench.csv"
+            blanks = generate_csv(input_path, rows, seed=seed, **shape)
+            report: dict[str, Any] = {
+                "rows": rows,
+                "blank_rows": blanks,
+                "input_bytes": input_path.stat().st_size,
+                "repeat": repeat,
+                "seed": seed,
+                "python": platform.python_version(),
+                "stages": {},
+            }
+            for stage in stages:
+                run = _stage_runner(stage, input_path, work)
+                seconds = min(_timed(run) for _ in range(repeat))
+                report["stages"][stage] = {
+                    "seconds": seconds,
+                    "rows_per_sec": rows / seconds if seconds else None,
+                    "peak_memory_bytes": _peak_memory(run),
+                }
+    finally:
+        logging.disable(previous_disable)
+
+    return report
+
+
+def _stage_runner(stage: str, input_path: Path, work: Path) -> Callable[[], object]:
+    """
+    Build a zero-argument callable that runs one stage.
+
+    Inputs a stage depends on (parsed rows for "validate", transactions for
+    "write") are prepared here so they are not part of the measurement.
+
+    Args:
+        stage: Stage name
+        input_path: Generated CSV file
+        work: Directory for output files
+
+    Returns:
+        Callable that performs the stage once
+    """
+    output_path = work / f"{stage}.out"
+    if stage == "read":
+        return lambda: CSVReader(str(input_path)).read()
+    if stage == "validate":
+        raw_rows = _raw_rows(input_path)
+        return lambda: [Transaction(*row) for row in raw_rows]
+    if stage == "write":
+        transactions = CSVReader(str(input_path)).read()
+        return lambda: IIFWriter(str(output_path)).write(transactions)
+    if stage == "convert":
+        return lambda: Converter(str(input_path), str(output_path)).convert()
+    return lambda: clean_csv(input_path, output_path)
+
+
+def _raw_rows(input_path: Path) -> list[tuple[str, ...]]:
+    """
+    Extract stripped, unvalidated field values in Transaction order.
+
+    Args:
+        input_path: CSV file
+
+    Returns:
+        One tuple of field values per non-blank row
+    """
+    reader = CSVReader(str(input_path))
+    with open(input_path, encoding="utf-8") as f:
+        rows = csv.reader(f)
+        reader._validate_headers(next(rows))
+        extract = reader.extractor.extract
+        return [extract(row) for row in rows if row and "".join(row).strip()]
+
+
+def _timed(run: Callable[[], object]) -> float:
+    """Return the wall time of one call, in seconds."""
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def _peak_memory(run: Callable[[], object]) -> int:
+    """Return the peak traced memory of one call, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,321 @@
+"""Content-addressed conversion cache for csv2iif."""
+
+import hashlib
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from csv2iif import __version__
+from csv2iif.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+_SIZE_SUFFIXES = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+@dataclass
+class CacheHit:
+    """Counts stored with a cached IIF file."""
+
+    transactions: int
+    rows_read: int
+    blank_rows: int
+
+
+@dataclass
+class CacheStats:
+    """Summary of a cache directory."""
+
+    directory: str
+    entries: int
+    size_bytes: int
+    max_size_bytes: int
+
+
+class ConversionCache:
+    """
+    On-disk cache of IIF output keyed by input content, version and options.
+
+    Each entry is an IIF file plus a small JSON file with its counts, stored
+    under ``objects/`` by key. The JSON file is written last and removed
+    first, so an entry is complete whenever it exists.
+
+    Several processes may share a directory without locking: entries are
+    written to temporary files and renamed into place, the same key always
+    holds the same content, and an entry evicted by another process is
+    treated as a miss. Least recently used entries are evicted once the
+    total size exceeds ``max_size``; hits refresh an entry's modification
+    time.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_size: int | None = None,
+        link: bool = False,
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            directory: Cache directory (default: ``CSV2IIF_CACHE_DIR`` or
+                ``csv2iif`` under the user cache directory)
+            max_size: Size limit in bytes (default: ``CSV2IIF_CACHE_MAX_SIZE``,
+                which accepts K, M and G suffixes, or 512M)
+            link: Hard-link entries to and from outputs instead of copying.
+                The output then shares its contents with the entry, so it
+                must not be modified in place.
+
+        Raises:
+            ValueError: If ``CSV2IIF_CACHE_MAX_SIZE`` is not a valid size
+        """
+        self.directory = Path(directory).expanduser() if directory else default_cache_dir()
+        if max_size is None:
+            env_size = os.getenv("CSV2IIF_CACHE_MAX_SIZE")
+            max_size = parse_size(env_size) if env_size else DEFAULT_MAX_SIZE
+        self.max_size = max_size
+        self.link = link
+        self.objects = self.directory / "objects"
+
+    def key(self, input_path: str | Path, options: dict[str, Any] | None = None) -> str:
+        """
+        Compute the cache key for an input file.
+
+        Args:
+            input_path: Path to CSV file
+            options: Conversion options that change the output
+
+        Returns:
+            Hex SHA-256 of the csv2iif version, the options and the file
+            contents
+        """
+        import json
+
+        digest = hashlib.sha256()
+        header = {"version": __version__, "options": options or {}}
+        digest.update(json.dumps(header, sort_keys=True).encode())
+        digest.update(b"\0")
+        with open(input_path, "rb") as f:
+            while block := f.read(1024 * 1024):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fetch(self, key: str, output_path: str | Path) -> CacheHit | None:
+        """
+        Place a cached IIF file at ``output_path``.
+
+        Args:
+            key: Cache key
+            output_path: Where to write the IIF file
+
+        Returns:
+            Counts for the cached conversion, or None on a miss
+        """
+        import json
+
+        iif_path, meta_path = self._entry_paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                hit = CacheHit(**json.load(f))
+            self._materialize(iif_path, Path(output_path))
+            os.utime(meta_path)
+        except (OSError, ValueError, TypeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Ignoring unreadable cache entry %s: %s", key, e)
+            logger.debug("Cache miss: %s", key)
+            return None
+
+        logger.info("Cache hit: %s", key)
+        return hit
+
+    def store(self, key: str, output_path: str | Path, hit: CacheHit) -> None:
+        """
+        Add an IIF file to the cache, then evict entries over the size limit.
+
+        Args:
+            key: Cache key
+            output_path: IIF file to store
+            hit: Counts to return for later hits
+        """
+        import json
+
+        iif_path, meta_path = self._entry_paths(key)
+        iif_path.parent.mkdir(parents=True, exist_ok=True)
+        self._materialize(Path(output_path), iif_path)
+
+        tmp_path = self._tmp_path(meta_path)
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(hit), f)
+            os.replace(tmp_path, meta_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        logger.debug("Cached %s as %s", output_path, key)
+        self.evict()
+
+    def evict(self, max_size: int | None = None) -> int:
+        """
+        Remove least recently used entries until the cache fits its limit.
+
+        Args:
+            max_size: Size limit in bytes (default: the cache's limit)
+
+        Returns:
+            Number of entries removed
+        """
+        limit = self.max_size if max_size is None else max_size
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, key, size in sorted(entries):
+            if total <= limit:
+                break
+            self._remove(key)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info("Evicted %s cache entries from %s", removed, self.directory)
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove every entry.
+
+        Returns:
+            Number of entries removed
+        """
+        return self.evict(max_size=-1)
+
+    def stats(self) -> CacheStats:
+        """
+        Summarize the cache contents.
+
+        Returns:
+            CacheStats for this directory
+        """
+        entries = self._entries()
+        return CacheStats(
+            directory=str(self.directory),
+            entries=len(entries),
+            size_bytes=sum(size for _, _, size in entries),
+            max_size_bytes=self.max_size,
+        )
+
+    def _entries(self) -> list[tuple[int, str, int]]:
+        """
+        List complete entries.
+
+        Returns:
+            ``(last_used_ns, key, size_bytes)`` for every entry
+        """
+        entries = []
+        if not self.objects.is_dir():
+            return entries
+
+        for meta_path in self.objects.glob("*/*.json"):
+            key = meta_path.stem
+            try:
+                used = meta_path.stat().st_mtime_ns
+                size = meta_path.with_suffix(".iif").stat().st_size
+            except FileNotFoundError:
+                continue
+            entries.append((used, key, size))
+        return entries
+
+    def _remove(self, key: str) -> None:
+        """Delete an entry; missing files are ignored."""
+        iif_path, meta_path = self._entry_paths(key)
+        meta_path.unlink(missing_ok=True)
+        iif_path.unlink(missing_ok=True)
+
+    def _entry_paths(self, key: str) -> tuple[Path, Path]:
+        """
+        Return the IIF and metadata paths for a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Paths of the entry's IIF and JSON files
+        """
+        base = self.objects / key[:2] / key
+        return base.with_suffix(".iif"), base.with_suffix(".json")
+
+    def _materialize(self, source: Path, target: Path) -> None:
+        """
+        Copy or hard-link ``source`` to ``target`` through a temporary file.
+
+        Hard links fall back to a copy across file systems.
+
+        Args:
+            source: Existing file
+            target: Path to create or replace
+        """
+        tmp_path = self._tmp_path(target)
+        try:
+            if self.link:
+                try:
+                    os.link(source, tmp_path)
+                except OSError as e:
+                    if isinstance(e, FileNotFoundError):
+                        raise
+                    shutil.copyfile(source, tmp_path)
+            else:
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        """Return a unique temporary path next to ``path``."""
+        return path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the cache directory used when none is given.
+
+    Returns:
+        ``CSV2IIF_CACHE_DIR`` if set, else ``csv2iif`` under
+        ``XDG_CACHE_HOME`` or ``~/.cache``
+    """
+    directory = os.getenv("CSV2IIF_CACHE_DIR")
+    if directory:
+        return Path(directory).expanduser()
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "csv2iif"
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a byte size such as ``1048576``, ``512M`` or ``2G``.
+
+    Args:
+        value: Size in bytes with an optional K, M or G suffix
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the size is not valid
+    """
+    text = value.strip().upper().removesuffix("B")
+    multiplier = _SIZE_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    try:
+        size = int(text) * multiplier
+    except ValueError:
+        raise ValueError(f"Invalid cache size: {value}") from None
+    if size < 0:
+        raise ValueError(f"Invalid cache size: {value}")
+    return size
@@ -0,0 +1,108 @@
+"""CSV cleaning for csv2iif."""
+
+import csv
+from collections.abc import Callable, Iterator
+from contextlib import nullcontext
+from pathlib import Path
+
+from csv2iif.compression import compression_from_suffix, open_input
+from csv2iif.fileutils import atomic_write
+from csv2iif.logger import setup_logger
+from csv2iif.profiling import StageTimer
+
+logger = setup_logger(__name__)
+
+
+def clean_csv(
+    input_path: str | Path,
+    output_path: str | Path,
+    profiler: StageTimer | None = None,
+    compression: str | None = None,
+) -> int:
+    """
+    Trim cells, drop duplicate headers and remove blank rows from a CSV file.
+
+    Header names are stripped and later duplicates (compared
+    case-insensitively) and empty names are dropped. Data rows that are empty
+    or contain only whitespace are skipped, and every remaining row is cut to
+    the number of kept headers.
+
+    Rows are streamed one at a time, so memory use does not depend on the
+    file size. Output goes to a temporary file next to ``output_path`` that
+    replaces it only on success, which also makes cleaning a file in place
+    safe: pass the same path for input and output. Compressed input is
+    detected from its contents.
+
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path to write the cleaned CSV file
+        profiler: Optional timer for the "read", "clean" and "write" stages
+        compression: Compress the output with "gzip", "bz2" or "xz"
+            (default: chosen from the extension of ``output_path``)
+
+    Returns:
+        Number of data rows written
+
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        ValueError: If the input file is empty or the compression is not
+            supported
+    """
+    stage = profiler.stage if profiler is not None else lambda name: nullcontext()
+
+    # The input is closed before the output replaces it, which matters when
+    # both are the same file.
+    compression = compression or compression_from_suffix(output_path)
+    with (
+        atomic_write(Path(output_path), newline="", compression=compression) as outfile,
+        open_input(input_path) as infile,
+    ):
+        rows = csv.reader(infile)
+        write_row = csv.writer(outfile).writerow
+        if profiler is not None:
+            rows = profiler.wrap(rows, "read")
+            write_row = profiler.timed(write_row, "write")
+
+        with stage("clean"):
+            count = _clean_rows(rows, write_row)
+
+    logger.debug("Cleaned %s rows from %s", count, input_path)
+    return count
+
+
+def _clean_rows(rows: Iterator[list[str]], write_row: Callable[[list[str]], object]) -> int:
+    """
+    Clean the header, then each data row, writing them as they are read.
+
+    Args:
+        rows: CSV records, header first
+        write_row: Writes one cleaned record
+
+    Returns:
+        Number of data rows written
+
+    Raises:
+        ValueError: If there is no header row
+    """
+    headers = next(rows, None)
+    if headers is None:
+        raise ValueError("CSV file is empty")
+
+    seen = set()
+    unique_headers = []
+    for h in headers:
+        h = h.strip()
+        if h and h.lower() not in seen:
+            unique_headers.append(h)
+            seen.add(h.lower())
+    write_row(unique_headers)
+
+    width = len(unique_headers)
+    count = 0
+    for row in rows:
+        if not row or all(not cell.strip() for cell in row):
+            continue
+        write_row([cell.strip() for cell in row[:width]])
+        count += 1
+
+    return count
@@ -1,14 +1,10 @@
 """Command-line interface for csv2iif."""
 
 import argparse
+import os
 import sys
 
-from dotenv import load_dotenv
-
-from csv2iif.converter import Converter
-from csv2iif.logger import setup_logger
-
-load_dotenv()
+COMMANDS = ["convert", "convert-dir", "validate", "clean", "bench", "cache", "watch", "serve"]
 
 
 def parse_args() -> argparse.Namespace:
@@ -17,12 +13,23 @@ def parse_args() -> argparse.Namespace:
     Returns:
         Parsed arguments
     """
-    if len(sys.argv) >= 3 and sys.argv[1] not in ["convert", "validate", "clean", "-h", "--help"]:
+    if len(sys.argv) >= 3 and sys.argv[1] not in [*COMMANDS, "-h", "--help"]:
         args = argparse.Namespace()
         args.command = "convert"
         args.input = sys.argv[1]
         args.output = sys.argv[2]
         args.verbose = len(sys.argv) == 4 and sys.argv[3] in ["-v", "--verbose"]
+        args.jobs = 1
+        args.backend = None
+        args.profile = False
+        args.profile_output = None
+        args.metrics_json = None
+        args.incremental = False
+        args.cache = False
+        args.cache_link = False
+        args.compress = None
+        args.accounts = None
+        args.schema = None
         return args
 
     parser = argparse.ArgumentParser(
@@ -35,6 +42,42 @@ def parse_args() -> argparse.Namespace:
     convert_parser = subparsers.add_parser("convert", help="Convert CSV to IIF")
     convert_parser.add_argument("input", type=str, help="Input CSV file path")
     convert_parser.add_argument("output", type=str, help="Output IIF file path")
+    convert_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for chunked conversion (default: 1)",
+    )
+    convert_parser.add_argument(
+        "--backend",
+        choices=["auto", "pyarrow", "numpy", "python"],
+        default=None,
+        help="Validation backend (default: CSV2IIF_BACKEND or auto)",
+    )
+    convert_parser.add_argument(
+        "--metrics-json",
+        type=str,
+        metavar="PATH",
+        help="Write throughput metrics for the run to PATH as JSON",
+    )
+    convert_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only convert rows appended since the last --incremental run "
+        "(tracked in OUTPUT.manifest.json)",
+    )
+    convert_parser.add_argument(
+        "--accounts",
+        type=str,
+        metavar="TYPES",
+        help="Start the IIF file with an !ACCNT list of every account used; "
+        "TYPES is a JSON file of ACCNTTYPE by account name",
+    )
+    _add_schema_argument(convert_parser)
+    _add_compress_argument(convert_parser)
+    _add_cache_arguments(convert_parser)
+    _add_profile_arguments(convert_parser)
     convert_parser.add_argument(
         "-v",
         "--verbose",
@@ -42,8 +85,73 @@ def parse_args() -> argparse.Namespace:
         help="Enable verbose logging (DEBUG level)",
     )
 
+    convert_dir_parser = subparsers.add_parser(
+        "convert-dir", help="Convert every CSV file in a directory to IIF"
+    )
+    convert_dir_parser.add_argument("input_dir", type=str, help="Directory containing CSV files")
+    convert_dir_parser.add_argument(
+        "output_dir",
+        type=str,
+        nargs="?",
+        help="Directory for IIF files (default: alongside each CSV)",
+    )
+    convert_dir_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to convert in parallel (default: 1)",
+    )
+    _add_cache_arguments(convert_dir_parser)
+    convert_dir_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging (DEBUG level)",
+    )
+
     validate_parser = subparsers.add_parser("validate", help="Validate CSV file")
     validate_parser.add_argument("input", type=str, help="Input CSV file path")
+    validate_parser.add_argument(
+        "--all-errors",
+        action="store_true",
+        help="Check every row and report all errors instead of stopping at the first "
+        "(implied by --max-errors, --format, --report and --jobs)",
+    )
+    validate_parser.add_argument(
+        "--max-errors",
+        type=int,
+        metavar="N",
+        help="Stop after N errors",
+    )
+    validate_parser.add_argument(
+        "--format",
+        dest="report_format",
+        choices=["text", "json"],
+        default=None,
+        help="Report format (default: text)",
+    )
+    validate_parser.add_argument(
+        "--report",
+        type=str,
+        metavar="PATH",
+        help="Write the report to PATH instead of stdout",
+    )
+    validate_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: 1)",
+    )
+    validate_parser.add_argument(
+        "--backend",
+        choices=["auto", "pyarrow", "numpy", "python"],
+        default=None,
+        help="Validation backend (default: CSV2IIF_BACKEND or auto)",
+    )
+    _add_schema_argument(validate_parser)
+    _add_profile_arguments(validate_parser)
     validate_parser.add_argument(
         "-v",
         "--verbose",
@@ -60,6 +168,8 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Edit file in place",
     )
+    _add_compress_argument(clean_parser)
+    _add_profile_arguments(clean_parser)
     clean_parser.add_argument(
         "-v",
         "--verbose",
@@ -67,98 +177,552 @@ def parse_args() -> argparse.Namespace:
         help="Enable verbose logging (DEBUG level)",
     )
 
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark each conversion stage on synthetic data"
+    )
+    bench_parser.add_argument(
+        "--rows", type=int, default=100_000, help="Rows to generate (default: 100000)"
+    )
+    bench_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per stage (default: 3)"
+    )
+    bench_parser.add_argument(
+        "--stage",
+        dest="stages",
+        action="append",
+        choices=["read", "validate", "write", "convert", "clean"],
+        help="Stage to run, may be repeated (default: all)",
+    )
+    bench_parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    bench_parser.add_argument(
+        "--blank-every",
+        type=int,
+        default=50,
+        help="Insert a blank row after every N rows, 0 for none (default: 50)",
+    )
+    bench_parser.add_argument(
+        "--no-shuffle", action="store_true", help="Keep the standard column order"
+    )
+    bench_parser.add_argument("--csv", type=str, help="Keep the generated CSV at this path")
+    bench_parser.add_argument(
+        "-o", "--output", type=str, help="Write the JSON report here instead of stdout"
+    )
+    bench_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging (DEBUG level)",
+    )
+
+    cache_parser = subparsers.add_parser("cache", help="Inspect or empty the conversion cache")
+    cache_parser.add_argument("action", choices=["stats", "clear"], help="Action to perform")
+    cache_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        metavar="DIR",
+        help="Cache directory (default: CSV2IIF_CACHE_DIR or ~/.cache/csv2iif)",
+    )
+    cache_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging (DEBUG level)",
+    )
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Convert CSV files as they are dropped into a directory"
+    )
+    watch_parser.add_argument("inbox", type=str, help="Directory to watch for CSV files")
+    watch_parser.add_argument("outbox", type=str, help="Directory for IIF files")
+    watch_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to convert in parallel (default: 1)",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between polls; a file must be unchanged for one interval (default: 1)",
+    )
+    watch_parser.add_argument(
+        "--done", type=str, metavar="DIR", help="Where converted CSVs go (default: INBOX/done)"
+    )
+    watch_parser.add_argument(
+        "--failed",
+        type=str,
+        metavar="DIR",
+        help="Where CSVs that failed go, with a .error file (default: INBOX/failed)",
+    )
+    watch_parser.add_argument(
+        "--status-file",
+        type=str,
+        metavar="PATH",
+        help="Keep queue depth and latency counters in PATH as JSON",
+    )
+    watch_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Convert the files that are complete now, then exit",
+    )
+    _add_cache_arguments(watch_parser)
+    watch_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging (DEBUG level)",
+    )
+
+    serve_parser = subparsers.add_parser("serve", help="Convert CSV uploads over HTTP")
+    serve_parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)"
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8080, help="Port to listen on (default: 8080)"
+    )
+    serve_parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Conversions that may run at the same time (default: 4)",
+    )
+    serve_parser.add_argument(
+        "--backend",
+        choices=["auto", "pyarrow", "numpy", "python"],
+        default=None,
+        help="Validation backend (default: CSV2IIF_BACKEND or auto)",
+    )
+    serve_parser.add_argument(
+        "--accounts",
+        type=str,
+        metavar="TYPES",
+        help="Start each response with an !ACCNT list, with ACCNTTYPE by account "
+        "name from the JSON file TYPES; responses then start only after the "
+        "whole upload is converted",
+    )
+    serve_parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Answer 408 when a client takes longer than this to send the headers "
+        "or the next piece of the body (default: 30)",
+    )
+    serve_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging (DEBUG level)",
+    )
+
     return parser.parse_args()
 
 
+def _load_dotenv() -> None:
+    """Load a .env file, importing python-dotenv only when one is found.
+
+    The file is looked for from this module's directory, then from the
+    working directory, up to the filesystem root, and the first one found
+    is passed to ``load_dotenv``. Searching here rather than in dotenv
+    avoids importing it on every run.
+    """
+    for start in (os.path.dirname(os.path.abspath(__file__)), os.getcwd()):
+        directory = start
+        while True:
+            path = os.path.join(directory, ".env")
+            if os.path.isfile(path):
+                from dotenv import load_dotenv
+
+                load_dotenv(path)
+                return
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+
+def _add_schema_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the column schema option to a subcommand.
+
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument(
+        "--schema",
+        type=str,
+        metavar="PATH",
+        help="JSON file with column aliases and defaults for the input",
+    )
+
+
+def _validates_whole_file(args: argparse.Namespace) -> bool:
+    """Return whether validate should check every row and write a report.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        True for --all-errors or any option that only applies to the report
+    """
+    report_options = (args.max_errors, args.report_format, args.report, args.jobs)
+    return args.all_errors or any(option is not None for option in report_options)
+
+
+def _load_schema(args: argparse.Namespace):
+    """Load the column schema requested on the command line.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        ColumnSchema, or None for the standard columns
+    """
+    if not args.schema:
+        return None
+
+    from csv2iif.schema import ColumnSchema
+
+    return ColumnSchema.load(args.schema)
+
+
+def _load_account_types(args: argparse.Namespace):
+    """Load the account types requested with --accounts.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        ACCNTTYPE by account name, or None when no account list is wanted
+    """
+    if not args.accounts:
+        return None
+
+    from csv2iif.iif_writer import load_account_types
+
+    return load_account_types(args.accounts)
+
+
+def _add_compress_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the output compression option to a subcommand.
+
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument(
+        "--compress",
+        choices=["gzip", "bz2", "xz"],
+        default=None,
+        help="Compress the output (default: from the output extension, "
+        "e.g. .gz; compressed input is always detected)",
+    )
+
+
+def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the conversion cache options to a subcommand.
+
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse output for inputs converted before (see `csv2iif cache`)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        metavar="DIR",
+        help="Cache directory (default: CSV2IIF_CACHE_DIR or ~/.cache/csv2iif)",
+    )
+    parser.add_argument(
+        "--cache-link",
+        action="store_true",
+        help="Hard-link cached output instead of copying it; "
+        "outputs must then not be edited in place",
+    )
+
+
+def _make_cache(args: argparse.Namespace):
+    """Create the conversion cache requested on the command line.
+
+    Args:
+        args: Parsed arguments
+
+    Returns:
+        ConversionCache, or None when caching is off
+    """
+    if not (args.cache or args.cache_link or getattr(args, "cache_dir", None)):
+        return None
+
+    from csv2iif.cache import ConversionCache
+
+    return ConversionCache(args.cache_dir, link=args.cache_link)
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile and --profile-output options to a subcommand.
+
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing breakdown to stderr",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        metavar="PATH",
+        help="Also write cProfile/pstats data to PATH (implies --profile)",
+    )
+
+
+def _finish_profile(profiler, cprofile, output: str | None) -> None:
+    """Print the stage breakdown and save cProfile data if requested.
+
+    Args:
+        profiler: StageTimer used for the run
+        cprofile: Enabled cProfile.Profile, or None
+        output: Path for the pstats file, or None
+    """
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(output)
+    print(profiler.format_report(), file=sys.stderr)
+    if cprofile is not None:
+        print(f"cProfile stats written to {output}", file=sys.stderr)
+
+
 def main() -> None:
     """Main entry point for CLI."""
     args = parse_args()
 
+    # Imported here rather than at module level so that --help and argument
+    # errors return without loading logging or the pipeline.
+    from csv2iif.logger import setup_logger
+
+    _load_dotenv()
+
     log_level = "DEBUG" if args.verbose else None
     logger = setup_logger(__name__, level=log_level)
 
+    profiler = None
+    cprofile = None
+    if getattr(args, "profile", False) or getattr(args, "profile_output", None):
+        from csv2iif.profiling import StageTimer
+
+        # Metrics report CPU time per stage, so the timer has to measure it.
+        profiler = StageTimer(cpu=bool(getattr(args, "metrics_json", None)))
+        if args.profile_output:
+            import cProfile
+
+            cprofile = cProfile.Profile()
+            cprofile.enable()
+
     try:
         if args.command == "convert":
-            converter = Converter(args.input, args.output)
-            converter.convert()
+            from csv2iif.converter import Converter
+
+            converter = Converter(
+                args.input,
+                args.output,
+                jobs=args.jobs,
+                backend=args.backend,
+                profiler=profiler,
+                incremental=args.incremental,
+                cache=_make_cache(args),
+                compression=args.compress,
+                account_types=_load_account_types(args),
+                schema=_load_schema(args),
+            )
+            result = converter.convert()
+            if args.metrics_json:
+                result.write_json(args.metrics_json)
             sys.exit(0)
 
+        elif args.command == "convert-dir":
+            from csv2iif.batch import convert_directory
+
+            results = convert_directory(
+                args.input_dir, args.output_dir, jobs=args.jobs, cache=_make_cache(args)
+            )
+            for result in results:
+                if result.ok:
+                    print(
+                        f"✓ {result.input_path} -> {result.output_path} "
+                        f"({result.transactions} transactions, {result.elapsed:.2f}s)"
+                    )
+                else:
+                    print(f"✗ {result.input_path}: {result.error} ({result.elapsed:.2f}s)")
+
+            failed = sum(1 for result in results if not result.ok)
+            total_time = sum(result.elapsed for result in results)
+            print(
+                f"Converted {len(results) - failed} of {len(results)} files "
+                f"({failed} failed, {total_time:.2f}s total conversion time)"
+            )
+            sys.exit(1 if failed else 0)
+
+        elif args.command == "validate" and _validates_whole_file(args):
+            from contextlib import nullcontext
+
+            from csv2iif.validation import render_report, validate_file, write_report
+
+            with profiler.stage("validate") if profiler is not None else nullcontext():
+                report = validate_file(
+                    args.input,
+                    jobs=1 if args.jobs is None else args.jobs,
+                    max_errors=args.max_errors,
+                    backend=args.backend,
+                    schema=_load_schema(args),
+                )
+            report_format = args.report_format or "text"
+            if args.report:
+                write_report(report, args.report, report_format)
+                print(f"Validation report written to {args.report}")
+            else:
+                print(render_report(report, report_format))
+            logger.info("Validation found %s errors", len(report.issues))
+            sys.exit(0 if report.ok else 1)
+
         elif args.command == "validate":
             from csv2iif.csv_reader import CSVReader
 
-            reader = CSVReader(args.input)
+            reader = CSVReader(
+                args.input, backend=args.backend, profiler=profiler, schema=_load_schema(args)
+            )
             transactions = reader.read()
-            logger.info(f"Validation successful: {len(transactions)} transactions found")
+            logger.info("Validation successful: %s transactions found", len(transactions))
             print(f"✓ CSV is valid: {len(transactions)} transactions")
             sys.exit(0)
 
         elif args.command == "clean":
-            import csv
-            import tempfile
-            from pathlib import Path
-
-            input_path = Path(args.input)
+            from csv2iif.cleaner import clean_csv
 
             if args.in_place:
-                output_path = Path(tempfile.mktemp(suffix=".csv"))
+                output_path = args.input
             elif args.output:
-                output_path = Path(args.output)
+                output_path = args.output
             else:
                 raise ValueError("Either --in-place or output path must be specified")
 
-            with open(input_path, encoding="utf-8") as infile:
-                reader = csv.reader(infile)
-                rows = list(reader)
+            compression = args.compress
+            if args.in_place and compression is None:
+                from csv2iif.compression import detect_compression
 
-            if not rows:
-                raise ValueError("CSV file is empty")
+                compression = detect_compression(args.input)
 
-            headers = [h.strip() for h in rows[0]]
-            seen = set()
-            unique_headers = []
-            for h in headers:
-                if h and h.lower() not in seen:
-                    unique_headers.append(h)
-                    seen.add(h.lower())
+            clean_csv(args.input, output_path, profiler=profiler, compression=compression)
 
-            cleaned_rows = [unique_headers]
-            for row in rows[1:]:
-                if not row or all(not cell.strip() for cell in row):
-                    continue
-                cleaned_row = [cell.strip() for cell in row[: len(unique_headers)]]
-                cleaned_rows.append(cleaned_row)
+            if args.in_place:
+                logger.info("Cleaned CSV in place: %s", args.input)
+                print(f"✓ Cleaned CSV in place: {args.input}")
+            else:
+                logger.info("Cleaned CSV written to %s", output_path)
+                print(f"✓ Cleaned CSV written to {output_path}")
+            sys.exit(0)
 
-            with open(output_path, "w", encoding="utf-8", newline="") as outfile:
-                writer = csv.writer(outfile)
-                writer.writerows(cleaned_rows)
+        elif args.command == "bench":
+            import json
+
+            from csv2iif.bench import run_benchmarks
+
+            report = run_benchmarks(
+                rows=args.rows,
+                repeat=args.repeat,
+                stages=args.stages,
+                seed=args.seed,
+                csv_path=args.csv,
+                blank_every=args.blank_every,
+                shuffle_columns=not args.no_shuffle,
+            )
+            text = json.dumps(report, indent=2)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write(text + "\n")
+                print(f"✓ Benchmark report written to {args.output}")
+            else:
+                print(text)
+            sys.exit(0)
 
-            if args.in_place:
-                import shutil
+        elif args.command == "cache":
+            from csv2iif.cache import ConversionCache
 
-                shutil.move(str(output_path), str(input_path))
-                logger.info(f"Cleaned CSV in place: {input_path}")
-                print(f"✓ Cleaned CSV in place: {input_path}")
+            cache = ConversionCache(args.cache_dir)
+            if args.action == "clear":
+                removed = cache.clear()
+                print(f"✓ Removed {removed} cache entries from {cache.directory}")
             else:
-                logger.info(f"Cleaned CSV written to {output_path}")
-                print(f"✓ Cleaned CSV written to {output_path}")
+                stats = cache.stats()
+                print(f"Directory: {stats.directory}")
+                print(f"Entries:   {stats.entries}")
+                print(f"Size:      {stats.size_bytes} bytes")
+                print(f"Limit:     {stats.max_size_bytes} bytes")
+            sys.exit(0)
+
+        elif args.command == "watch":
+            import signal
+            import threading
+
+            from csv2iif.watch import Watcher
+
+            watcher = Watcher(
+                args.inbox,
+                args.outbox,
+                jobs=args.jobs,
+                interval=args.interval,
+                done_dir=args.done,
+                failed_dir=args.failed,
+                cache=_make_cache(args),
+                status_path=args.status_file,
+            )
+            stop = threading.Event()
+            signals = (signal.SIGINT, signal.SIGTERM)
+            previous = [signal.signal(signum, lambda *_: stop.set()) for signum in signals]
+            try:
+                stats = watcher.run(stop, once=args.once)
+            finally:
+                for signum, handler in zip(signals, previous, strict=True):
+                    signal.signal(signum, handler)
+            print(f"✓ Converted {stats.converted} files ({stats.failed} failed)")
+            sys.exit(1 if stats.failed else 0)
+
+        elif args.command == "serve":
+            from csv2iif.server import serve
+
+            serve(
+                args.host,
+                args.port,
+                max_concurrent=args.max_concurrent,
+                backend=args.backend,
+                account_types=_load_account_types(args),
+                read_timeout=args.read_timeout,
+            )
             sys.exit(0)
 
     except FileNotFoundError as e:
-        logger.error(f"File error: {e}")
+        logger.error("File error: %s", e)
         sys.exit(2)
 
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         sys.exit(1)
 
     except OSError as e:
-        logger.error(f"File I/O error: {e}")
+        logger.error("File I/O error: %s", e)
         sys.exit(2)
 
     except Exception as e:
-        logger.error(f"Conversion error: {e}")
+        logger.error("Conversion error: %s", e)
         sys.exit(3)
 
+    finally:
+        if profiler is not None:
+            _finish_profile(profiler, cprofile, args.profile_output)
+
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,19 @@
 """Converter orchestration for csv2iif."""
 
-from csv2iif.csv_reader import CSVReader
+import contextlib
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor
+
+from csv2iif.cache import CacheHit, ConversionCache
+from csv2iif.compression import detect_compression
+from csv2iif.csv_reader import DEFAULT_BATCH_SIZE, CSVReader
 from csv2iif.iif_writer import IIFWriter
 from csv2iif.logger import setup_logger
+from csv2iif.metrics import ConversionResult, cpu_time, peak_rss_bytes, stage_metrics
+from csv2iif.profiling import StageTimer
+from csv2iif.schema import ColumnSchema
 
 logger = setup_logger(__name__)
 
@@ -10,31 +21,318 @@ logger = setup_logger(__name__)
 class Converter:
     """Orchestrates CSV to IIF conversion."""
 
-    def __init__(self, input_path: str, output_path: str) -> None:
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        jobs: int = 1,
+        backend: str | None = None,
+        profiler: StageTimer | None = None,
+        on_metrics: Callable[[ConversionResult], None] | None = None,
+        incremental: bool = False,
+        cache: ConversionCache | None = None,
+        compression: str | None = None,
+        account_types: Mapping[str, str] | None = None,
+        schema: ColumnSchema | None = None,
+    ) -> None:
         """
         Initialize converter.
 
         Args:
             input_path: Path to input CSV file
             output_path: Path to output IIF file
+            jobs: Number of worker processes; values above 1 split the input
+                into chunks that are converted in parallel (compressed input
+                is always converted in one process)
+            backend: Validation backend, see ``backends.select_backend``
+                (default: NumPy/PyArrow when installed, else pure Python)
+            profiler: Optional timer for per-stage timings of the read,
+                parse, validate and write stages; it accumulates over every
+                run. By default a low-overhead timer is used that times each
+                batch rather than each record, and is reset by every run.
+            on_metrics: Called with the ConversionResult after every
+                successful conversion
+            incremental: Keep a manifest next to the output and, on later
+                runs, only convert rows appended to the input since the last
+                run, see ``incremental.convert_incremental``
+            cache: Reuse the output of an earlier conversion of identical
+                input from this cache, and add new conversions to it
+            compression: Compress the output with "gzip", "bz2" or "xz"
+                (default: chosen from the output extension). Compressed
+                input is detected from its contents.
+            account_types: ACCNTTYPE by account name; when given, the
+                output starts with an !ACCNT section listing every account
+                used and its parents, see ``IIFWriter``
+            schema: Column names, aliases and defaults of the input, see
+                ``CSVReader``
+
+        Raises:
+            ValueError: If jobs is less than 1, both incremental and cache
+                are given, or the compression or an account type is not
+                supported
         """
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got: {jobs}")
+        if incremental and cache is not None:
+            raise ValueError("Incremental conversion cannot be combined with the cache")
+
         self.input_path = input_path
         self.output_path = output_path
-        self.reader = CSVReader(input_path)
-        self.writer = IIFWriter(output_path)
+        self.jobs = jobs
+        self._default_profiler = profiler is None
+        if profiler is None:
+            profiler = StageTimer(per_record=False, cpu=True)
+        self.profiler = profiler
+        self.on_metrics = on_metrics
+        self.incremental = incremental
+        self.cache = cache
+        self.reader = CSVReader(input_path, backend=backend, profiler=profiler, schema=schema)
+        self.writer = IIFWriter(
+            output_path, profiler=profiler, compression=compression, account_types=account_types
+        )
 
-    def convert(self) -> None:
+    def convert(self) -> ConversionResult:
         """
         Convert CSV file to IIF format.
 
+        Rows are streamed from the reader to the writer in bounded,
+        column-oriented batches, so memory use does not grow with the size
+        of the input.
+
+        Returns:
+            ConversionResult with the number of transactions written and
+            throughput metrics for the run
+
+        Raises:
+            FileNotFoundError: If input file doesn't exist
+            ValueError: If CSV data is invalid
+            IOError: If output file cannot be written
+        """
+        logger.info("Starting conversion: %s -> %s", self.input_path, self.output_path)
+
+        timer = self.profiler
+        if self._default_profiler:
+            timer.reset()
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+
+        appended = cached = False
+        if self.incremental:
+            from csv2iif.incremental import convert_incremental
+
+            count, appended = convert_incremental(self.reader, self.writer, self._convert_full)
+        elif self.cache is not None:
+            count, cached = self._convert_cached(timer)
+        else:
+            count = self._convert_full()
+
+        symbols = {}
+        if not cached:
+            symbols = {"accounts": self.reader.accounts.stats(), "names": self.reader.names.stats()}
+            logger.debug(
+                "Interned %s distinct accounts from %s values and %s distinct names from %s",
+                symbols["accounts"].distinct,
+                symbols["accounts"].total,
+                symbols["names"].distinct,
+                symbols["names"].total,
+            )
+
+        result = ConversionResult(
+            input_path=str(self.input_path),
+            output_path=str(self.output_path),
+            transactions=count,
+            rows_read=self.reader.records_read,
+            blank_rows=self.reader.blank_rows,
+            bytes_in=self.reader.file_path.stat().st_size,
+            bytes_out=self.writer.file_path.stat().st_size,
+            wall_seconds=time.perf_counter() - wall_start,
+            cpu_seconds=cpu_time() - cpu_start,
+            peak_rss_bytes=peak_rss_bytes(),
+            stages=stage_metrics(timer),
+            appended=appended,
+            cached=cached,
+            symbols=symbols,
+        )
+
+        logger.info("Conversion completed successfully: %s transactions", count)
+        if self.on_metrics is not None:
+            self.on_metrics(result)
+        return result
+
+    async def convert_async(self, executor: Executor | None = None) -> ConversionResult:
+        """
+        Convert CSV file to IIF format without blocking the event loop.
+
+        The conversion runs in ``executor``, or the event loop's default
+        thread pool, and writes exactly what ``convert`` writes. In a
+        ProcessPoolExecutor a converter with the same options is built in the
+        worker process; the profiler is not used there, and the reader
+        counts and ``on_metrics`` are updated from the returned result.
+
+        Cancelling the awaiting task stops a conversion running in a thread
+        before its next batch is written, leaving any previous output in
+        place, and waits for the thread to stop. A conversion already running
+        in another process cannot be interrupted; it finishes, but its result
+        is discarded.
+
+        Args:
+            executor: Thread or process pool to run the conversion in
+
+        Returns:
+            ConversionResult, as returned by ``convert``
+
         Raises:
             FileNotFoundError: If input file doesn't exist
             ValueError: If CSV data is invalid
             IOError: If output file cannot be written
         """
-        logger.info(f"Starting conversion: {self.input_path} -> {self.output_path}")
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        loop = asyncio.get_running_loop()
+        if isinstance(executor, ProcessPoolExecutor):
+            options = {
+                "jobs": self.jobs,
+                "backend": self.reader.backend,
+                "incremental": self.incremental,
+                "cache": self.cache,
+                "compression": self.writer.compression,
+                "account_types": self.writer.account_types,
+                "schema": self.reader.schema,
+            }
+            result = await loop.run_in_executor(
+                executor, _convert_in_process, self.input_path, self.output_path, options
+            )
+            self.reader.records_read = result.rows_read
+            self.reader.blank_rows = result.blank_rows
+            if self.on_metrics is not None:
+                self.on_metrics(result)
+            return result
+
+        cancel_event = threading.Event()
+        self.writer.cancel_event = cancel_event
+        future = loop.run_in_executor(executor, self.convert)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel_event.set()
+            logger.info("Cancelling conversion: %s", self.input_path)
+            with contextlib.suppress(Exception):
+                await future
+            raise
+        finally:
+            if future.done():
+                self.writer.cancel_event = None
+
+    def convert_stream(
+        self, f: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[str]:
+        """
+        Convert CSV text from a stream, yielding IIF text as rows are converted.
+
+        Input is only read as output is consumed, so neither side is held in
+        memory. The input and output paths are not used; afterwards the
+        reader's ``records_read`` and ``blank_rows`` describe the stream.
+
+        Args:
+            f: Text stream or iterable of CSV lines, header first
+            batch_size: Rows validated and rendered per yielded chunk
+
+        Returns:
+            Iterator of IIF text chunks, headers first
+
+        Raises:
+            ValueError: If CSV data is invalid (raised during iteration)
+        """
+        return self.writer.render_stream(self.reader.iter_stream_batches(f, batch_size))
+
+    def _convert_cached(self, timer: StageTimer) -> tuple[int, bool]:
+        """
+        Fetch the output from the cache, or convert and store it.
+
+        The result is only stored if the input did not change while it was
+        being converted. Failing to store is logged and otherwise ignored.
+
+        Args:
+            timer: Timer charged with the "cache" stage
+
+        Returns:
+            Number of transactions and whether the output came from the cache
+
+        Raises:
+            FileNotFoundError: If input file doesn't exist
+        """
+        if not self.reader.file_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.reader.file_path}")
+
+        before = self.reader.file_path.stat()
+        with timer.stage("cache"):
+            key = self.cache.key(self.input_path, self._cache_options())
+            hit = self.cache.fetch(key, self.output_path)
+        if hit is not None:
+            self.reader.records_read = hit.rows_read
+            self.reader.blank_rows = hit.blank_rows
+            return hit.transactions, True
+
+        count = self._convert_full()
+        after = self.reader.file_path.stat()
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            logger.warning("%s changed during conversion; not caching", self.input_path)
+            return count, False
+
+        hit = CacheHit(count, self.reader.records_read, self.reader.blank_rows)
+        with timer.stage("cache"):
+            try:
+                self.cache.store(key, self.output_path, hit)
+            except OSError as e:
+                logger.warning("Could not add %s to the cache: %s", self.output_path, e)
+        return count, False
+
+    def _cache_options(self) -> dict[str, object] | None:
+        """
+        Collect the options that change the output, for the cache key.
+
+        Returns:
+            Options that differ from the defaults, or None if none do
+        """
+        options: dict[str, object] = {}
+        if self.writer.compression:
+            options["compression"] = self.writer.compression
+        if self.writer.account_types is not None:
+            options["account_types"] = self.writer.account_types
+        schema = self.reader.schema.to_dict()
+        if schema:
+            options["schema"] = schema
+        return options or None
+
+    def _convert_full(self) -> int:
+        """
+        Convert the whole input, replacing the output.
+
+        Returns:
+            Number of transactions written
+        """
+        if self.jobs > 1:
+            if detect_compression(self.input_path) is None:
+                from csv2iif.parallel import convert_parallel
+
+                return convert_parallel(self.reader, self.writer, self.jobs)
+            logger.info("Compressed input cannot be split into chunks; using one process")
+        return self.writer.write_batches(self.reader.iter_batches())
+
+
+def _convert_in_process(
+    input_path: str, output_path: str, options: dict[str, object]
+) -> ConversionResult:
+    """
+    Convert one file in a worker process.
 
-        transactions = self.reader.read()
-        self.writer.write(transactions)
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path to output IIF file
+        options: Keyword arguments for Converter
 
-        logger.info("Conversion completed successfully")
+    Returns:
+        ConversionResult of the conversion
+    """
+    return Converter(input_path, output_path, **options).convert()
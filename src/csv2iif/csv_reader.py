@@ -1,36 +1,63 @@
 """CSV reader for csv2iif."""
 
 import csv
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+from csv2iif.compression import open_input
 from csv2iif.logger import setup_logger
-from csv2iif.models import Transaction
+from csv2iif.models import RowError, Transaction, TransactionBatch
+from csv2iif.profiling import StageTimer
+from csv2iif.schema import ColumnSchema, RowExtractor
+from csv2iif.symbols import SymbolTable
 
 logger = setup_logger(__name__)
 
+DEFAULT_BATCH_SIZE = 10_000
 
-class CSVReader:
-    """Reads and validates CSV files with flexible column ordering."""
-
-    REQUIRED_COLUMNS = {
-        "date",
-        "credit-account",
-        "debit-account",
-        "number",
-        "name",
-        "amount",
-        "memo",
-    }
 
-    def __init__(self, file_path: str) -> None:
+class CSVReader:
+    """
+    Reads and validates CSV files with flexible column ordering.
+
+    Which columns hold which fields is decided by a ColumnSchema, compiled
+    against each file's header row into ``extractor``.
+
+    Credit and debit accounts are interned in one SymbolTable, ``accounts``,
+    and payee names in another, ``names``. Both are cleared when reading
+    starts, so after a read they hold every distinct value in the file.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        backend: str | None = None,
+        profiler: StageTimer | None = None,
+        schema: ColumnSchema | None = None,
+    ) -> None:
         """
         Initialize CSV reader.
 
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, optionally compressed with gzip,
+                bz2 or xz (detected from the file's first bytes)
+            backend: Validation backend for batches, see
+                ``backends.select_backend`` (default: automatic)
+            profiler: Optional timer charged with the "read" (CSV tokenizing
+                and file I/O), "parse" and "validate" stages; without
+                ``per_record`` reading and parsing are both timed as "read"
+            schema: Column names, aliases and defaults (default: the
+                standard column names, all required)
         """
         self.file_path = Path(file_path)
-        self.column_mapping: dict[str, int] = {}
+        self.backend = backend
+        self.profiler = profiler
+        self.schema = schema or ColumnSchema()
+        self.extractor: RowExtractor | None = None
+        self.records_read = 0
+        self.blank_rows = 0
+        self.accounts = SymbolTable()
+        self.names = SymbolTable()
 
     def read(self) -> list[Transaction]:
         """
@@ -43,74 +70,275 @@ class CSVReader:
             FileNotFoundError: If CSV file doesn't exist
             ValueError: If required columns are missing or data is invalid
         """
+        return list(self.iter_transactions())
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """
+        Lazily read CSV file, yielding one validated Transaction per row.
+
+        Only the current row is held in memory, so callers can stream
+        arbitrarily large files.
+
+        Returns:
+            Iterator of validated Transaction objects
+
+        Raises:
+            FileNotFoundError: If CSV file doesn't exist
+            ValueError: If required columns are missing or data is invalid
+                (raised during iteration)
+        """
         if not self.file_path.exists():
             raise FileNotFoundError(f"CSV file not found: {self.file_path}")
 
-        logger.info(f"Reading CSV file: {self.file_path}")
+        if self.profiler is None:
+            return self._iter_file()
+        return self.profiler.wrap(self._iter_file(), self._parse_stage())
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[TransactionBatch]:
+        """
+        Lazily read CSV file as validated column-oriented batches.
+
+        Args:
+            batch_size: Maximum number of rows per batch
 
-        with open(self.file_path, encoding="utf-8") as f:
-            reader = csv.reader(f)
+        Returns:
+            Iterator of validated TransactionBatch objects
+
+        Raises:
+            FileNotFoundError: If CSV file doesn't exist
+            ValueError: If required columns are missing or data is invalid
+                (raised during iteration)
+        """
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.file_path}")
+
+        if self.profiler is None:
+            return self._iter_file_batches(batch_size)
+        return self.profiler.wrap(self._iter_file_batches(batch_size), self._parse_stage())
+
+    def _iter_file(self) -> Iterator[Transaction]:
+        """
+        Open the CSV file and yield its transactions.
+
+        Yields:
+            Validated Transaction objects
+        """
+        logger.info("Reading CSV file: %s", self.file_path)
+        self._reset_counts()
+
+        count = 0
+        with open_input(self.file_path) as f:
+            reader = self._csv_rows(f)
             headers = next(reader, None)
 
             if headers is None:
                 raise ValueError("CSV file is empty")
 
             self._validate_headers(headers)
-            transactions = self._parse_rows(reader)
+            for transaction in self._parse_rows(reader):
+                count += 1
+                yield transaction
+
+        logger.info("Successfully read %s transactions", count)
+
+    def _iter_file_batches(self, batch_size: int) -> Iterator[TransactionBatch]:
+        """
+        Open the CSV file and yield its rows in validated batches.
+
+        Args:
+            batch_size: Maximum number of rows per batch
+
+        Yields:
+            Validated TransactionBatch objects
+        """
+        logger.info("Reading CSV file in batches of %s: %s", batch_size, self.file_path)
+
+        with open_input(self.file_path) as f:
+            yield from self.iter_stream_batches(f, batch_size)
+
+    def iter_stream_batches(
+        self, f: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[TransactionBatch]:
+        """
+        Read CSV text from an open stream as validated batches.
+
+        Used for input that is not a file on disk, such as an upload; rows
+        are read only as batches are requested. ``file_path`` is not used.
+
+        Args:
+            f: Text stream or iterable of lines, header first
+            batch_size: Maximum number of rows per batch
+
+        Yields:
+            Validated TransactionBatch objects
 
-        logger.info(f"Successfully read {len(transactions)} transactions")
-        return transactions
+        Raises:
+            ValueError: If the stream is empty, required columns are missing
+                or data is invalid
+        """
+        self._reset_counts()
+        reader = self._csv_rows(f)
+        headers = next(reader, None)
+
+        if headers is None:
+            raise ValueError("CSV file is empty")
+
+        self._validate_headers(headers)
+        yield from self._parse_batches(reader, batch_size)
+
+    def _reset_counts(self) -> None:
+        """Clear the row counters and symbol tables before reading a file."""
+        self.records_read = self.blank_rows = 0
+        self.accounts = SymbolTable()
+        self.names = SymbolTable()
+
+    def _csv_rows(self, f) -> Iterator[list[str]]:
+        """
+        Create a CSV reader over an open file, timed as "read" when profiling.
+
+        Args:
+            f: Open text file
+
+        Returns:
+            Iterator of CSV records
+        """
+        reader = csv.reader(f)
+        if self.profiler is None or not self.profiler.per_record:
+            return reader
+        return self.profiler.wrap(reader, "read")
+
+    def _parse_stage(self) -> str:
+        """
+        Name the stage charged with turning records into transactions.
+
+        Returns:
+            "parse" when records are timed separately as "read", otherwise
+            "read", which then covers tokenizing and parsing together
+        """
+        return "parse" if self.profiler.per_record else "read"
 
     def _validate_headers(self, headers: list[str]) -> None:
         """
         Validate CSV headers contain all required columns.
 
+        Compiles the schema for these headers into ``extractor``.
+
         Args:
             headers: List of column names from CSV
 
         Raises:
             ValueError: If required columns are missing
         """
-        normalized_headers = {}
-        for i, h in enumerate(headers):
-            normalized = h.strip().lower()
-            if normalized and normalized not in normalized_headers:
-                normalized_headers[normalized] = i
+        self.extractor = self.schema.compile(headers)
+        logger.debug("Column mapping: %s", self.extractor.column_mapping)
 
-        missing_columns = self.REQUIRED_COLUMNS - normalized_headers.keys()
+    def _parse_rows(self, reader: csv.reader, start_row: int = 2) -> Iterator[Transaction]:
+        """
+        Parse CSV rows into Transaction objects.
 
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {', '.join(sorted(missing_columns))}")
+        Args:
+            reader: CSV reader object
+            start_row: Row number of the first record produced by ``reader``
 
-        self.column_mapping = {col: normalized_headers[col] for col in self.REQUIRED_COLUMNS}
-        logger.debug(f"Column mapping: {self.column_mapping}")
+        Yields:
+            Transaction objects
 
-    def _parse_rows(self, reader: csv.reader) -> list[Transaction]:
+        Raises:
+            RowError: If row data is invalid
         """
-        Parse CSV rows into Transaction objects.
+        create_transaction = self._create_transaction
+        if self.profiler is not None and self.profiler.per_record:
+            create_transaction = self.profiler.timed(create_transaction, "validate")
+
+        row_num = start_row - 1
+        for row_num, row in enumerate(reader, start=start_row):
+            if not row or not "".join(row).strip():
+                self.blank_rows += 1
+                continue
+
+            try:
+                transaction = create_transaction(row)
+            except (ValueError, IndexError) as e:
+                raise RowError(row_num, str(e)) from e
+
+            yield transaction
+
+        self.records_read += row_num - start_row + 1
+
+    def _parse_batches(
+        self, reader: csv.reader, batch_size: int, start_row: int = 2
+    ) -> Iterator[TransactionBatch]:
+        """
+        Parse CSV rows into validated TransactionBatch objects.
 
         Args:
             reader: CSV reader object
+            batch_size: Maximum number of rows per batch
+            start_row: Row number of the first record produced by ``reader``
 
-        Returns:
-            List of Transaction objects
+        Yields:
+            Validated TransactionBatch objects
 
         Raises:
-            ValueError: If row data is invalid
+            RowError: If row data is invalid
         """
-        transactions = []
-
-        for row_num, row in enumerate(reader, start=2):
-            if not row or all(not cell.strip() for cell in row):
+        extract = self.extractor.extract
+
+        batch = TransactionBatch()
+        append = batch.append
+        row_num = start_row - 1
+        for row_num, row in enumerate(reader, start=start_row):
+            # Joining is much cheaper than stripping each cell in a generator.
+            if not row or not "".join(row).strip():
+                self.blank_rows += 1
                 continue
 
             try:
-                transaction = self._create_transaction(row)
-                transactions.append(transaction)
-            except (ValueError, IndexError) as e:
-                raise ValueError(f"Error in row {row_num}: {e}") from e
+                append(*extract(row), row_num)
+            except IndexError as e:
+                self._validate_batch(batch)
+                raise RowError(row_num, str(e)) from e
+
+            if len(batch) >= batch_size:
+                self._intern_batch(batch)
+                self._validate_batch(batch)
+                yield batch
+                batch = TransactionBatch()
+                append = batch.append
+
+        self.records_read += row_num - start_row + 1
+        if batch:
+            self._intern_batch(batch)
+            self._validate_batch(batch)
+            yield batch
+
+    def _intern_batch(self, batch: TransactionBatch) -> None:
+        """
+        Replace a batch's account and name strings with interned ones.
+
+        Args:
+            batch: Batch to update in place
+        """
+        intern_account = self.accounts.intern_all
+        batch.credit_accounts = intern_account(batch.credit_accounts)
+        batch.debit_accounts = intern_account(batch.debit_accounts)
+        batch.names = self.names.intern_all(batch.names)
 
-        return transactions
+    def _validate_batch(self, batch: TransactionBatch) -> None:
+        """
+        Validate a batch, timed as "validate" when profiling.
+
+        Args:
+            batch: Batch to validate
+
+        Raises:
+            RowError: For the first invalid row
+        """
+        if self.profiler is None:
+            batch.validate(self.backend)
+        else:
+            with self.profiler.stage("validate"):
+                batch.validate(self.backend)
 
     def _create_transaction(self, row: list[str]) -> Transaction:
         """
@@ -122,12 +350,14 @@ class CSVReader:
         Returns:
             Transaction object
         """
+        date, credit, debit, number, name, amount, memo = self.extractor.extract(row)
+        intern_account = self.accounts.intern
         return Transaction(
-            date=row[self.column_mapping["date"]].strip(),
-            credit_account=row[self.column_mapping["credit-account"]].strip(),
-            debit_account=row[self.column_mapping["debit-account"]].strip(),
-            number=row[self.column_mapping["number"]].strip(),
-            name=row[self.column_mapping["name"]].strip(),
-            amount=row[self.column_mapping["amount"]].strip(),
-            memo=row[self.column_mapping["memo"]].strip(),
+            date=date,
+            credit_account=intern_account(credit),
+            debit_account=intern_account(debit),
+            number=number,
+            name=self.names.intern(name),
+            amount=amount,
+            memo=memo,
         )
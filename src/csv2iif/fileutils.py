@@ -0,0 +1,39 @@
+"""File helpers for csv2iif."""
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from csv2iif.compression import open_text
+
+
+@contextmanager
+def atomic_write(
+    path: Path, newline: str | None = None, compression: str | None = None
+) -> Iterator[IO[str]]:
+    """
+    Open a text file for writing that only replaces ``path`` on success.
+
+    Output goes to a temporary file in the same directory, which is renamed
+    over ``path`` when the block exits cleanly and removed if it raises, so a
+    failed conversion never leaves a truncated file behind. The temporary
+    name is random, so threads writing the same path do not collide.
+
+    Args:
+        path: Final output path
+        newline: Newline translation passed to ``open``
+        compression: Compress the file with "gzip", "bz2" or "xz"
+
+    Yields:
+        Writable text file object
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    try:
+        with open_text(tmp_path, "w", compression, newline) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -1,109 +1,646 @@
 """IIF writer for csv2iif."""
 
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
+from typing import IO
 
+from csv2iif.compression import check_compression, compression_from_suffix
+from csv2iif.fileutils import atomic_write
 from csv2iif.logger import setup_logger
-from csv2iif.models import Transaction
+from csv2iif.models import Transaction, TransactionBatch, TransactionRow
+from csv2iif.profiling import StageTimer
 
 logger = setup_logger(__name__)
 
+DEFAULT_BUFFER_SIZE = 256 * 1024
+
+HEADERS = (
+    "!TRNS\tTRNSID\tTRNSTYPE\tDATE\tACCNT\tNAME\tAMOUNT\tDOCNUM\tMEMO\n"
+    "!SPL\tSPLID\tTRNSTYPE\tDATE\tACCNT\tNAME\tAMOUNT\tDOCNUM\tMEMO\n"
+    "!ENDTRNS\n"
+)
+
+ACCOUNT_HEADER = "!ACCNT\tNAME\tACCNTTYPE\n"
+
+# Rendered transactions are held in memory up to this many characters while
+# the account list is collected, then spill to a temporary file.
+_SPOOL_SIZE = 16 * 1024 * 1024
+
+# ACCNTTYPE codes QuickBooks accepts in an !ACCNT section.
+ACCOUNT_TYPES = frozenset(
+    {
+        "AP",
+        "AR",
+        "BANK",
+        "CCARD",
+        "COGS",
+        "EQUITY",
+        "EXEXP",
+        "EXINC",
+        "EXP",
+        "FIXASSET",
+        "INC",
+        "LTLIAB",
+        "NONPOSTING",
+        "OASSET",
+        "OCASSET",
+        "OCLIAB",
+    }
+)
+
+
+class ConversionCancelledError(Exception):
+    """Raised when a write is stopped through ``IIFWriter.cancel_event``."""
+
 
 class IIFWriter:
     """Writes transactions to IIF format file."""
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(
+        self,
+        file_path: str,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        profiler: StageTimer | None = None,
+        cancel_event: threading.Event | None = None,
+        compression: str | None = None,
+        account_types: Mapping[str, str] | None = None,
+    ) -> None:
         """
         Initialize IIF writer.
 
         Args:
             file_path: Path to output IIF file
+            buffer_size: Number of characters of rendered blocks to collect
+                before joining them into a single write; 0 writes every
+                block as soon as it is rendered
+            profiler: Optional timer charged with the "write" stage (rendering
+                and file I/O, excluding time spent producing the input)
+            cancel_event: When set, the next block written raises
+                ConversionCancelledError, so the output is left as it was before
+                the write started
+            compression: Compress the file with "gzip", "bz2" or "xz"
+                (default: chosen from the extension of ``file_path``, so
+                ``.iif.gz`` is gzip and ``.iif`` is not compressed)
+            account_types: ACCNTTYPE of each account, such as
+                ``{"Checking": "BANK", "Expenses": "EXP"}``. When given, the
+                file starts with an !ACCNT section listing every account the
+                transactions use, plus their parent accounts; see
+                ``account_type`` for how types are looked up. Rendered
+                transactions are spooled until the list is complete.
+
+        Raises:
+            ValueError: If the compression or an account type is not supported
         """
+        check_compression(compression)
         self.file_path = Path(file_path)
+        self.buffer_size = buffer_size
+        self.profiler = profiler
+        self.cancel_event = cancel_event
+        self.compression = compression or compression_from_suffix(file_path)
+        self.account_types = None if account_types is None else check_account_types(account_types)
+        self.accounts: set[str] = set()
+
+    @property
+    def account_list(self) -> bool:
+        """Whether the file starts with an !ACCNT section."""
+        return self.account_types is not None
 
-    def write(self, transactions: list[Transaction]) -> None:
+    def write(self, transactions: Iterable[Transaction | TransactionRow]) -> int:
         """
         Write transactions to IIF file.
 
+        Transactions are consumed one at a time, so a generator such as
+        ``CSVReader.iter_transactions()`` is streamed straight to disk. A
+        validated TransactionBatch can be passed directly. The file is only
+        replaced once every transaction has been written. The accounts used
+        are collected in ``accounts``.
+
         Args:
-            transactions: List of Transaction objects to write
+            transactions: Iterable of Transaction objects or batch rows to write
+
+        Returns:
+            Number of transactions written
 
         Raises:
             IOError: If file cannot be written
         """
-        logger.info(f"Writing {len(transactions)} transactions to IIF file: {self.file_path}")
+        self.accounts = set()
+        if isinstance(transactions, TransactionBatch):
+            self._add_accounts(transactions)
+            self._write_file([self.render_batch(transactions)])
+            count = len(transactions)
+        else:
+            transactions = self._track_accounts(transactions)
+            count = self._write_file(map(self.format_transaction_block, transactions))
 
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            self._write_headers(f)
-            self._write_transactions(f, transactions)
+        logger.info("Successfully wrote %s transactions to IIF file", count)
+        return count
 
-        logger.info("Successfully wrote IIF file")
+    def write_batches(self, batches: Iterable[TransactionBatch]) -> int:
+        """
+        Write a stream of validated batches to IIF file.
 
-    def _write_headers(self, f) -> None:
+        Each batch is rendered column-wise, which avoids building a row
+        object per transaction. The accounts used are collected in
+        ``accounts``.
+
+        Args:
+            batches: Iterable of validated TransactionBatch objects
+
+        Returns:
+            Number of transactions written
+
+        Raises:
+            IOError: If file cannot be written
         """
-        Write IIF headers to file.
+        count = 0
+        self.accounts = set()
+
+        def render() -> Iterator[str]:
+            nonlocal count
+            for batch in batches:
+                count += len(batch)
+                self._add_accounts(batch)
+                yield self.render_batch(batch)
+
+        self._write_file(render())
+        logger.info("Successfully wrote %s transactions to IIF file", count)
+        return count
+
+    def append_batches(self, batches: Iterable[TransactionBatch]) -> int:
+        """
+        Append a stream of validated batches to the end of the IIF file.
+
+        Headers, and with ``account_types`` the !ACCNT section, are written
+        first only when the file is missing or empty. Otherwise the blocks
+        are added after the existing ones, and the accounts they use are not
+        added to the file's !ACCNT section; check ``accounts`` and rewrite
+        the file if it needs them. If anything fails, including validation
+        of a later batch, the file is cut back to its original length.
 
         Args:
-            f: File object
+            batches: Iterable of validated TransactionBatch objects
+
+        Returns:
+            Number of transactions appended
+
+        Raises:
+            ValueError: If the file is compressed
+            IOError: If file cannot be written
         """
-        f.write("!TRNS\tTRNSID\tTRNSTYPE\tDATE\tACCNT\tNAME\tAMOUNT\tDOCNUM\tMEMO\n")
-        f.write("!SPL\tSPLID\tTRNSTYPE\tDATE\tACCNT\tNAME\tAMOUNT\tDOCNUM\tMEMO\n")
-        f.write("!ENDTRNS\n")
+        if self.compression is not None:
+            raise ValueError("Cannot append to a compressed IIF file")
+
+        logger.info("Appending transactions to IIF file: %s", self.file_path)
+        count = 0
+        self.accounts = set()
+
+        def render() -> Iterator[str]:
+            nonlocal count
+            for batch in batches:
+                count += len(batch)
+                self._add_accounts(batch)
+                yield self.render_batch(batch)
+
+        if self.profiler is not None:
+            with self.profiler.stage("write"):
+                self._append(render())
+        else:
+            self._append(render())
 
-    def _write_transactions(self, f, transactions: list[Transaction]) -> None:
+        logger.info("Successfully appended %s transactions to IIF file", count)
+        return count
+
+    def _append(self, blocks: Iterable[str]) -> None:
         """
-        Write transaction entries to file.
+        Append blocks to the file, truncating back to its old length on error.
 
         Args:
-            f: File object
-            transactions: List of Transaction objects
+            blocks: Iterable of rendered blocks
+        """
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            start = f.tell()
+            try:
+                if start > 0 or not self.account_list:
+                    if start == 0:
+                        self._write_headers(f)
+                    self._write_blocks(f, blocks)
+                    return
+
+                with self._spool(self.file_path.parent) as spool:
+                    self._write_blocks(spool, blocks)
+                    f.write(self.render_account_list())
+                    self._write_headers(f)
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, f)
+            except BaseException:
+                f.truncate(start)
+                raise
+
+    def render_stream(self, batches: Iterable[TransactionBatch]) -> Iterator[str]:
+        """
+        Render IIF text for streaming instead of writing a file.
+
+        With ``account_list`` nothing can be yielded until every batch has
+        been rendered; the rendered text is spooled (in memory, then in a
+        temporary file) meanwhile.
+
+        Args:
+            batches: Iterable of validated TransactionBatch objects
+
+        Yields:
+            The account list if requested, the headers, then the rendered
+            blocks of each batch
+        """
+        self.accounts = set()
+        if not self.account_list:
+            yield HEADERS
+            for batch in batches:
+                self._add_accounts(batch)
+                yield self.render_batch(batch)
+            return
+
+        with self._spool() as spool:
+            for batch in batches:
+                self._add_accounts(batch)
+                spool.write(self.render_batch(batch))
+            yield self.render_account_list() + HEADERS
+            spool.seek(0)
+            while chunk := spool.read(DEFAULT_BUFFER_SIZE):
+                yield chunk
+
+    def write_blocks(self, blocks: Iterable[str], accounts: Iterable[str] = ()) -> None:
+        """
+        Write pre-rendered transaction blocks to IIF file.
+
+        Used when blocks are rendered elsewhere (for example in worker
+        processes) and only need to be concatenated after the headers.
+
+        Args:
+            blocks: Iterable of strings from ``format_transaction_block`` or
+                ``render_batch``
+            accounts: Accounts used by the blocks, for ``accounts`` and the
+                account list. Only read once every block has been written,
+                so it can be filled while the blocks are produced.
+
+        Raises:
+            IOError: If file cannot be written
+        """
+        self.accounts = set()
+        self._write_file(blocks, accounts)
+
+    def _write_file(self, blocks: Iterable[str], accounts: Iterable[str] = ()) -> int:
+        """
+        Write headers and rendered blocks, replacing the file on success.
+
+        Args:
+            blocks: Iterable of rendered blocks
+            accounts: Accounts to add to ``accounts`` after the blocks
+
+        Returns:
+            Number of strings written
+        """
+        logger.info("Writing transactions to IIF file: %s", self.file_path)
+
+        if self.profiler is not None:
+            with self.profiler.stage("write"):
+                return self._write_atomic(blocks, accounts)
+        return self._write_atomic(blocks, accounts)
+
+    def _write_atomic(self, blocks: Iterable[str], accounts: Iterable[str] = ()) -> int:
+        """
+        Write headers and blocks to a temporary file that replaces the output.
+
+        With ``account_list`` the blocks go to a spool first and are copied
+        after the account list and headers.
+
+        Args:
+            blocks: Iterable of rendered blocks
+            accounts: Accounts to add to ``accounts`` after the blocks
+
+        Returns:
+            Number of strings written
         """
+        with atomic_write(self.file_path, compression=self.compression) as f:
+            if not self.account_list:
+                self._write_headers(f)
+                count = self._write_blocks(f, blocks)
+                self.accounts.update(accounts)
+                return count
+
+            with self._spool(self.file_path.parent) as spool:
+                count = self._write_blocks(spool, blocks)
+                self.accounts.update(accounts)
+                f.write(self.render_account_list())
+                self._write_headers(f)
+                spool.seek(0)
+                shutil.copyfileobj(spool, f)
+            return count
+
+    def render_account_list(self) -> str:
+        """
+        Render the !ACCNT section for the collected accounts.
+
+        Returns:
+            The !ACCNT header and one ACCNT line per account and parent
+            account, parents first, with its type from ``account_types``
+
+        Raises:
+            ValueError: If an account has no type
+        """
+        account_types = self.account_types or {}
+        lines = []
+        untyped = []
+        for account in expand_accounts(self.accounts):
+            code = account_type(account, account_types)
+            if code is None:
+                untyped.append(account)
+            lines.append(f"ACCNT\t{account}\t{code}\n")
+
+        if untyped:
+            shown = ", ".join(untyped[:10]) + (", ..." if len(untyped) > 10 else "")
+            raise ValueError(f"No account type for {len(untyped)} accounts: {shown}")
+        return ACCOUNT_HEADER + "".join(lines)
+
+    def _add_accounts(self, batch: TransactionBatch) -> None:
+        """
+        Add the accounts of a batch to ``accounts``.
+
+        Args:
+            batch: Batch being written
+        """
+        self.accounts.update(batch.credit_accounts)
+        self.accounts.update(batch.debit_accounts)
+
+    def _track_accounts(
+        self, transactions: Iterable[Transaction | TransactionRow]
+    ) -> Iterator[Transaction | TransactionRow]:
+        """
+        Pass transactions through, adding their accounts to ``accounts``.
+
+        Args:
+            transactions: Transactions being written
+
+        Yields:
+            Each transaction
+        """
+        add = self.accounts.add
         for transaction in transactions:
-            self._write_transaction_block(f, transaction)
+            add(transaction.credit_account)
+            add(transaction.debit_account)
+            yield transaction
+
+    def _spool(self, directory: Path | None = None) -> IO[str]:
+        """
+        Open a temporary text file that stays in memory while it is small.
+
+        Args:
+            directory: Where to create the file if it grows (default: the
+                system temporary directory)
+
+        Returns:
+            Readable and writable text file, removed when closed
+        """
+        return tempfile.SpooledTemporaryFile(
+            max_size=_SPOOL_SIZE, mode="w+", encoding="utf-8", newline="", dir=directory
+        )
 
-    def _write_transaction_block(self, f, transaction: Transaction) -> None:
+    def _write_headers(self, f) -> None:
         """
-        Write a single transaction block (TRNS/SPL/ENDTRNS).
+        Write IIF headers to file.
 
         Args:
             f: File object
-            transaction: Transaction object
         """
-        trns_line = self._format_trns_line(transaction)
-        spl_line = self._format_spl_line(transaction)
+        f.write(HEADERS)
+
+    def _write_blocks(self, f, blocks: Iterable[str]) -> int:
+        """
+        Write rendered blocks to file.
+
+        Blocks are collected and flushed as one joined string each time
+        ``buffer_size`` characters have accumulated.
 
-        f.write(f"{trns_line}\n")
-        f.write(f"{spl_line}\n")
-        f.write("ENDTRNS\n")
+        Args:
+            f: File object
+            blocks: Iterable of rendered blocks
+
+        Returns:
+            Number of blocks written
 
-    def _format_trns_line(self, transaction: Transaction) -> str:
+        Raises:
+            ConversionCancelledError: If ``cancel_event`` is set
         """
-        Format TRNS line for transaction.
+        if self.cancel_event is not None:
+            blocks = _until_cancelled(blocks, self.cancel_event)
+
+        buffer_size = self.buffer_size
+        if buffer_size <= 0:
+            count = 0
+            for block in blocks:
+                f.write(block)
+                count += 1
+            return count
+
+        buffer: list[str] = []
+        buffered = 0
+        count = 0
+        for block in blocks:
+            buffer.append(block)
+            buffered += len(block)
+            count += 1
+            if buffered >= buffer_size:
+                f.write("".join(buffer))
+                buffer.clear()
+                buffered = 0
+
+        if buffer:
+            f.write("".join(buffer))
+        return count
+
+    def format_transaction_block(self, transaction: Transaction | TransactionRow) -> str:
+        """
+        Render a single transaction block (TRNS/SPL/ENDTRNS).
+
+        The TRNS line debits ``debit_account`` and the SPL line credits
+        ``credit_account`` with the negated amount.
 
         Args:
-            transaction: Transaction object
+            transaction: Transaction object or batch row
 
         Returns:
-            Formatted TRNS line
+            Newline-terminated TRNS, SPL and ENDTRNS lines
         """
+        date = transaction.date
+        name = transaction.name
+        amount = transaction.amount
+        number = transaction.number
+        memo = transaction.memo
         return (
-            f"TRNS\t\tGENERAL JOURNAL\t{transaction.date}\t"
-            f"{transaction.debit_account}\t{transaction.name}\t"
-            f"{transaction.amount}\t{transaction.number}\t{transaction.memo}"
+            f"TRNS\t\tGENERAL JOURNAL\t{date}\t{transaction.debit_account}\t{name}\t"
+            f"{amount}\t{number}\t{memo}\n"
+            f"SPL\t\tGENERAL JOURNAL\t{date}\t{transaction.credit_account}\t{name}\t"
+            f"-{amount}\t{number}\t{memo}\n"
+            "ENDTRNS\n"
         )
 
-    def _format_spl_line(self, transaction: Transaction) -> str:
+    def render_batch(self, batch: TransactionBatch) -> str:
         """
-        Format SPL line for transaction.
+        Render every row of a validated batch, reading the columns directly.
 
         Args:
-            transaction: Transaction object
+            batch: Validated TransactionBatch
 
         Returns:
-            Formatted SPL line
+            Concatenated blocks, identical to ``format_transaction_block`` for
+            each row
         """
-        negative_amount = f"-{transaction.amount}"
-        return (
-            f"SPL\t\tGENERAL JOURNAL\t{transaction.date}\t"
-            f"{transaction.credit_account}\t{transaction.name}\t"
-            f"{negative_amount}\t{transaction.number}\t{transaction.memo}"
+        return "".join(
+            [
+                f"TRNS\t\tGENERAL JOURNAL\t{date}\t{debit_account}\t{name}\t"
+                f"{amount}\t{number}\t{memo}\n"
+                f"SPL\t\tGENERAL JOURNAL\t{date}\t{credit_account}\t{name}\t"
+                f"-{amount}\t{number}\t{memo}\n"
+                "ENDTRNS\n"
+                for date, credit_account, debit_account, number, name, amount, memo in zip(
+                    batch.dates,
+                    batch.credit_accounts,
+                    batch.debit_accounts,
+                    batch.numbers,
+                    batch.names,
+                    batch.amounts,
+                    batch.memos,
+                    strict=True,
+                )
+            ]
         )
+
+
+def _until_cancelled(blocks: Iterable[str], cancel_event: threading.Event) -> Iterator[str]:
+    """
+    Pass blocks through, stopping once the event is set.
+
+    Args:
+        blocks: Iterable of rendered blocks
+        cancel_event: Event checked before each block
+
+    Yields:
+        Each block
+
+    Raises:
+        ConversionCancelledError: If the event is set
+    """
+    for block in blocks:
+        if cancel_event.is_set():
+            raise ConversionCancelledError("Conversion cancelled")
+        yield block
+
+
+def expand_accounts(accounts: Iterable[str]) -> list[str]:
+    """
+    Add the parents of colon-separated account names.
+
+    ``Expenses:Tools:Owner Contributed`` adds ``Expenses`` and
+    ``Expenses:Tools``. The work is done once per distinct account.
+
+    Args:
+        accounts: Distinct account names
+
+    Returns:
+        Sorted account names, each parent before its subaccounts
+    """
+    expanded = set()
+    for account in accounts:
+        if not account:
+            continue
+        expanded.add(account)
+        end = account.find(":")
+        while end != -1:
+            expanded.add(account[:end])
+            end = account.find(":", end + 1)
+    return sorted(expanded)
+
+
+def account_type(account: str, account_types: Mapping[str, str]) -> str | None:
+    """
+    Look up the ACCNTTYPE of an account.
+
+    The account's full name is tried first, then each parent from the
+    nearest up, so ``{"Expenses": "EXP"}`` also types ``Expenses:Tools``.
+    QuickBooks requires subaccounts to have the type of their parent.
+
+    Args:
+        account: Account name
+        account_types: ACCNTTYPE by account name
+
+    Returns:
+        ACCNTTYPE code, or None if neither the account nor a parent is listed
+    """
+    name = account
+    while True:
+        code = account_types.get(name)
+        if code is not None:
+            return code
+        end = name.rfind(":")
+        if end == -1:
+            return None
+        name = name[:end]
+
+
+def check_account_types(account_types: Mapping[str, str]) -> dict[str, str]:
+    """
+    Check that every account type is a QuickBooks ACCNTTYPE code.
+
+    Args:
+        account_types: ACCNTTYPE by account name
+
+    Returns:
+        The types as a new dictionary
+
+    Raises:
+        ValueError: If a name or code is not a string, or a code is unknown
+    """
+    checked = {}
+    for account, code in account_types.items():
+        if not isinstance(account, str) or not isinstance(code, str):
+            raise ValueError(f"Account types must map names to codes, got: {account!r}: {code!r}")
+        if code not in ACCOUNT_TYPES:
+            raise ValueError(
+                f"Unknown account type for {account}: {code} "
+                f"(expected one of {', '.join(sorted(ACCOUNT_TYPES))})"
+            )
+        checked[account] = code
+    return checked
+
+
+def load_account_types(path: str | Path) -> dict[str, str]:
+    """
+    Read account types from a JSON file.
+
+    Example::
+
+        {"Checking": "BANK", "Sales Income": "INC", "Expenses": "EXP"}
+
+    Args:
+        path: JSON file mapping account names to ACCNTTYPE codes
+
+    Returns:
+        ACCNTTYPE by account name
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not a valid mapping of account types
+    """
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid account types file {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Account types file {path} must hold a JSON object")
+    return check_account_types(data)
@@ -0,0 +1,312 @@
+"""Incremental conversion of append-only CSV files for csv2iif."""
+
+import csv
+import hashlib
+import io
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from csv2iif.compression import detect_compression
+from csv2iif.csv_reader import DEFAULT_BATCH_SIZE, CSVReader
+from csv2iif.fileutils import atomic_write
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.logger import setup_logger
+from csv2iif.models import TransactionBatch
+
+logger = setup_logger(__name__)
+
+MANIFEST_VERSION = 1
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass
+class Manifest:
+    """How much of a CSV file an IIF file already covers."""
+
+    offset: int
+    rows: int
+    transactions: int
+    prefix_sha256: str
+    output_size: int
+    version: int = MANIFEST_VERSION
+    schema: dict | None = None
+    account_types: dict[str, str] | None = None
+    accounts: list[str] | None = None
+
+
+class _NewAccountError(Exception):
+    """Raised while appending when a row uses an account the file does not list."""
+
+
+def manifest_path(output_path: str | Path) -> Path:
+    """
+    Return the sidecar manifest path for an IIF file.
+
+    Args:
+        output_path: Path to IIF file
+
+    Returns:
+        ``output_path`` with ``.manifest.json`` appended
+    """
+    return Path(f"{output_path}.manifest.json")
+
+
+def load_manifest(path: str | Path) -> Manifest | None:
+    """
+    Read a manifest file.
+
+    Args:
+        path: Manifest path
+
+    Returns:
+        The manifest, or None if it is missing, unreadable or from another
+        manifest version
+    """
+    import json
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = Manifest(**json.load(f))
+    except (OSError, ValueError, TypeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning("Ignoring unreadable manifest %s: %s", path, e)
+        return None
+
+    if manifest.version != MANIFEST_VERSION:
+        logger.warning("Ignoring manifest %s with version %s", path, manifest.version)
+        return None
+    return manifest
+
+
+def save_manifest(manifest: Manifest, path: str | Path) -> None:
+    """
+    Write a manifest file, replacing it only on success.
+
+    Args:
+        manifest: Manifest to save
+        path: Manifest path
+    """
+    import json
+
+    with atomic_write(Path(path)) as f:
+        json.dump(asdict(manifest), f, indent=2)
+        f.write("\n")
+
+
+def hash_prefix(path: str | Path, size: int) -> "hashlib._Hash":
+    """
+    Hash the first ``size`` bytes of a file.
+
+    Args:
+        path: File path
+        size: Number of bytes to hash
+
+    Returns:
+        SHA-256 hash object, which can be extended with later bytes
+    """
+    digest = hashlib.sha256()
+    remaining = size
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(_HASH_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def convert_incremental(
+    reader: CSVReader, writer: IIFWriter, convert_full: Callable[[], int]
+) -> tuple[int, bool]:
+    """
+    Convert only the rows appended to a CSV file since the last run.
+
+    The manifest next to the IIF file records the byte offset and row count
+    converted so far and a hash of those bytes. When the hash still matches
+    and the IIF file has not changed size, only the rows after the offset
+    are parsed and their blocks appended to the IIF file. Otherwise, for
+    example when an earlier row was edited, the file is rebuilt in full.
+    With an account list, the accounts it holds are kept in the manifest,
+    and appended rows that use any other account also cause a rebuild, so
+    the file keeps a single !ACCNT section at its start.
+
+    The input size is taken when the run starts, so rows appended while it
+    runs are left for the next run. Rows must be appended whole.
+
+    Args:
+        reader: CSV reader for the input file
+        writer: IIF writer for the output file
+        convert_full: Performs a full conversion and returns its transaction
+            count
+
+    Returns:
+        Number of transactions written and whether they were appended (as
+        opposed to a full rebuild)
+
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If either file is compressed, required columns are
+            missing or data is invalid
+    """
+    if not reader.file_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {reader.file_path}")
+    if writer.compression is not None or detect_compression(reader.file_path) is not None:
+        raise ValueError("Incremental conversion does not support compressed files")
+
+    path = manifest_path(writer.file_path)
+    size = reader.file_path.stat().st_size
+    manifest = load_manifest(path)
+
+    reason, digest = _check_manifest(manifest, reader, writer, size)
+    if reason is not None:
+        return _rebuild(reader, writer, convert_full, size, reason), False
+
+    logger.info(
+        "Appending rows after byte %s (row %s) of %s", manifest.offset, manifest.rows + 1, size
+    )
+    reader.records_read = reader.blank_rows = 0
+    count = 0
+    if size > manifest.offset:
+        with open(reader.file_path, encoding="utf-8") as f:
+            reader._validate_headers(next(csv.reader(f)))
+        with open(reader.file_path, "rb") as f:
+            f.seek(manifest.offset)
+            tail = f.read(size - manifest.offset)
+        rows = csv.reader(io.StringIO(tail.decode("utf-8"), newline=None))
+        batches = reader._parse_batches(rows, DEFAULT_BATCH_SIZE, manifest.rows + 2)
+        if manifest.accounts is not None:
+            batches = _known_accounts_only(batches, set(manifest.accounts))
+        try:
+            count = writer.append_batches(batches)
+        except _NewAccountError:
+            reason = "appended rows use accounts not in the account list"
+            return _rebuild(reader, writer, convert_full, size, reason), False
+
+        digest.update(tail)
+        manifest.offset = size
+        manifest.rows += reader.records_read
+        manifest.transactions += count
+        manifest.prefix_sha256 = digest.hexdigest()
+        manifest.output_size = writer.file_path.stat().st_size
+        save_manifest(manifest, path)
+    return count, True
+
+
+def _rebuild(
+    reader: CSVReader,
+    writer: IIFWriter,
+    convert_full: Callable[[], int],
+    size: int,
+    reason: str,
+) -> int:
+    """
+    Convert the whole input and save a manifest covering it.
+
+    Args:
+        reader: CSV reader for the input file
+        writer: IIF writer for the output file
+        convert_full: Performs a full conversion and returns its transaction
+            count
+        size: Input size in bytes when the run started
+        reason: Why the file is rebuilt, for the log
+
+    Returns:
+        Number of transactions written
+    """
+    logger.info("Rebuilding %s: %s", writer.file_path, reason)
+    path = manifest_path(writer.file_path)
+    count = convert_full()
+    if reader.file_path.stat().st_size != size:
+        # Rows appended during the run may or may not have been read.
+        logger.warning("%s grew during conversion; next run will rebuild", reader.file_path)
+        path.unlink(missing_ok=True)
+        return count
+
+    manifest = Manifest(
+        offset=size,
+        rows=reader.records_read,
+        transactions=count,
+        prefix_sha256=_timed_hash(reader, size).hexdigest(),
+        output_size=writer.file_path.stat().st_size,
+        schema=reader.schema.to_dict() or None,
+        account_types=writer.account_types,
+        accounts=sorted(writer.accounts) if writer.account_list else None,
+    )
+    save_manifest(manifest, path)
+    return count
+
+
+def _known_accounts_only(
+    batches: Iterable[TransactionBatch], known: set[str]
+) -> Iterator[TransactionBatch]:
+    """
+    Pass batches through, stopping at one that uses an account not in ``known``.
+
+    Args:
+        batches: Validated batches to append
+        known: Accounts the output's !ACCNT section already lists
+
+    Yields:
+        Each batch
+
+    Raises:
+        _NewAccountError: If a batch uses another account
+    """
+    for batch in batches:
+        if not (known.issuperset(batch.credit_accounts) and known.issuperset(batch.debit_accounts)):
+            raise _NewAccountError
+        yield batch
+
+
+def _check_manifest(
+    manifest: Manifest | None, reader: CSVReader, writer: IIFWriter, size: int
+) -> tuple[str | None, "hashlib._Hash | None"]:
+    """
+    Check whether the IIF file can be extended by appending.
+
+    Args:
+        manifest: Saved manifest, if any
+        reader: CSV reader for the input file
+        writer: IIF writer for the output file
+        size: Current input size in bytes
+
+    Returns:
+        Why a full rebuild is needed (None if appending is safe) and, when
+        appending, the hash of the already converted prefix
+    """
+    if manifest is None:
+        return "no manifest", None
+    if not writer.file_path.exists() or writer.file_path.stat().st_size != manifest.output_size:
+        return "output changed since last run", None
+    if size < manifest.offset:
+        return "input is shorter than last run", None
+    if size > manifest.offset > 0 and _byte_before(reader.file_path, manifest.offset) != b"\n":
+        # The last converted row had no line break, so the next bytes either
+        # start with one or extend that row.
+        return "last converted row was not terminated", None
+    if manifest.schema != (reader.schema.to_dict() or None):
+        return "column schema changed", None
+    if manifest.account_types != writer.account_types:
+        return "account types changed", None
+    digest = _timed_hash(reader, manifest.offset)
+    if digest.hexdigest() != manifest.prefix_sha256:
+        return "previously converted rows changed", None
+    return None, digest
+
+
+def _byte_before(path: Path, offset: int) -> bytes:
+    """Return the byte just before ``offset`` in a file."""
+    with open(path, "rb") as f:
+        f.seek(offset - 1)
+        return f.read(1)
+
+
+def _timed_hash(reader: CSVReader, size: int) -> "hashlib._Hash":
+    """Hash the input prefix, timed as "hash" when profiling."""
+    if reader.profiler is None:
+        return hash_prefix(reader.file_path, size)
+    with reader.profiler.stage("hash"):
+        return hash_prefix(reader.file_path, size)
@@ -0,0 +1,266 @@
+"""Record offset index for csv2iif."""
+
+import codecs
+import csv
+import io
+import mmap
+import re
+from array import array
+from itertools import accumulate, compress, count, repeat
+from operator import add, contains, not_
+from pathlib import Path
+
+from csv2iif.compression import detect_compression
+from csv2iif.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_SCAN_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Fields as the default csv dialect reads them: a quoted field, where a
+# doubled quote is a literal quote and text after the closing quote runs on
+# to the next comma, or an unquoted field, in which quotes are ordinary
+# characters. Possessive quantifiers keep matching linear.
+_FIELD = rb'(?:"(?:[^"]++|"")*+"[^,]*+|[^",][^,]*+|)'
+# A line whose quoted fields are all closed, starting at a field ...
+_CLOSED_LINE = re.compile(_FIELD + rb"(?:," + _FIELD + rb")*+")
+# ... or starting inside a quoted field carried over from the previous line.
+_CONTINUED_LINE = re.compile(rb'(?:[^"]++|"")*+"[^,]*+(?:,' + _FIELD + rb")*+")
+
+
+class RecordIndex:
+    """
+    Byte offsets of every record in a CSV file.
+
+    Records are numbered like rows in error messages: row 1 is the header
+    and row 2 the first data row. A record ends after a newline outside
+    quoted fields, so both LF and CRLF line endings work and newlines inside
+    quoted fields never split a record. As in ``csv.reader``, a quote only
+    opens a quoted field at the start of a field. A leading UTF-8 byte order mark is
+    skipped. Blank lines are records, as they are for ``csv.reader``.
+
+    Building the index scans the memory-mapped file once without decoding
+    it and keeps 8 bytes per record; afterwards counting rows, seeking to a
+    row and splitting the file into chunks need no further scanning.
+    """
+
+    def __init__(self, path: str | Path, offsets: array, size: int, bom: bool = False) -> None:
+        """
+        Initialize record index.
+
+        Args:
+            path: Path to CSV file
+            offsets: Start offset of each record, header first
+            size: File size the offsets were computed for
+            bom: Whether the file starts with a UTF-8 byte order mark
+        """
+        self.path = Path(path)
+        self.offsets = offsets
+        self.size = size
+        self.bom = bom
+
+    @classmethod
+    def build(cls, path: str | Path) -> "RecordIndex":
+        """
+        Scan a CSV file for record boundaries.
+
+        Args:
+            path: Path to CSV file
+
+        Returns:
+            RecordIndex for the file's current contents
+
+        Raises:
+            FileNotFoundError: If CSV file doesn't exist
+            ValueError: If the file is compressed
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"CSV file not found: {path}")
+        if detect_compression(path) is not None:
+            raise ValueError(f"Cannot index a compressed file: {path}")
+
+        size = path.stat().st_size
+        offsets = array("Q")
+        if size == 0:
+            return cls(path, offsets, 0)
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bom = mm[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8
+            start = len(codecs.BOM_UTF8) if bom else 0
+            offsets.append(start)
+            _scan(mm, start, offsets)
+
+        if offsets[-1] == size:
+            offsets.pop()
+        logger.debug("Indexed %s records in %s", len(offsets), path)
+        return cls(path, offsets, size, bom)
+
+    @property
+    def records(self) -> int:
+        """Number of records, including the header."""
+        return len(self.offsets)
+
+    @property
+    def rows(self) -> int:
+        """Number of data records after the header, including blank lines."""
+        return max(len(self.offsets) - 1, 0)
+
+    def offset(self, row: int) -> int:
+        """
+        Return the byte offset where a row starts.
+
+        Args:
+            row: Row number (1 is the header); ``records + 1`` gives the end
+                of the file
+
+        Returns:
+            Byte offset
+
+        Raises:
+            IndexError: If the row does not exist
+        """
+        if row == len(self.offsets) + 1:
+            return self.size
+        if not 1 <= row <= len(self.offsets):
+            raise IndexError(f"Row {row} out of range (1 to {len(self.offsets)})")
+        return self.offsets[row - 1]
+
+    def byte_range(self, row: int, count: int = 1) -> tuple[int, int]:
+        """
+        Return the byte range covering consecutive rows.
+
+        Args:
+            row: First row number (1 is the header)
+            count: Number of rows; the range stops at the end of the file
+
+        Returns:
+            ``(start, end)`` byte offsets
+
+        Raises:
+            IndexError: If the first row does not exist
+        """
+        start = self.offset(row)
+        end_row = min(row + count, len(self.offsets) + 1)
+        return start, self.offset(end_row)
+
+    def read(self, row: int, count: int = 1) -> list[list[str]]:
+        """
+        Parse consecutive rows without reading the rest of the file.
+
+        Args:
+            row: First row number (1 is the header)
+            count: Number of rows
+
+        Returns:
+            CSV records, as returned by ``csv.reader``
+
+        Raises:
+            IndexError: If the first row does not exist
+        """
+        start, end = self.byte_range(row, count)
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return list(csv.reader(io.StringIO(data.decode("utf-8"), newline=None)))
+
+    def chunks(self, chunk_size: int) -> list[tuple[int, int]]:
+        """
+        Split the data rows into byte ranges on record boundaries.
+
+        Used by ``parallel.split_chunks`` for chunked conversion and
+        validation; each range ends where the next record starts.
+
+        Args:
+            chunk_size: Approximate number of bytes per range
+
+        Returns:
+            Non-empty ``(start, end)`` byte ranges in file order
+        """
+        from bisect import bisect_right
+
+        offsets = self.offsets
+        size = self.size
+        data_start = offsets[1] if len(offsets) > 1 else size
+        starts = [data_start]
+        for target in range(data_start + chunk_size, size, chunk_size):
+            i = bisect_right(offsets, target)
+            starts.append(offsets[i] if i < len(offsets) else size)
+        return [
+            (start, end)
+            for start, end in zip(starts, [*starts[1:], size], strict=True)
+            if start < end
+        ]
+
+
+def _scan(mm: mmap.mmap, start: int, offsets: array) -> None:
+    """
+    Append the start offset of every record after the one at ``start``.
+
+    The file is split into lines block by block. A line ends a record unless
+    it ends inside a quoted field. Quotes follow the default ``csv`` dialect:
+    only a quote at the start of a field opens a quoted field, so a quote
+    elsewhere in an unquoted field (``2" PVC pipe``) is an ordinary
+    character. Line ends are summed with ``itertools.accumulate`` and lines
+    with quotes are matched with ``map``, so Python code only runs per line
+    for the lines of multi-line records.
+
+    Args:
+        mm: Memory-mapped file
+        start: Offset of the first record
+        offsets: Array the offsets are appended to; may end with the file
+            size when the file ends with a newline
+    """
+    size = len(mm)
+    pos = start
+    quoted = False
+    while pos < size:
+        end = mm.find(b"\n", min(pos + _SCAN_BLOCK_SIZE, size) - 1)
+        end = size if end == -1 else end + 1
+        lines = mm[pos:end].split(b"\n")
+        # The piece after the last newline belongs to the next block.
+        lines.pop()
+
+        line_ends = list(accumulate(map(add, map(len, lines), repeat(1)), initial=pos))
+        with_quotes = list(compress(count(), map(contains, lines, repeat(b'"'))))
+        # Lines that leave a quoted field open when they start outside one.
+        opening = compress(
+            with_quotes, map(not_, map(_CLOSED_LINE.fullmatch, map(lines.__getitem__, with_quotes)))
+        )
+
+        done = _close_quoted_field(lines, 0, line_ends, offsets) if quoted else 0
+        for i in opening:
+            if done is None:
+                break
+            if i < done:
+                continue
+            # Every line from ``done`` up to this one ends a record.
+            offsets.extend(line_ends[done + 1 : i + 1])
+            done = _close_quoted_field(lines, i + 1, line_ends, offsets)
+        quoted = done is None
+        if not quoted:
+            offsets.extend(line_ends[done + 1 :])
+        pos = end
+
+
+def _close_quoted_field(
+    lines: list[bytes], start: int, line_ends: list[int], offsets: array
+) -> int | None:
+    """
+    Find the line that ends a record whose quoted field is still open.
+
+    Args:
+        lines: Lines of the block, without newlines
+        start: Index of the first line, which starts inside a quoted field
+        line_ends: Offset of the start of each line, then of the block end
+        offsets: Array the end of the record is appended to
+
+    Returns:
+        Index of the line after the record, or None if the quoted field is
+        still open at the end of the block
+    """
+    for i in range(start, len(lines)):
+        if _CONTINUED_LINE.fullmatch(lines[i]) is not None:
+            offsets.append(line_ends[i + 1])
+            return i + 1
+    return None
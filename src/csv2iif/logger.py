@@ -3,11 +3,57 @@
 import logging
 import os
 
+LOG_FORMATS = ("text", "json")
+
+_TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_queue = None
+_listener = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats each record as a single-line JSON object for log shippers."""
+
+    def __init__(self) -> None:
+        """Initialize the formatter."""
+        import json
+
+        super().__init__(datefmt=_DATE_FORMAT)
+        self._dumps = json.dumps
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Render a record as JSON.
+
+        Args:
+            record: Log record
+
+        Returns:
+            JSON object with time, level, logger and message keys, plus
+            exception when the record carries exception info
+        """
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return self._dumps(entry)
+
 
 def setup_logger(name: str, level: str | None = None) -> logging.Logger:
     """
     Set up and configure a logger.
 
+    The level defaults to the ``LOG_LEVEL`` environment variable. Output
+    format and delivery are read from the environment alongside it:
+    ``LOG_FORMAT`` is "text" (default) or "json", and ``LOG_QUEUE=1`` hands
+    records to a background thread through a queue so that writing to
+    stderr never blocks the caller.
+
     Args:
         name: Logger name
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -24,13 +70,99 @@ def setup_logger(name: str, level: str | None = None) -> logging.Logger:
     logger.setLevel(numeric_level)
 
     if not logger.handlers:
-        handler = logging.StreamHandler()
+        if _queue_enabled():
+            from logging.handlers import QueueHandler
+
+            handler = QueueHandler(_start_listener())
+        else:
+            handler = _stream_handler()
         handler.setLevel(numeric_level)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        handler.setFormatter(formatter)
         logger.addHandler(handler)
 
     return logger
+
+
+def stop_listener() -> None:
+    """
+    Flush queued records and stop the background logging thread.
+
+    Registered with ``atexit`` when queue mode starts; safe to call more
+    than once. The next queued logger that is set up starts a new thread on
+    the same queue.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _queue_enabled() -> bool:
+    """Check whether ``LOG_QUEUE`` asks for queued logging."""
+    return os.getenv("LOG_QUEUE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _stream_handler() -> logging.Handler:
+    """
+    Create a stderr handler using the ``LOG_FORMAT`` formatter.
+
+    Returns:
+        Configured StreamHandler
+    """
+    log_format = os.getenv("LOG_FORMAT", "text").strip().lower()
+    handler = logging.StreamHandler()
+    if log_format == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt=_DATE_FORMAT))
+    return handler
+
+
+def _start_listener():
+    """
+    Start the shared queue listener on first use.
+
+    Every queued logger feeds the same queue, so records from all modules
+    are written in order by one thread.
+
+    Returns:
+        The queue that QueueHandlers should write to
+    """
+    global _queue, _listener
+
+    if _listener is None:
+        import atexit
+        import queue
+        from logging.handlers import QueueListener
+
+        if _queue is None:
+            _queue = queue.SimpleQueue()
+            atexit.register(stop_listener)
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=_log_directly_in_child)
+        _listener = QueueListener(_queue, _stream_handler())
+        _listener.start()
+
+    return _queue
+
+
+def _log_directly_in_child() -> None:
+    """
+    Swap queue handlers for plain stream handlers in a forked child.
+
+    The parent's listener thread does not exist in the child, and
+    multiprocessing children exit without running ``atexit``, so queued
+    records would never be written.
+    """
+    global _queue, _listener
+    from logging.handlers import QueueHandler
+
+    _queue = None
+    _listener = None
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        handlers = getattr(logger, "handlers", [])
+        for i, handler in enumerate(handlers):
+            if isinstance(handler, QueueHandler):
+                replacement = _stream_handler()
+                replacement.setLevel(handler.level)
+                handlers[i] = replacement
@@ -0,0 +1,129 @@
+"""Run metrics for csv2iif."""
+
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from csv2iif.profiling import StageTimer
+from csv2iif.symbols import SymbolStats
+
+
+@dataclass
+class StageMetrics:
+    """Time spent in one pipeline stage."""
+
+    wall_seconds: float
+    cpu_seconds: float
+    calls: int
+
+
+@dataclass
+class ConversionResult:
+    """
+    Outcome and throughput metrics of a conversion.
+
+    CPU time covers this process and, for parallel conversions, its worker
+    processes. Peak RSS is the high-water mark of this process over its
+    whole lifetime, so it is only meaningful for the first run in a process.
+
+    For an incremental run that only appended new rows, ``appended`` is True
+    and the row and transaction counts cover the appended rows only. When
+    the output was copied from the conversion cache, ``cached`` is True.
+
+    ``symbols`` counts distinct versus total values of the interned
+    "accounts" (credit and debit) and "names" columns; it is empty when the
+    output came from the cache.
+    """
+
+    input_path: str
+    output_path: str
+    transactions: int
+    rows_read: int
+    blank_rows: int
+    bytes_in: int
+    bytes_out: int
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_bytes: int | None = None
+    stages: dict[str, StageMetrics] = field(default_factory=dict)
+    appended: bool = False
+    cached: bool = False
+    symbols: dict[str, SymbolStats] = field(default_factory=dict)
+
+    @property
+    def rows_per_sec(self) -> float | None:
+        """Transactions converted per second of wall time."""
+        if not self.wall_seconds:
+            return None
+        return self.transactions / self.wall_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert to a JSON-serializable dictionary.
+
+        Returns:
+            Every field plus ``rows_per_sec``
+        """
+        data = asdict(self)
+        data["rows_per_sec"] = self.rows_per_sec
+        return data
+
+    def write_json(self, path: str | Path) -> None:
+        """
+        Write the metrics to a JSON file.
+
+        Args:
+            path: Output path
+        """
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+def stage_metrics(timer: StageTimer) -> dict[str, StageMetrics]:
+    """
+    Collect per-stage metrics from a timer.
+
+    Args:
+        timer: Timer used for the run
+
+    Returns:
+        StageMetrics by stage name
+    """
+    return {
+        name: StageMetrics(seconds, timer.cpu_totals.get(name, 0.0), timer.calls[name])
+        for name, seconds in timer.totals.items()
+    }
+
+
+def cpu_time() -> float:
+    """
+    Return CPU time used so far by this process and its reaped children.
+
+    Returns:
+        User plus system CPU seconds
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def peak_rss_bytes() -> int | None:
+    """
+    Return the peak resident set size of this process.
+
+    Returns:
+        Peak RSS in bytes, or None where the ``resource`` module is
+        unavailable (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -1,8 +1,28 @@
 """Data models for csv2iif."""
 
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import datetime
-from decimal import Decimal, InvalidOperation
+from typing import NamedTuple
+
+from csv2iif.backends import FieldError, validate_columns
+from csv2iif.parsing import normalize_amount, validate_date, validate_required_fields
+
+
+class RowError(ValueError):
+    """Raised when a CSV data row cannot be converted to a Transaction."""
+
+    def __init__(self, row_num: int, reason: str) -> None:
+        """
+        Initialize row error.
+
+        Args:
+            row_num: 1-based CSV record number (the header is row 1)
+            reason: Description of what is wrong with the row
+        """
+        super().__init__(f"Error in row {row_num}: {reason}")
+        self.row_num = row_num
+        self.reason = reason
 
 
 @dataclass
@@ -25,37 +45,169 @@ class Transaction:
 
     def _validate_date(self) -> None:
         """Validate date format is MM/DD/YYYY and represents a valid date."""
-        try:
-            datetime.strptime(self.date, "%m/%d/%Y")
-        except ValueError as e:
-            raise ValueError(f"Invalid date format '{self.date}': {e}") from e
+        validate_date(self.date)
 
     def _validate_amount(self) -> None:
         """Validate amount is positive and format to 2 decimal places."""
-        amount_str = self.amount.strip()
-        amount_str = amount_str.lstrip("$").replace(",", "")
+        self.amount = normalize_amount(self.amount)
 
-        try:
-            amount_decimal = Decimal(amount_str)
-        except (InvalidOperation, ValueError) as e:
-            raise ValueError(f"Invalid amount '{self.amount}': {e}") from e
+    def _validate_required_fields(self) -> None:
+        """Validate all required fields are non-empty."""
+        validate_required_fields(
+            {
+                "date": self.date,
+                "credit_account": self.credit_account,
+                "debit_account": self.debit_account,
+                "amount": self.amount,
+                "memo": self.memo,
+            }
+        )
 
-        if amount_decimal <= 0:
-            raise ValueError(f"Amount must be positive, got: {self.amount}")
 
-        self.amount = f"{amount_decimal:.2f}"
+class TransactionRow(NamedTuple):
+    """Read-only view of one row in a TransactionBatch."""
 
-    def _validate_required_fields(self) -> None:
-        """Validate all required fields are non-empty."""
-        fields = {
-            "date": self.date,
-            "credit_account": self.credit_account,
-            "debit_account": self.debit_account,
-            "amount": self.amount,
-            "memo": self.memo,
-        }
-
-        empty_fields = [name for name, value in fields.items() if not value or not value.strip()]
-
-        if empty_fields:
-            raise ValueError(f"Required fields cannot be empty: {', '.join(empty_fields)}")
+    date: str
+    credit_account: str
+    debit_account: str
+    number: str
+    name: str
+    amount: str
+    memo: str
+
+
+class TransactionBatch:
+    """
+    Column-oriented collection of transactions.
+
+    Each field is stored in its own list and the CSV row numbers in a compact
+    integer array, avoiding a per-row object and ``__dict__``. Iterating a
+    batch yields TransactionRow tuples with the same attribute names as
+    Transaction, so a validated batch can be passed straight to IIFWriter.
+    """
+
+    __slots__ = (
+        "dates",
+        "credit_accounts",
+        "debit_accounts",
+        "numbers",
+        "names",
+        "amounts",
+        "memos",
+        "row_numbers",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty batch."""
+        self.dates: list[str] = []
+        self.credit_accounts: list[str] = []
+        self.debit_accounts: list[str] = []
+        self.numbers: list[str] = []
+        self.names: list[str] = []
+        self.amounts: list[str] = []
+        self.memos: list[str] = []
+        self.row_numbers = array("q")
+
+    def append(
+        self,
+        date: str,
+        credit_account: str,
+        debit_account: str,
+        number: str,
+        name: str,
+        amount: str,
+        memo: str,
+        row_num: int = 0,
+    ) -> None:
+        """
+        Append a raw, unvalidated row.
+
+        Args:
+            date: Transaction date (MM/DD/YYYY)
+            credit_account: Account to credit
+            debit_account: Account to debit
+            number: Transaction/check number
+            name: Payee/customer name
+            amount: Transaction amount
+            memo: Transaction memo
+            row_num: CSV row number used in error messages
+        """
+        self.dates.append(date)
+        self.credit_accounts.append(credit_account)
+        self.debit_accounts.append(debit_account)
+        self.numbers.append(number)
+        self.names.append(name)
+        self.amounts.append(amount)
+        self.memos.append(memo)
+        self.row_numbers.append(row_num)
+
+    def validate(self, backend: str | None = None) -> None:
+        """
+        Validate every row and normalize amounts in place.
+
+        Rows are checked in the same order and with the same messages as
+        Transaction.
+
+        Args:
+            backend: Validation backend, see ``backends.select_backend``
+
+        Raises:
+            RowError: For the first invalid row
+        """
+        errors = self.collect_errors(backend)
+        if errors:
+            first = errors[0]
+            raise RowError(self.row_numbers[first.index], first.message)
+
+    def collect_errors(self, backend: str | None = None) -> list[FieldError]:
+        """
+        Validate every row, normalizing valid amounts in place.
+
+        Args:
+            backend: Validation backend, see ``backends.select_backend``
+
+        Returns:
+            Every failing row as a FieldError, ordered by index
+        """
+        result = validate_columns(
+            self.dates,
+            self.credit_accounts,
+            self.debit_accounts,
+            self.amounts,
+            self.memos,
+            backend=backend,
+        )
+        self.amounts = result.amounts
+        return result.errors
+
+    def __len__(self) -> int:
+        """Return the number of rows in the batch."""
+        return len(self.dates)
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        """Return the row at ``index``."""
+        return TransactionRow(
+            self.dates[index],
+            self.credit_accounts[index],
+            self.debit_accounts[index],
+            self.numbers[index],
+            self.names[index],
+            self.amounts[index],
+            self.memos[index],
+        )
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        """Iterate over rows in order."""
+        return map(
+            TransactionRow._make,
+            zip(
+                self.dates,
+                self.credit_accounts,
+                self.debit_accounts,
+                self.numbers,
+                self.names,
+                self.amounts,
+                self.memos,
+                strict=True,
+            ),
+        )
@@ -0,0 +1,222 @@
+"""Multi-process chunked conversion for csv2iif."""
+
+import csv
+import io
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from csv2iif.csv_reader import CSVReader
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.index import RecordIndex
+from csv2iif.logger import setup_logger
+from csv2iif.models import RowError
+from csv2iif.schema import RowExtractor
+from csv2iif.symbols import SymbolTable
+
+logger = setup_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+ChunkResult = tuple[str, int, int, tuple[int, str] | None, SymbolTable, SymbolTable]
+
+
+def split_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """
+    Split the data records of a CSV file into byte ranges.
+
+    The header record is skipped and every range starts and ends on a record
+    boundary, taken from a ``RecordIndex`` of the file.
+
+    Args:
+        path: Path to CSV file
+        chunk_size: Approximate number of bytes per range
+
+    Returns:
+        Non-empty ``(start, end)`` byte ranges in file order
+    """
+    return RecordIndex.build(path).chunks(chunk_size)
+
+
+def read_chunk(path: str | Path, start: int, end: int) -> list[list[str]]:
+    """
+    Parse the CSV records in one byte range.
+
+    Args:
+        path: Path to CSV file
+        start: Byte offset of the first record
+        end: Byte offset just past the last record
+
+    Returns:
+        CSV records in the range
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    return list(csv.reader(io.StringIO(data.decode("utf-8"), newline=None)))
+
+
+def convert_parallel(
+    reader: CSVReader,
+    writer: IIFWriter,
+    jobs: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Convert a CSV file to IIF using a pool of worker processes.
+
+    The data rows are split into byte ranges on record boundaries, each range
+    is parsed, validated and rendered in a worker, and the rendered blocks are
+    written back in their original order.
+
+    Args:
+        reader: CSV reader for the input file
+        writer: IIF writer for the output file
+        jobs: Number of worker processes
+        chunk_size: Approximate number of bytes per chunk
+
+    Returns:
+        Number of transactions written
+
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If required columns are missing or data is invalid
+    """
+    if not reader.file_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {reader.file_path}")
+
+    with open(reader.file_path, encoding="utf-8") as f:
+        headers = next(csv.reader(f), None)
+
+    if headers is None:
+        raise ValueError("CSV file is empty")
+
+    reader._validate_headers(headers)
+
+    ranges = split_chunks(reader.file_path, chunk_size)
+
+    logger.info(
+        "Converting %s in %s chunks with %s worker processes", reader.file_path, len(ranges), jobs
+    )
+
+    tasks = [
+        (
+            str(reader.file_path),
+            str(writer.file_path),
+            start,
+            end,
+            reader.extractor,
+            reader.backend,
+        )
+        for start, end in ranges
+    ]
+    totals = {"transactions": 0, "records": 0}
+    reader.accounts = SymbolTable()
+    reader.names = SymbolTable()
+    blocks = _ordered_blocks(tasks, jobs, totals, reader)
+    if reader.profiler is not None:
+        # Workers read, parse, validate and render; the parent only sees the
+        # time spent waiting for their results.
+        blocks = reader.profiler.wrap(blocks, "workers")
+    writer.write_blocks(blocks, reader.accounts)
+    reader.records_read = totals["records"]
+    reader.blank_rows = totals["records"] - totals["transactions"]
+    return totals["transactions"]
+
+
+def _ordered_blocks(
+    tasks: list[tuple], jobs: int, totals: dict[str, int], reader: CSVReader
+) -> Iterator[str]:
+    """
+    Run chunk tasks in a process pool and yield their output in order.
+
+    At most ``2 * jobs`` chunks are in flight, so memory stays bounded no
+    matter how many chunks the file is split into.
+
+    Args:
+        tasks: Arguments for ``_convert_chunk``, in file order
+        jobs: Number of worker processes
+        totals: Accumulates the number of records read and transactions
+            written
+        reader: Reader whose symbol tables collect the workers' values
+
+    Yields:
+        Rendered IIF text for each chunk
+
+    Raises:
+        RowError: If a row is invalid, with its absolute row number
+    """
+    next_row = 2
+    pending: deque[Future[ChunkResult]] = deque()
+    task_iter = iter(tasks)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for task in task_iter:
+                pending.append(pool.submit(_convert_chunk, *task))
+                if len(pending) >= 2 * jobs:
+                    break
+
+            while pending:
+                text, records, transactions, error, accounts, names = pending.popleft().result()
+                if error is not None:
+                    relative_row, reason = error
+                    raise RowError(next_row + relative_row - 1, reason)
+
+                task = next(task_iter, None)
+                if task is not None:
+                    pending.append(pool.submit(_convert_chunk, *task))
+
+                reader.accounts.update(accounts)
+                reader.names.update(names)
+                next_row += records
+                totals["records"] += records
+                totals["transactions"] += transactions
+                yield text
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _convert_chunk(
+    input_path: str,
+    output_path: str,
+    start: int,
+    end: int,
+    extractor: RowExtractor,
+    backend: str | None = None,
+) -> ChunkResult:
+    """
+    Parse, validate and render one byte range of a CSV file.
+
+    Args:
+        input_path: Path to CSV file
+        output_path: Path to IIF file (used to build the writer)
+        start: Byte offset of the first record in the chunk
+        end: Byte offset just past the last record in the chunk
+        extractor: Extractor from the parent's header validation
+        backend: Validation backend name
+
+    Returns:
+        Tuple of rendered text, CSV records consumed, transactions rendered,
+        ``(relative_row, reason)`` for the first invalid row or None, and
+        the chunk's account and name symbol tables
+    """
+    rows = read_chunk(input_path, start, end)
+
+    reader = CSVReader(input_path, backend=backend)
+    reader.extractor = extractor
+    writer = IIFWriter(output_path)
+
+    blocks = []
+    transactions = 0
+    try:
+        for batch in reader._parse_batches(iter(rows), len(rows), start_row=1):
+            blocks.append(writer.render_batch(batch))
+            transactions += len(batch)
+    except RowError as e:
+        return "", len(rows), 0, (e.row_num, e.reason), reader.accounts, reader.names
+
+    return "".join(blocks), len(rows), transactions, None, reader.accounts, reader.names
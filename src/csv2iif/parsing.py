@@ -0,0 +1,198 @@
+"""Fast field parsers for csv2iif."""
+
+import re
+from functools import lru_cache
+
+DATE_CACHE_SIZE = 4096
+
+# Same pattern datetime.strptime compiles for "%m/%d/%Y", so the accepted
+# inputs and error messages are unchanged.
+_DATE_RE = re.compile(
+    r"(1[0-2]|0[1-9]|[1-9])/(3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])/(\d\d\d\d)",
+    re.IGNORECASE,
+)
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Plain amounts such as "123.45", "$1,234.50" or "500" with at most two
+# decimal places; anything else goes through Decimal.
+_AMOUNT_RE = re.compile(r"\$*([0-9]+(?:,[0-9]{3})*)(?:\.([0-9]{0,2}))?")
+
+
+def is_leap_year(year: int) -> bool:
+    """
+    Check whether a year is a Gregorian leap year.
+
+    Args:
+        year: Four-digit year
+
+    Returns:
+        True if February has 29 days in the year
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year: int, month: int) -> int:
+    """
+    Return the number of days in a month.
+
+    Args:
+        year: Four-digit year
+        month: Month number (1-12)
+
+    Returns:
+        Number of days in the month
+    """
+    if month == 2 and is_leap_year(year):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> tuple[int, int, int]:
+    """
+    Parse a strict MM/DD/YYYY date.
+
+    Accepts exactly what ``datetime.strptime(value, "%m/%d/%Y")`` accepts and
+    raises the same error messages, without its locale and format-compilation
+    overhead. Results are memoized in a bounded LRU keyed by the raw string;
+    ``parse_date.cache_info()`` reports hits and misses.
+
+    Args:
+        value: Date string
+
+    Returns:
+        Tuple of (year, month, day)
+
+    Raises:
+        ValueError: If the string is not a valid calendar date
+    """
+    match = _DATE_RE.match(value)
+    if match is None:
+        raise ValueError(f"time data {value!r} does not match format '%m/%d/%Y'")
+    if match.end() != len(value):
+        raise ValueError(f"unconverted data remains: {value[match.end() :]}")
+
+    month = int(match.group(1))
+    day = int(match.group(2))
+    year = int(match.group(3))
+
+    if year < 1:
+        raise ValueError(f"year {year} is out of range")
+    if day > days_in_month(year, month):
+        raise ValueError("day is out of range for month")
+
+    return year, month, day
+
+
+def normalize_amount(value: str) -> str:
+    """
+    Validate a positive amount and format it to 2 decimal places.
+
+    Common shapes are normalized with a precompiled pattern and plain string
+    operations; everything else falls back to ``Decimal``. Both paths produce
+    identical output and error messages.
+
+    Args:
+        value: Amount string, optionally with a leading "$" and thousands commas
+
+    Returns:
+        Amount formatted with exactly two decimal places
+
+    Raises:
+        ValueError: If the amount is not a number or is not positive
+    """
+    normalized = _fast_normalize_amount(value)
+    if normalized is None:
+        normalized = _normalize_amount_decimal(value)
+    return normalized
+
+
+def _fast_normalize_amount(value: str) -> str | None:
+    """
+    Normalize a plain positive amount without creating a Decimal.
+
+    Args:
+        value: Amount string
+
+    Returns:
+        Normalized amount, or None if the value needs the Decimal path
+    """
+    match = _AMOUNT_RE.fullmatch(value)
+    if match is None:
+        return None
+
+    whole, fraction = match.groups()
+    if "," in whole:
+        whole = whole.replace(",", "")
+    if whole[0] == "0":
+        whole = whole.lstrip("0") or "0"
+        if whole == "0" and (fraction is None or not fraction.strip("0")):
+            return None
+
+    if fraction is None:
+        return whole + ".00"
+    if len(fraction) == 2:
+        return whole + "." + fraction
+    return f"{whole}.{fraction:0<2}"
+
+
+def _normalize_amount_decimal(value: str) -> str:
+    """
+    Normalize an amount using Decimal parsing.
+
+    Args:
+        value: Amount string
+
+    Returns:
+        Amount formatted with exactly two decimal places
+
+    Raises:
+        ValueError: If the amount is not a number or is not positive
+    """
+    # Only unusual amounts reach this path, so decimal is imported on demand.
+    from decimal import Decimal, InvalidOperation
+
+    amount_str = value.strip()
+    amount_str = amount_str.lstrip("$").replace(",", "")
+
+    try:
+        amount_decimal = Decimal(amount_str)
+    except (InvalidOperation, ValueError) as e:
+        raise ValueError(f"Invalid amount '{value}': {e}") from e
+
+    if amount_decimal <= 0:
+        raise ValueError(f"Amount must be positive, got: {value}")
+
+    return f"{amount_decimal:.2f}"
+
+
+def validate_date(value: str) -> None:
+    """
+    Validate date format is MM/DD/YYYY and represents a valid date.
+
+    Args:
+        value: Date string
+
+    Raises:
+        ValueError: If the date is invalid
+    """
+    try:
+        parse_date(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid date format '{value}': {e}") from e
+
+
+def validate_required_fields(fields: dict[str, str]) -> None:
+    """
+    Validate all required fields are non-empty.
+
+    Args:
+        fields: Mapping of field name to value
+
+    Raises:
+        ValueError: If any field is empty
+    """
+    empty_fields = [name for name, value in fields.items() if not value or not value.strip()]
+
+    if empty_fields:
+        raise ValueError(f"Required fields cannot be empty: {', '.join(empty_fields)}")
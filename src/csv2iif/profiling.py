@@ -0,0 +1,213 @@
+"""Per-stage timing for csv2iif."""
+
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """
+    Accumulates wall time per pipeline stage.
+
+    Stages may nest, including a stage started while pulling an item from a
+    generator that is timed as another stage. Each stage is charged only its
+    exclusive time, so the per-stage totals add up to the time spent inside
+    any stage. Subclasses can override ``record`` to forward measurements
+    elsewhere.
+
+    Components take an optional timer and skip all timing when it is None,
+    so an unprofiled run pays nothing beyond a few ``is None`` checks.
+    """
+
+    def __init__(self, per_record: bool = True, cpu: bool = False) -> None:
+        """
+        Initialize an empty timer and start its wall clock.
+
+        Args:
+            per_record: Let components time work done for every CSV record
+                (such as tokenizing) as its own stage. Without it only
+                per-batch and per-file stages are timed, which keeps the
+                overhead negligible.
+            cpu: Also measure process CPU time per stage
+        """
+        self.per_record = per_record
+        self.cpu = cpu
+        self.totals: dict[str, float] = {}
+        self.cpu_totals: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._stack: list[list[Any]] = []
+
+    def reset(self) -> None:
+        """Discard every recorded stage and restart the wall clock."""
+        self.totals.clear()
+        self.cpu_totals.clear()
+        self.calls.clear()
+        self.started = time.perf_counter()
+
+    def start(self, name: str) -> None:
+        """
+        Enter a stage.
+
+        Args:
+            name: Stage name
+        """
+        cpu_start = time.process_time() if self.cpu else 0.0
+        self._stack.append([name, time.perf_counter(), cpu_start, 0.0, 0.0])
+
+    def stop(self) -> None:
+        """Leave the most recently entered stage and record its time."""
+        name, start, cpu_start, nested, nested_cpu = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        cpu_elapsed = time.process_time() - cpu_start if self.cpu else 0.0
+        if self._stack:
+            parent = self._stack[-1]
+            parent[3] += elapsed
+            parent[4] += cpu_elapsed
+        self.record(name, elapsed - nested, cpu_elapsed - nested_cpu)
+
+    def record(self, name: str, seconds: float, cpu_seconds: float = 0.0) -> None:
+        """
+        Add exclusive time to a stage.
+
+        Args:
+            name: Stage name
+            seconds: Wall time spent in the stage, excluding nested stages
+            cpu_seconds: CPU time spent in the stage, excluding nested stages
+        """
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.cpu_totals[name] = self.cpu_totals.get(name, 0.0) + cpu_seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def stage(self, name: str) -> "_Stage":
+        """
+        Time a block of code as a stage.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Context manager that starts and stops the stage
+        """
+        return _Stage(self, name)
+
+    def wrap(self, iterable: Iterable[T], name: str) -> Iterator[T]:
+        """
+        Time every ``next()`` on an iterable as a stage.
+
+        Time the consumer spends between items is not charged to the stage.
+
+        Args:
+            iterable: Iterable to time
+            name: Stage name
+
+        Yields:
+            Items of ``iterable``
+        """
+        if self.cpu:
+            yield from self._wrap_with_cpu(iterable, name)
+            return
+
+        # Same bookkeeping as start()/stop() without CPU time, inlined because
+        # this may run once per CSV record.
+        iterator = iter(iterable)
+        stack = self._stack
+        clock = time.perf_counter
+        record = self.record
+        while True:
+            frame = [name, clock(), 0.0, 0.0, 0.0]
+            stack.append(frame)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                stack.pop()
+                elapsed = clock() - frame[1]
+                if stack:
+                    stack[-1][3] += elapsed
+                record(name, elapsed - frame[3])
+            yield item
+
+    def _wrap_with_cpu(self, iterable: Iterable[T], name: str) -> Iterator[T]:
+        """
+        Time every ``next()`` on an iterable, including CPU time.
+
+        Args:
+            iterable: Iterable to time
+            name: Stage name
+
+        Yields:
+            Items of ``iterable``
+        """
+        iterator = iter(iterable)
+        while True:
+            self.start(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.stop()
+            yield item
+
+    def timed(self, func: Callable[..., T], name: str) -> Callable[..., T]:
+        """
+        Wrap a function so every call is timed as a stage.
+
+        Args:
+            func: Function to time
+            name: Stage name
+
+        Returns:
+            Wrapped function
+        """
+
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            self.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop()
+
+        return wrapper
+
+    def format_report(self) -> str:
+        """
+        Render the per-stage breakdown as a text table.
+
+        Returns:
+            Table with time, share of wall time and call count per stage
+        """
+        wall = time.perf_counter() - self.started
+        header = f"{'Stage':<12}{'Time (s)':>10}{'Share':>9}{'Calls':>10}"
+        lines = [header + (f"{'CPU (s)':>10}" if self.cpu else "")]
+        for name, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            share = seconds / wall * 100 if wall else 0.0
+            line = f"{name:<12}{seconds:>10.3f}{share:>8.1f}%{self.calls[name]:>10}"
+            lines.append(line + (f"{self.cpu_totals[name]:>10.3f}" if self.cpu else ""))
+        other = max(wall - sum(self.totals.values()), 0.0)
+        lines.append(f"{'other':<12}{other:>10.3f}{other / wall * 100 if wall else 0.0:>8.1f}%")
+        lines.append(f"{'total':<12}{wall:>10.3f}")
+        return "\n".join(lines)
+
+
+class _Stage:
+    """Context manager returned by ``StageTimer.stage``."""
+
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer: StageTimer, name: str) -> None:
+        """Bind the stage name to its timer."""
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        """Start the stage."""
+        self.timer.start(self.name)
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the stage, also when an exception is raised."""
+        self.timer.stop()
@@ -0,0 +1,246 @@
+"""Column schemas for csv2iif."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from csv2iif.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Transaction fields, in the order extractors return them.
+COLUMNS = ("date", "credit-account", "debit-account", "number", "name", "amount", "memo")
+
+
+@dataclass
+class ColumnSchema:
+    """
+    Maps the columns of a CSV export to transaction fields.
+
+    Header names are matched case-insensitively and ignoring surrounding
+    whitespace. A field is read from the column named after it (such as
+    ``debit-account``) or, failing that, from the first of its aliases
+    present in the file (such as ``Debit Acct``). A field with a default
+    may be missing from the file, and blank cells in its column get the
+    default too. Every other field is required.
+
+    Attributes:
+        aliases: Other header names for each field
+        defaults: Values for fields that are missing or blank
+    """
+
+    aliases: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    defaults: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """
+        Check the schema and store aliases as tuples.
+
+        Raises:
+            ValueError: If a field is unknown, a value is not a string, or
+                one header name is given for two fields
+        """
+        for mapping in (self.aliases, self.defaults):
+            unknown = mapping.keys() - set(COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown columns in schema: {', '.join(sorted(unknown))}")
+
+        self.aliases = {
+            column: (names,) if isinstance(names, str) else tuple(names)
+            for column, names in self.aliases.items()
+        }
+        owners = {column: column for column in COLUMNS}
+        for column, names in self.aliases.items():
+            for name in names:
+                if not isinstance(name, str):
+                    raise ValueError(f"Alias for {column} must be a string, got: {name!r}")
+                owner = owners.setdefault(_normalize(name), column)
+                if owner != column:
+                    raise ValueError(f"Alias {name!r} is used for both {owner} and {column}")
+
+        for column, default in self.defaults.items():
+            if not isinstance(default, str):
+                raise ValueError(f"Default for {column} must be a string, got: {default!r}")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnSchema":
+        """
+        Build a schema from its dictionary form.
+
+        Args:
+            data: Dictionary with optional "aliases" and "defaults" keys
+
+        Returns:
+            ColumnSchema
+
+        Raises:
+            ValueError: If the dictionary is not a valid schema
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Schema must be a JSON object")
+        unknown = data.keys() - {"aliases", "defaults"}
+        if unknown:
+            raise ValueError(f"Unknown schema keys: {', '.join(sorted(unknown))}")
+        aliases = data.get("aliases", {})
+        defaults = data.get("defaults", {})
+        if not isinstance(aliases, dict) or not isinstance(defaults, dict):
+            raise ValueError("Schema aliases and defaults must be JSON objects")
+        return cls(aliases, defaults)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ColumnSchema":
+        """
+        Read a schema from a JSON file.
+
+        Example::
+
+            {
+              "aliases": {"date": ["Txn Date"], "debit-account": ["Debit Acct"]},
+              "defaults": {"number": "", "memo": ""}
+            }
+
+        Args:
+            path: Schema file path
+
+        Returns:
+            ColumnSchema
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a valid schema
+        """
+        import json
+
+        with open(path, encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid schema file {path}: {e}") from e
+        logger.debug("Loaded column schema from %s", path)
+        return cls.from_dict(data)
+
+    def to_dict(self) -> dict:
+        """
+        Return the dictionary form of the schema, as read by ``from_dict``.
+
+        Returns:
+            Dictionary with the non-empty "aliases" and "defaults"; empty for
+            the default schema
+        """
+        data: dict[str, dict] = {}
+        if self.aliases:
+            data["aliases"] = {column: list(names) for column, names in self.aliases.items()}
+        if self.defaults:
+            data["defaults"] = dict(self.defaults)
+        return data
+
+    def compile(self, headers: list[str]) -> "RowExtractor":
+        """
+        Resolve the schema against a header row.
+
+        Args:
+            headers: List of column names from CSV
+
+        Returns:
+            RowExtractor for records with these headers
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        positions: dict[str, int] = {}
+        for i, header in enumerate(headers):
+            normalized = _normalize(header)
+            if normalized and normalized not in positions:
+                positions[normalized] = i
+
+        sources = []
+        missing = []
+        for column in COLUMNS:
+            names = (column, *map(_normalize, self.aliases.get(column, ())))
+            index = next((positions[name] for name in names if name in positions), None)
+            default = self.defaults.get(column)
+            if index is None and default is None:
+                missing.append(column)
+            sources.append((index, default))
+
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+        return RowExtractor(tuple(sources))
+
+
+class RowExtractor:
+    """
+    Pulls the stripped transaction fields out of CSV records.
+
+    The column positions and defaults are fixed once per file and compiled
+    into ``extract``, a function that indexes each column directly, the way
+    ``collections.namedtuple`` generates its methods. This avoids a
+    column-name lookup per field per row, and runs faster than
+    ``operator.itemgetter`` followed by a separate strip of each value.
+    Extractors can be pickled, so they can be sent to worker processes.
+
+    Attributes:
+        sources: Per field in COLUMNS order, its column index (None if the
+            file lacks it) and its default (None if it has none)
+        column_mapping: Column index of each field present in the file
+        width: Fewest cells a record needs to hold every present field
+        extract: Function from a record to a tuple of field values in
+            COLUMNS order; raises IndexError for a record that is too short
+    """
+
+    __slots__ = ("sources", "column_mapping", "width", "extract")
+
+    def __init__(self, sources: tuple[tuple[int | None, str | None], ...]) -> None:
+        """
+        Initialize and compile an extractor.
+
+        Args:
+            sources: ``(index, default)`` for each field in COLUMNS order
+        """
+        self.sources = sources
+        self.column_mapping = {
+            column: index
+            for column, (index, _) in zip(COLUMNS, sources, strict=True)
+            if index is not None
+        }
+        self.width = max(self.column_mapping.values(), default=-1) + 1
+        self.extract = _compile(sources)
+
+    def __reduce__(self) -> tuple:
+        """Pickle the sources; the function is compiled again on load."""
+        return RowExtractor, (self.sources,)
+
+    def __repr__(self) -> str:
+        """Return a readable representation."""
+        return f"RowExtractor({self.sources!r})"
+
+
+def _normalize(name: str) -> str:
+    """Return a header name as it is matched."""
+    return name.strip().lower()
+
+
+def _compile(
+    sources: tuple[tuple[int | None, str | None], ...],
+) -> Callable[[list[str]], tuple[str, ...]]:
+    """
+    Generate the extraction function for a set of column sources.
+
+    Only integer indexes and ``repr`` of default strings reach the source
+    code, so nothing from the CSV file or schema is evaluated.
+
+    Args:
+        sources: ``(index, default)`` for each field in COLUMNS order
+
+    Returns:
+        Function from a record to a tuple of field values
+    """
+    fields = []
+    for index, default in sources:
+        if index is None:
+            fields.append(repr(default))
+        elif default:
+            fields.append(f"(row[{index:d}].strip() or {default!r})")
+        else:
+            fields.append(f"row[{index:d}].strip()")
+    return eval(f"lambda row: ({', '.join(fields)},)", {"__builtins__": {}})
@@ -0,0 +1,542 @@
+"""HTTP conversion service for csv2iif."""
+
+import asyncio
+import contextlib
+import io
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from csv2iif.converter import Converter
+from csv2iif.iif_writer import check_account_types
+from csv2iif.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_PORT = 8080
+DEFAULT_READ_TIMEOUT = 30.0
+STREAM_BATCH_SIZE = 1000
+
+_READ_SIZE = 64 * 1024
+_MAX_HEADERS = 100
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    411: "Length Required",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """A request that is answered with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """
+        Initialize error.
+
+        Args:
+            status: HTTP status code
+            message: Response body
+        """
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class RequestTiming:
+    """Timing and size of one request."""
+
+    method: str
+    path: str
+    status: int
+    bytes_in: int
+    bytes_out: int
+    transactions: int
+    first_byte_seconds: float | None
+    total_seconds: float
+
+
+class ConversionServer:
+    """
+    Converts CSV uploads to IIF over HTTP.
+
+    ``POST /convert`` takes the CSV file as the request body, with either a
+    Content-Length or chunked transfer encoding, and streams the IIF back in
+    chunks as rows are converted: neither the upload nor the result is held
+    in memory. ``GET /health`` answers "ok".
+
+    The header and first batch are validated before the response starts, so
+    those errors get a 400 response. A bad row after that can no longer
+    change the status; the connection is closed without the final chunk, so
+    clients see an incomplete response rather than a short IIF file.
+
+    Each conversion runs in a worker thread that pulls the upload from, and
+    pushes IIF text to, the event loop as it goes. The number of worker
+    threads limits how many conversions run at once; further requests wait.
+
+    A client that takes longer than the read timeout to send the request
+    headers, or between two pieces of the body, gets a 408 response, or has
+    its connection closed if the response already started.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        max_concurrent: int = 4,
+        backend: str | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        on_request: Callable[[RequestTiming], None] | None = None,
+        account_types: Mapping[str, str] | None = None,
+        read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+    ) -> None:
+        """
+        Initialize server.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on; 0 picks a free port, see ``port`` after
+                ``start``
+            max_concurrent: Conversions that may run at the same time
+            backend: Validation backend, see ``backends.select_backend``
+            batch_size: Rows converted per streamed chunk
+            on_request: Called with the RequestTiming of every request
+            account_types: ACCNTTYPE by account name; when given, each
+                response starts with an !ACCNT section. The response then
+                only starts once the whole upload has been converted, so
+                every CSV error, and any account without a type, is
+                reported with a 400.
+            read_timeout: Seconds to wait for the request headers, and for
+                each read from the body; None waits forever
+
+        Raises:
+            ValueError: If max_concurrent is less than 1, read_timeout is not
+                positive, or an account type is not supported
+        """
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got: {max_concurrent}")
+        if read_timeout is not None and read_timeout <= 0:
+            raise ValueError(f"read_timeout must be positive, got: {read_timeout}")
+
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.backend = backend
+        self.batch_size = batch_size
+        self.on_request = on_request
+        self.account_types = None if account_types is None else check_account_types(account_types)
+        self.read_timeout = read_timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent, thread_name_prefix="csv2iif-convert"
+        )
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Listening on http://%s:%s", self.host, self.port)
+
+    async def close(self) -> None:
+        """Stop listening and wait for running conversions."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def serve_forever(self) -> None:
+        """Start the server and run until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer one request, then close the connection.
+
+        Args:
+            reader: Connection input
+            writer: Connection output
+        """
+        start = time.perf_counter()
+        response = _Response(writer, start)
+        method = path = "-"
+        body = None
+        transactions = 0
+        try:
+            async with asyncio.timeout(self.read_timeout):
+                method, path, headers = await _read_head(reader)
+            if path == "/health":
+                if method != "GET":
+                    raise HTTPError(405, "Use GET")
+                await response.send_all(200, "ok\n")
+            elif path == "/convert":
+                if method != "POST":
+                    raise HTTPError(405, "Use POST with the CSV file as the body")
+                body = _Body.from_headers(reader, headers, self.read_timeout)
+                if headers.get("expect", "").lower() == "100-continue":
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                transactions = await self._convert(body, response)
+            else:
+                raise HTTPError(404, f"No such path: {path}")
+        except HTTPError as e:
+            await response.send_error(e.status, str(e))
+        except TimeoutError:
+            logger.warning("Timed out reading %s %s", method, path)
+            await response.send_error(408, "Timed out waiting for the request")
+        except ValueError as e:
+            await response.send_error(400, str(e))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.warning("Connection lost during %s %s: %s", method, path, e)
+            response.abort()
+        except Exception as e:
+            logger.exception("Error handling %s %s", method, path)
+            await response.send_error(500, f"Conversion error: {e}")
+        finally:
+            await response.close()
+
+        timing = RequestTiming(
+            method=method,
+            path=path,
+            status=response.status,
+            bytes_in=body.bytes_read if body is not None else 0,
+            bytes_out=response.bytes_out,
+            transactions=transactions,
+            first_byte_seconds=response.first_byte_seconds,
+            total_seconds=time.perf_counter() - start,
+        )
+        logger.info(
+            "%s %s %s: %s transactions, %s bytes in, %s bytes out, %.3fs",
+            method,
+            path,
+            timing.status,
+            transactions,
+            timing.bytes_in,
+            timing.bytes_out,
+            timing.total_seconds,
+        )
+        if self.on_request is not None:
+            self.on_request(timing)
+
+    async def _convert(self, body: "_Body", response: "_Response") -> int:
+        """
+        Convert an upload in a worker thread, streaming the result.
+
+        Args:
+            body: Request body
+            response: Response to stream to
+
+        Returns:
+            Number of transactions converted
+        """
+        loop = asyncio.get_running_loop()
+
+        def call(coroutine) -> object:
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        def convert() -> int:
+            raw = _ChunkStream(lambda: call(body.read()))
+            text = io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8", newline="")
+            converter = Converter(
+                "upload.csv",
+                "response.iif",
+                backend=self.backend,
+                account_types=self.account_types,
+            )
+            chunks = converter.convert_stream(text, self.batch_size)
+
+            # The headers come first; pulling the first batch as well
+            # validates the CSV header row before the status is sent.
+            head = next(chunks) + next(chunks, "")
+            call(response.start(200))
+            call(response.send(head))
+            for chunk in chunks:
+                call(response.send(chunk))
+            call(response.finish())
+            reader = converter.reader
+            return reader.records_read - reader.blank_rows
+
+        try:
+            return await loop.run_in_executor(self._executor, convert)
+        except ValueError as e:
+            if not response.started:
+                raise
+            logger.error("Aborting response after it started: %s", e)
+            response.abort()
+            return 0
+
+
+class _Body:
+    """Request body with Content-Length or chunked transfer encoding."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, length: int | None, timeout: float | None = None
+    ) -> None:
+        """
+        Initialize body.
+
+        Args:
+            reader: Connection input, positioned after the headers
+            length: Content-Length, or None for chunked encoding
+            timeout: Seconds each ``read`` may wait for the client
+        """
+        self.reader = reader
+        self.timeout = timeout
+        self.chunked = length is None
+        self.remaining = length or 0
+        self.done = length == 0
+        self.bytes_read = 0
+
+    @classmethod
+    def from_headers(
+        cls, reader: asyncio.StreamReader, headers: dict[str, str], timeout: float | None = None
+    ) -> "_Body":
+        """
+        Create the body described by the request headers.
+
+        Args:
+            reader: Connection input, positioned after the headers
+            headers: Lower-cased request headers
+            timeout: Seconds each ``read`` may wait for the client
+
+        Raises:
+            HTTPError: If the length is missing or invalid
+        """
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            return cls(reader, None, timeout)
+        if "content-length" not in headers:
+            raise HTTPError(411, "Send Content-Length or use chunked transfer encoding")
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        return cls(reader, length, timeout)
+
+    async def read(self) -> bytes:
+        """
+        Read the next piece of the body.
+
+        Returns:
+            Bytes, or b"" once the body is complete
+
+        Raises:
+            asyncio.IncompleteReadError: If the connection closes early
+            HTTPError: If a chunk header is invalid
+            TimeoutError: If the client sends nothing for ``timeout`` seconds
+        """
+        if self.done:
+            return b""
+        async with asyncio.timeout(self.timeout):
+            return await self._read()
+
+    async def _read(self) -> bytes:
+        """Read the next piece of a body that is not complete yet."""
+
+        if self.chunked and self.remaining == 0:
+            size_line = await self.reader.readline()
+            try:
+                size = int(size_line.split(b";")[0].strip(), 16)
+            except ValueError:
+                raise HTTPError(400, "Invalid chunk size") from None
+            if size == 0:
+                # Skip trailers up to the blank line that ends the body.
+                while (await self.reader.readline()).strip():
+                    pass
+                self.done = True
+                return b""
+            self.remaining = size
+
+        data = await self.reader.read(min(self.remaining, _READ_SIZE))
+        if not data:
+            raise asyncio.IncompleteReadError(b"", self.remaining)
+        self.remaining -= len(data)
+        self.bytes_read += len(data)
+        if self.remaining == 0:
+            if self.chunked:
+                await self.reader.readexactly(2)
+            else:
+                self.done = True
+        return data
+
+
+class _ChunkStream(io.RawIOBase):
+    """Blocking file-like view of chunks returned by a callable."""
+
+    def __init__(self, read_chunk: Callable[[], bytes]) -> None:
+        """
+        Initialize stream.
+
+        Args:
+            read_chunk: Returns the next chunk, or b"" at the end
+        """
+        self.read_chunk = read_chunk
+        self.pending = b""
+
+    def readable(self) -> bool:
+        """Report that the stream can be read."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Fill ``buffer`` from the pending chunk, fetching one if needed."""
+        if not self.pending:
+            self.pending = self.read_chunk()
+        n = min(len(buffer), len(self.pending))
+        buffer[:n] = self.pending[:n]
+        self.pending = self.pending[n:]
+        return n
+
+
+class _Response:
+    """Chunked HTTP response on a connection."""
+
+    def __init__(self, writer: asyncio.StreamWriter, start: float) -> None:
+        """
+        Initialize response.
+
+        Args:
+            writer: Connection output
+            start: perf_counter() when the request arrived
+        """
+        self.writer = writer
+        self.start_time = start
+        self.status = 0
+        self.started = False
+        self.bytes_out = 0
+        self.first_byte_seconds: float | None = None
+
+    async def start(self, status: int, content_type: str = "text/plain; charset=utf-8") -> None:
+        """Send the status line and headers for a chunked response."""
+        self.status = status
+        self.started = True
+        self.first_byte_seconds = time.perf_counter() - self.start_time
+        self.writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+        )
+
+    async def send(self, text: str) -> None:
+        """Send one chunk and wait until the client has taken it."""
+        data = text.encode("utf-8")
+        if not data:
+            return
+        self.writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.bytes_out += len(data)
+        await self.writer.drain()
+
+    async def finish(self) -> None:
+        """Send the final chunk."""
+        self.writer.write(b"0\r\n\r\n")
+        await self.writer.drain()
+
+    async def send_all(self, status: int, text: str) -> None:
+        """Send a complete response."""
+        await self.start(status)
+        await self.send(text)
+        await self.finish()
+
+    async def send_error(self, status: int, message: str) -> None:
+        """Send an error response, unless a response was already started."""
+        if self.started:
+            self.abort()
+            return
+        logger.debug("Responding %s: %s", status, message)
+        try:
+            await self.send_all(status, message + "\n")
+        except ConnectionError:
+            self.abort()
+
+    def abort(self) -> None:
+        """Drop the connection without finishing the response."""
+        if not self.status:
+            self.status = 500
+        self.writer.transport.abort()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str]]:
+    """
+    Read the request line and headers.
+
+    Args:
+        reader: Connection input
+
+    Returns:
+        Method, path without query string, and lower-cased headers
+
+    Raises:
+        HTTPError: If the request is malformed
+    """
+    try:
+        request_line = (await reader.readline()).decode("latin-1")
+        if not request_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        method, target, _version = request_line.split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line") from None
+
+    headers = {}
+    for _ in range(_MAX_HEADERS):
+        try:
+            line = (await reader.readline()).decode("latin-1")
+        except ValueError:
+            raise HTTPError(400, "Header line too long") from None
+        if not line.strip():
+            return method, target.partition("?")[0], headers
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    raise HTTPError(400, "Too many headers")
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    max_concurrent: int = 4,
+    backend: str | None = None,
+    account_types: Mapping[str, str] | None = None,
+    read_timeout: float | None = DEFAULT_READ_TIMEOUT,
+) -> None:
+    """
+    Run a ConversionServer until interrupted.
+
+    Args:
+        host: Address to listen on
+        port: Port to listen on
+        max_concurrent: Conversions that may run at the same time
+        backend: Validation backend
+        account_types: ACCNTTYPE by account name; when given, each response
+            starts with an !ACCNT section
+        read_timeout: Seconds to wait for the request headers, and for each
+            read from the body
+    """
+    server = ConversionServer(
+        host,
+        port,
+        max_concurrent=max_concurrent,
+        backend=backend,
+        account_types=account_types,
+        read_timeout=read_timeout,
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
@@ -0,0 +1,98 @@
+"""Interned string tables for csv2iif."""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+@dataclass
+class SymbolStats:
+    """How many distinct values a symbol table holds out of how many seen."""
+
+    distinct: int
+    total: int
+
+    @property
+    def repeat_ratio(self) -> float | None:
+        """Share of values that reused an existing string."""
+        if not self.total:
+            return None
+        return 1 - self.distinct / self.total
+
+
+class SymbolTable:
+    """
+    Interns repeating field values so that equal values share one string.
+
+    Account and payee names repeat on most rows, yet every CSV cell arrives
+    as a fresh string. Passing values through a table keeps one object per
+    distinct value, so rows held in memory share their strings, and the
+    table doubles as the set of distinct values seen. Interned values can be
+    compared with ``is``.
+    """
+
+    __slots__ = ("_symbols", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self._symbols: dict[str, str] = {}
+        self.total = 0
+
+    def intern(self, value: str) -> str:
+        """
+        Return the table's string equal to ``value``, adding it if new.
+
+        Args:
+            value: String to intern
+
+        Returns:
+            The shared string
+        """
+        self.total += 1
+        return self._symbols.setdefault(value, value)
+
+    def intern_all(self, values: list[str]) -> list[str]:
+        """
+        Intern a list of values, such as one column of a batch.
+
+        Args:
+            values: Strings to intern
+
+        Returns:
+            New list of the shared strings, in the same order
+        """
+        self.total += len(values)
+        return list(map(self._symbols.setdefault, values, values))
+
+    def update(self, other: "SymbolTable") -> None:
+        """
+        Merge the values and counts of another table, such as one filled in
+        a worker process.
+
+        Args:
+            other: Table to merge
+        """
+        symbols = self._symbols
+        for value in other._symbols:
+            symbols.setdefault(value, value)
+        self.total += other.total
+
+    def stats(self) -> SymbolStats:
+        """
+        Count the values seen.
+
+        Returns:
+            SymbolStats for this table
+        """
+        return SymbolStats(len(self._symbols), self.total)
+
+    def __len__(self) -> int:
+        """Return the number of distinct values."""
+        return len(self._symbols)
+
+    def __contains__(self, value: object) -> bool:
+        """Return whether a value has been interned."""
+        return value in self._symbols
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the distinct values in first-seen order."""
+        return iter(self._symbols)
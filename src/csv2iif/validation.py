@@ -0,0 +1,361 @@
+"""Whole-file validation reports for csv2iif."""
+
+import csv
+from collections import Counter, deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from csv2iif.compression import detect_compression, open_input
+from csv2iif.csv_reader import DEFAULT_BATCH_SIZE, CSVReader
+from csv2iif.logger import setup_logger
+from csv2iif.models import TransactionBatch
+from csv2iif.parallel import DEFAULT_CHUNK_SIZE, read_chunk, split_chunks
+from csv2iif.schema import ColumnSchema, RowExtractor
+
+logger = setup_logger(__name__)
+
+
+class RowIssue(NamedTuple):
+    """One invalid CSV row."""
+
+    row: int
+    column: str
+    kind: str
+    reason: str
+
+
+@dataclass
+class ValidationReport:
+    """Every row error found in a CSV file."""
+
+    path: str
+    records: int = 0
+    issues: list[RowIssue] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True when no row has an error."""
+        return not self.issues
+
+    def histogram(self) -> dict[str, int]:
+        """
+        Count errors by kind.
+
+        Returns:
+            Error count per kind, most common first
+        """
+        return dict(Counter(issue.kind for issue in self.issues).most_common())
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert to a JSON-serializable dictionary.
+
+        Returns:
+            Report with one entry per error and the histogram
+        """
+        return {
+            "path": self.path,
+            "records": self.records,
+            "error_count": len(self.issues),
+            "truncated": self.truncated,
+            "histogram": self.histogram(),
+            "errors": [issue._asdict() for issue in self.issues],
+        }
+
+    def format_text(self) -> str:
+        """
+        Render the report for a terminal.
+
+        Returns:
+            One line per error followed by a summary histogram
+        """
+        lines = [f"Row {i.row}, column {i.column or '-'}: {i.reason}" for i in self.issues]
+        more = " (stopped at --max-errors)" if self.truncated else ""
+        lines.append(f"{len(self.issues)} errors in {self.records} records{more}")
+        lines.extend(f"  {kind:<22}{count:>8}" for kind, count in self.histogram().items())
+        return "\n".join(lines)
+
+
+def validate_file(
+    path: str,
+    jobs: int = 1,
+    max_errors: int | None = None,
+    backend: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    schema: ColumnSchema | None = None,
+) -> ValidationReport:
+    """
+    Check every row of a CSV file and collect all row errors.
+
+    Unlike ``CSVReader.read``, a bad row does not stop the scan. Each row
+    reports its first failure, checked in the same order and with the same
+    messages as Transaction.
+
+    Args:
+        path: Path to CSV file
+        jobs: Number of worker processes; above 1 the file is split into
+            byte ranges that are checked in parallel (compressed files are
+            always checked in one process)
+        max_errors: Stop after this many errors (None for no limit)
+        backend: Validation backend, see ``backends.select_backend``
+        chunk_size: Approximate number of bytes per parallel chunk
+        schema: Column names, aliases and defaults, see ``CSVReader``
+
+    Returns:
+        ValidationReport with errors in row order
+
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If the file is empty, required columns are missing, or
+            jobs or max_errors is less than 1
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got: {jobs}")
+    if max_errors is not None and max_errors < 1:
+        raise ValueError(f"max_errors must be at least 1, got: {max_errors}")
+
+    reader = CSVReader(path, backend=backend, schema=schema)
+    if not reader.file_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {reader.file_path}")
+
+    logger.info("Validating every row of %s with %s workers", path, jobs)
+    report = ValidationReport(str(path))
+
+    # One error past the limit is looked for, to tell whether any were left out.
+    limit = None if max_errors is None else max_errors + 1
+
+    if jobs > 1 and detect_compression(reader.file_path) is not None:
+        logger.info("Compressed input cannot be split into chunks; using one process")
+        jobs = 1
+
+    if jobs == 1:
+        with open_input(reader.file_path) as f:
+            rows = csv.reader(f)
+            reader._validate_headers(_first_row(rows))
+            records, issues = scan_rows(rows, reader.extractor, 2, backend, limit)
+        report.records = records
+        _add_issues(report, issues, max_errors)
+    else:
+        with open(reader.file_path, encoding="utf-8") as f:
+            reader._validate_headers(_first_row(csv.reader(f)))
+        tasks = [
+            (str(reader.file_path), start, end, reader.extractor, backend, limit)
+            for start, end in split_chunks(reader.file_path, chunk_size)
+        ]
+        _scan_parallel(report, tasks, jobs, max_errors)
+
+    logger.info("Found %s errors in %s records", len(report.issues), report.records)
+    return report
+
+
+def scan_rows(
+    rows: Iterable[list[str]],
+    extractor: RowExtractor,
+    start_row: int = 2,
+    backend: str | None = None,
+    max_errors: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[int, list[RowIssue]]:
+    """
+    Validate CSV data records in batches, collecting every row error.
+
+    Args:
+        rows: CSV data records (no header)
+        extractor: Extractor from ``CSVReader._validate_headers``
+        start_row: Row number of the first record
+        backend: Validation backend name
+        max_errors: Stop once this many errors have been found
+        batch_size: Rows validated per batch
+
+    Returns:
+        Number of records read and the errors found, in row order. With
+        ``max_errors`` the records count only covers the rows scanned.
+    """
+    extract = extractor.extract
+    width = extractor.width
+    issues: list[RowIssue] = []
+    batch = TransactionBatch()
+
+    row_num = start_row - 1
+    for row_num, row in enumerate(rows, start=start_row):
+        if not row or not "".join(row).strip():
+            continue
+
+        if len(row) < width:
+            missing = [c for c, i in extractor.column_mapping.items() if i >= len(row)]
+            issues.append(
+                RowIssue(
+                    row_num,
+                    ", ".join(missing),
+                    "short_row",
+                    f"Expected at least {width} columns, found {len(row)}",
+                )
+            )
+        else:
+            batch.append(*extract(row), row_num)
+            if len(batch) < batch_size:
+                continue
+            issues.extend(_batch_issues(batch, backend))
+            batch = TransactionBatch()
+
+        if max_errors is not None and len(issues) >= max_errors:
+            break
+
+    issues.extend(_batch_issues(batch, backend))
+    issues.sort()
+    return row_num - start_row + 1, issues[:max_errors]
+
+
+def _batch_issues(batch: TransactionBatch, backend: str | None) -> list[RowIssue]:
+    """
+    Validate a batch and describe its failing rows.
+
+    Args:
+        batch: Unvalidated batch
+        backend: Validation backend name
+
+    Returns:
+        One RowIssue per failing row
+    """
+    if not batch:
+        return []
+
+    issues = []
+    for error in batch.collect_errors(backend):
+        row = batch.row_numbers[error.index]
+        if error.field == "required":
+            names = error.message.rpartition(": ")[2].split(", ")
+            column = ", ".join(name.replace("_", "-") for name in names)
+            kind = "missing_required"
+        elif error.field == "amount" and error.message.startswith("Amount must be positive"):
+            column, kind = "amount", "amount_not_positive"
+        else:
+            column, kind = error.field, f"invalid_{error.field}"
+        issues.append(RowIssue(row, column, kind, error.message))
+    return issues
+
+
+def _first_row(rows: Iterable[list[str]]) -> list[str]:
+    """
+    Return the header record.
+
+    Raises:
+        ValueError: If the file is empty
+    """
+    headers = next(iter(rows), None)
+    if headers is None:
+        raise ValueError("CSV file is empty")
+    return headers
+
+
+def _add_issues(report: ValidationReport, issues: list[RowIssue], max_errors: int | None) -> None:
+    """Append issues to a report, marking it truncated if any do not fit."""
+    room = None if max_errors is None else max_errors - len(report.issues)
+    if room is not None and len(issues) > room:
+        report.truncated = True
+    report.issues.extend(issues[:room])
+
+
+def _scan_parallel(
+    report: ValidationReport, tasks: list[tuple], jobs: int, max_errors: int | None
+) -> None:
+    """
+    Scan chunks in a process pool and merge their errors in row order.
+
+    At most ``2 * jobs`` chunks are in flight. Once ``max_errors`` errors have
+    been collected, chunks that have not started are cancelled.
+
+    Args:
+        report: Report to fill in
+        tasks: Arguments for ``_scan_chunk``, in file order
+        jobs: Number of worker processes
+        max_errors: Error limit, or None
+    """
+    pending: deque[Future[tuple[int, list[RowIssue]]]] = deque()
+    task_iter = iter(tasks)
+    next_row = 2
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for task in task_iter:
+                pending.append(pool.submit(_scan_chunk, *task))
+                if len(pending) >= 2 * jobs:
+                    break
+
+            while pending:
+                records, issues = pending.popleft().result()
+                offset = next_row - 1
+                _add_issues(report, [i._replace(row=i.row + offset) for i in issues], max_errors)
+                next_row += records
+                report.records += records
+                if report.truncated:
+                    break
+
+                task = next(task_iter, None)
+                if task is not None:
+                    pending.append(pool.submit(_scan_chunk, *task))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _scan_chunk(
+    input_path: str,
+    start: int,
+    end: int,
+    extractor: RowExtractor,
+    backend: str | None,
+    max_errors: int | None,
+) -> tuple[int, list[RowIssue]]:
+    """
+    Validate one byte range of a CSV file.
+
+    Args:
+        input_path: Path to CSV file
+        start: Byte offset of the first record in the chunk
+        end: Byte offset just past the last record in the chunk
+        extractor: Extractor from the parent's header validation
+        backend: Validation backend name
+        max_errors: Error limit, or None
+
+    Returns:
+        Records in the chunk and its errors, numbered from 1
+    """
+    rows = read_chunk(input_path, start, end)
+    _, issues = scan_rows(rows, extractor, 1, backend, max_errors)
+    return len(rows), issues
+
+
+def write_report(report: ValidationReport, path: str | Path, report_format: str = "text") -> None:
+    """
+    Write a report to a file.
+
+    Args:
+        report: Validation report
+        path: Output path
+        report_format: "text" or "json"
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_report(report, report_format) + "\n")
+
+
+def render_report(report: ValidationReport, report_format: str = "text") -> str:
+    """
+    Render a report as text or JSON.
+
+    Args:
+        report: Validation report
+        report_format: "text" or "json"
+
+    Returns:
+        Rendered report
+    """
+    if report_format == "json":
+        import json
+
+        return json.dumps(report.to_dict(), indent=2)
+    return report.format_text()
@@ -0,0 +1,351 @@
+"""Drop-folder watcher for csv2iif."""
+
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from csv2iif.batch import BatchResult, _convert_one
+from csv2iif.cache import ConversionCache
+from csv2iif.fileutils import atomic_write
+from csv2iif.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Times a file is sent to a worker pool before a crash counts against it.
+_MAX_ATTEMPTS = 2
+
+
+@dataclass
+class WatchStats:
+    """
+    Counters for a running watcher.
+
+    Latency is measured from the moment a file is found to be complete to
+    the moment its original has been moved out of the inbox, so it includes
+    time spent waiting for a free worker.
+    """
+
+    queued: int = 0
+    running: int = 0
+    converted: int = 0
+    failed: int = 0
+    transactions: int = 0
+    last_latency_seconds: float | None = None
+    max_latency_seconds: float = 0.0
+    total_latency_seconds: float = 0.0
+
+    @property
+    def mean_latency_seconds(self) -> float | None:
+        """Mean latency over every finished file."""
+        finished = self.converted + self.failed
+        if not finished:
+            return None
+        return self.total_latency_seconds / finished
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert to a JSON-serializable dictionary.
+
+        Returns:
+            Every counter plus ``mean_latency_seconds``
+        """
+        data = asdict(self)
+        data["mean_latency_seconds"] = self.mean_latency_seconds
+        return data
+
+
+class Watcher:
+    """
+    Converts CSV files dropped into an inbox directory.
+
+    The inbox is polled; a CSV file is converted once its size and
+    modification time are unchanged between two polls, so files that are
+    still being copied in are left alone. Conversions run in a pool of
+    long-lived worker processes, so imports and setup are paid once rather
+    than per file. Each IIF file is written to the outbox, and the original
+    is moved to the done or failed directory, with a ``.error`` file next to
+    failed inputs. A file that was running when a worker process died is
+    retried once in a new pool, then marked failed.
+    """
+
+    def __init__(
+        self,
+        inbox: str | Path,
+        outbox: str | Path,
+        jobs: int = 1,
+        interval: float = 1.0,
+        done_dir: str | Path | None = None,
+        failed_dir: str | Path | None = None,
+        cache: ConversionCache | None = None,
+        status_path: str | Path | None = None,
+    ) -> None:
+        """
+        Initialize watcher.
+
+        Args:
+            inbox: Directory to watch for CSV files (subdirectories are
+                ignored)
+            outbox: Directory for IIF files
+            jobs: Number of worker processes
+            interval: Seconds between polls
+            done_dir: Where converted originals go (default: INBOX/done)
+            failed_dir: Where originals that failed go (default: INBOX/failed)
+            cache: Optional conversion cache
+            status_path: Write WatchStats as JSON to this file after every poll
+
+        Raises:
+            NotADirectoryError: If inbox is not a directory
+            ValueError: If jobs is less than 1 or interval is not positive
+        """
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got: {jobs}")
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got: {interval}")
+
+        self.inbox = Path(inbox)
+        if not self.inbox.is_dir():
+            raise NotADirectoryError(f"Inbox directory not found: {self.inbox}")
+
+        self.outbox = Path(outbox)
+        self.jobs = jobs
+        self.interval = interval
+        self.done_dir = Path(done_dir) if done_dir else self.inbox / "done"
+        self.failed_dir = Path(failed_dir) if failed_dir else self.inbox / "failed"
+        self.cache = cache
+        self.status_path = Path(status_path) if status_path else None
+        self.stats = WatchStats()
+
+        self._pool: ProcessPoolExecutor | None = None
+        self._seen: dict[Path, tuple[int, int]] = {}
+        self._queue: deque[tuple[Path, float]] = deque()
+        self._running: dict[Future[BatchResult], tuple[Path, float]] = {}
+        self._attempts: dict[Path, int] = {}
+
+    def __enter__(self) -> "Watcher":
+        """Start the worker pool."""
+        for directory in (self.outbox, self.done_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self._pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_ignore_sigint)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Wait for running conversions, then stop the worker pool."""
+        try:
+            self.drain()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def run(self, stop: threading.Event | None = None, once: bool = False) -> WatchStats:
+        """
+        Poll the inbox until ``stop`` is set.
+
+        Conversions that are running when it stops are finished; files still
+        waiting in the queue stay in the inbox for the next run.
+
+        Args:
+            stop: Event that ends the loop (default: run until interrupted)
+            once: Poll twice, one interval apart, convert every file that
+                was complete, and return
+
+        Returns:
+            Final counters
+        """
+        stop = stop or threading.Event()
+        logger.info("Watching %s with %s workers", self.inbox, self.jobs)
+
+        with self:
+            polls = 0
+            while not stop.is_set():
+                self.poll()
+                polls += 1
+                if once and polls == 2:
+                    while self._queue or self._running:
+                        self._wait_for_one()
+                        self.poll()
+                    break
+                stop.wait(self.interval)
+
+        self._write_status()
+        logger.info("Stopped watching %s", self.inbox)
+        return self.stats
+
+    def poll(self) -> None:
+        """Collect finished conversions, scan the inbox and start new ones."""
+        self._collect()
+        self._scan()
+        self._submit()
+        self._write_status()
+
+    def drain(self) -> None:
+        """Wait for every running conversion and record its outcome."""
+        while self._running:
+            self._wait_for_one()
+
+    def _scan(self) -> None:
+        """Queue CSV files whose size and mtime did not change since the last poll."""
+        busy = {path for path, _ in self._queue} | {path for path, _ in self._running.values()}
+        seen = {}
+        with os.scandir(self.inbox) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.lower().endswith(".csv"):
+                    continue
+                path = Path(entry.path)
+                if path in busy or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                signature = (st.st_size, st.st_mtime_ns)
+                if self._seen.get(path) == signature:
+                    logger.debug("Queued %s", path)
+                    self._queue.append((path, time.monotonic()))
+                else:
+                    seen[path] = signature
+        self._seen = seen
+
+    def _submit(self) -> None:
+        """Start queued files while workers are free."""
+        while self._queue and len(self._running) < self.jobs:
+            path, ready = self._queue.popleft()
+            output = self.outbox / path.with_suffix(".iif").name
+            future = self._pool.submit(_convert_one, path, output, self.cache)
+            self._attempts[path] = self._attempts.get(path, 0) + 1
+            self._running[future] = (path, ready)
+        self._update_depth()
+
+    def _collect(self) -> None:
+        """Record every finished conversion."""
+        for future in [f for f in self._running if f.done()]:
+            # A broken pool requeues the other files it was running.
+            if future in self._running:
+                self._finish(future)
+        self._update_depth()
+
+    def _wait_for_one(self) -> None:
+        """Block until a running conversion finishes, then record it."""
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        if self._running:
+            wait(self._running, return_when=FIRST_COMPLETED)
+        self._collect()
+
+    def _finish(self, future: Future[BatchResult]) -> None:
+        """
+        Record a finished conversion, or replace the pool if its worker died.
+
+        Args:
+            future: Completed conversion
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            self._restart_pool(f"Worker failed: {e}")
+            return
+
+        path, ready = self._running.pop(future)
+        self._record(path, ready, result, result.error)
+
+    def _record(
+        self, path: Path, ready: float, result: BatchResult | None, error: str | None
+    ) -> None:
+        """
+        Move the original of a finished file and update the counters.
+
+        Args:
+            path: Input file
+            ready: When the file was queued, from ``time.monotonic``
+            result: Conversion result, or None if no worker returned one
+            error: Why the conversion failed
+        """
+        self._attempts.pop(path, None)
+        if result is not None and result.ok:
+            self.stats.converted += 1
+            self.stats.transactions += result.transactions
+            self._move(path, self.done_dir)
+            logger.info("Converted %s (%s transactions)", path.name, result.transactions)
+        else:
+            self.stats.failed += 1
+            target = self._move(path, self.failed_dir)
+            if target is not None:
+                target.with_name(target.name + ".error").write_text(f"{error}\n", encoding="utf-8")
+            logger.error("Failed to convert %s: %s", path.name, error)
+
+        latency = time.monotonic() - ready
+        self.stats.last_latency_seconds = latency
+        self.stats.max_latency_seconds = max(self.stats.max_latency_seconds, latency)
+        self.stats.total_latency_seconds += latency
+
+    def _move(self, path: Path, directory: Path) -> Path | None:
+        """
+        Move a file into a directory without overwriting an earlier file.
+
+        Args:
+            path: File to move
+            directory: Destination directory
+
+        Returns:
+            New path, or None if the file had already disappeared
+        """
+        target = directory / path.name
+        n = 1
+        while target.exists():
+            target = directory / f"{path.stem}.{n}{path.suffix}"
+            n += 1
+        try:
+            os.replace(path, target)
+        except FileNotFoundError:
+            logger.warning("%s disappeared before it could be moved", path)
+            return None
+        return target
+
+    def _restart_pool(self, error: str) -> None:
+        """
+        Replace a broken worker pool.
+
+        Files it was running are queued again, or marked failed once they
+        have been sent to a pool ``_MAX_ATTEMPTS`` times.
+
+        Args:
+            error: Why the pool broke, for files that are marked failed
+        """
+        for future, (path, ready) in list(self._running.items()):
+            if future.done() and not future.cancelled() and future.exception() is None:
+                continue
+            del self._running[future]
+            if self._attempts.get(path, 0) >= _MAX_ATTEMPTS:
+                self._record(path, ready, None, error)
+            else:
+                logger.warning("Retrying %s after a worker failure", path.name)
+                self._queue.appendleft((path, ready))
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_ignore_sigint)
+
+    def _update_depth(self) -> None:
+        """Refresh the queue depth counters."""
+        self.stats.queued = len(self._queue)
+        self.stats.running = len(self._running)
+
+    def _write_status(self) -> None:
+        """Write the counters to the status file, if one was requested."""
+        if self.status_path is None:
+            return
+
+        import json
+
+        with atomic_write(self.status_path) as f:
+            json.dump(self.stats.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+def _ignore_sigint() -> None:
+    """Leave Ctrl+C to the watcher process, which finishes running work."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
@@ -0,0 +1,151 @@
+"""Tests for aio module."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from csv2iif.aio import aconvert_many
+from csv2iif.converter import Converter
+from csv2iif.iif_writer import IIFWriter
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+INVALID = HEADER + "13/45/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+
+
+def make_csv(rows: int) -> str:
+    """Helper to build CSV text with the given number of rows."""
+    return HEADER + "".join(
+        f'01/15/2024,Sales Income,Checking,{i},John Doe,{i}.25,"Memo {i}"\n' for i in range(rows)
+    )
+
+
+def sync_output(tmp_path, csv_file) -> str:
+    """Helper to convert a file with the synchronous API."""
+    output = tmp_path / "sync.iif"
+    Converter(str(csv_file), str(output)).convert()
+    return output.read_text()
+
+
+def test_convert_async_matches_sync(tmp_path):
+    """Test convert_async in the default thread pool writes the same output as convert."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(make_csv(2500))
+    output = tmp_path / "out.iif"
+    converter = Converter(str(csv_file), str(output))
+
+    result = asyncio.run(converter.convert_async())
+
+    assert result.transactions == 2500
+    assert output.read_text() == sync_output(tmp_path, csv_file)
+    assert converter.writer.cancel_event is None
+
+
+def test_convert_async_in_process_pool(tmp_path):
+    """Test a process executor converts in a worker and reports back to the parent."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(make_csv(30) + "\n")
+    output = tmp_path / "out.iif"
+    results = []
+    converter = Converter(str(csv_file), str(output), on_metrics=results.append)
+
+    async def main():
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            return await converter.convert_async(pool)
+
+    result = asyncio.run(main())
+
+    assert results == [result]
+    assert (converter.reader.records_read, converter.reader.blank_rows) == (31, 1)
+    assert output.read_text() == sync_output(tmp_path, csv_file)
+
+
+def test_cancel_stops_thread_conversion(tmp_path, monkeypatch):
+    """Test cancelling leaves the old output in place and waits for the thread."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(make_csv(5000))
+    output = tmp_path / "out.iif"
+    output.write_text("previous")
+    started = threading.Event()
+    render_batch = IIFWriter.render_batch
+
+    def slow_render_batch(self, batch):
+        started.set()
+        time.sleep(0.05)
+        return render_batch(self, batch)
+
+    monkeypatch.setattr(IIFWriter, "render_batch", slow_render_batch)
+    converter = Converter(str(csv_file), str(output))
+
+    async def main():
+        task = asyncio.create_task(converter.convert_async())
+        await asyncio.to_thread(started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert output.read_text() == "previous"
+    assert not list(tmp_path.glob("*.tmp"))
+    assert converter.writer.cancel_event is None
+
+
+def test_aconvert_many_results_in_order(tmp_path):
+    """Test every file gets a result in input order and failures do not stop the others."""
+    pairs = []
+    for i in range(6):
+        csv_file = tmp_path / f"{i}.csv"
+        csv_file.write_text(INVALID if i == 2 else make_csv(10 + i))
+        pairs.append((csv_file, tmp_path / f"{i}.iif"))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = asyncio.run(aconvert_many(pairs, max_concurrent=2, executor=pool))
+
+    assert [r.input_path for r in results] == [p for p, _ in pairs]
+    assert [r.ok for r in results] == [True, True, False, True, True, True]
+    assert "row 2" in str(results[2].error)
+    assert results[2].result is None
+    assert [r.result.transactions for r in results if r.ok] == [10, 11, 13, 14, 15]
+    for csv_file, output in pairs:
+        if csv_file.name != "2.csv":
+            assert output.read_text() == sync_output(tmp_path, csv_file)
+
+
+def test_aconvert_many_limits_concurrency(tmp_path, monkeypatch):
+    """Test no more than max_concurrent conversions run at once."""
+    active = peak = 0
+    lock = threading.Lock()
+    convert = Converter.convert
+
+    def tracked_convert(self):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            time.sleep(0.02)
+            return convert(self)
+        finally:
+            with lock:
+                active -= 1
+
+    monkeypatch.setattr(Converter, "convert", tracked_convert)
+    pairs = []
+    for i in range(8):
+        csv_file = tmp_path / f"{i}.csv"
+        csv_file.write_text(make_csv(5))
+        pairs.append((csv_file, tmp_path / f"{i}.iif"))
+
+    results = asyncio.run(aconvert_many(pairs, max_concurrent=3))
+
+    assert all(r.ok for r in results)
+    assert peak == 3
+
+
+def test_aconvert_many_invalid_concurrency():
+    """Test the concurrency limit is validated."""
+    with pytest.raises(ValueError, match="max_concurrent"):
+        asyncio.run(aconvert_many([], max_concurrent=0))
@@ -0,0 +1,156 @@
+"""Tests for backends module."""
+
+import importlib.util
+import random
+
+import pytest
+
+from csv2iif import backends
+from csv2iif.backends import (
+    VECTORIZE_MIN_ROWS,
+    available_backends,
+    select_backend,
+    validate_columns,
+)
+
+EDGE_DATES = [
+    "01/15/2024",
+    "02/29/2024",
+    "02/29/2023",
+    "02/29/1900",
+    "02/29/2000",
+    "04/31/2024",
+    "12/31/9999",
+    "13/01/2024",
+    "00/10/2024",
+    "01/00/2024",
+    "01/32/2024",
+    "01/01/0000",
+    "1/5/2024",
+    "01/ 1/2024",
+    "01/15/2024 ",
+    "01/15/2024\x00",
+    "01-15-2024",
+    "٠١/١٥/٢٠٢٤",
+    "",
+]
+
+EDGE_AMOUNTS = [
+    "500",
+    "500.",
+    "500.5",
+    "$1,275.00",
+    "$$1,275.00",
+    "1,2,3",
+    "0",
+    "0.00",
+    "000.5",
+    "007.50",
+    "1.005",
+    ".5",
+    "$",
+    "",
+    " 5",
+    "5 ",
+    "5\x00",
+    "-5",
+    "1e3",
+    "abc",
+    "١٢",
+]
+
+
+def make_columns(count: int, seed: int = 7) -> tuple[list[str], ...]:
+    """Helper building mostly valid columns salted with edge cases."""
+    rng = random.Random(seed)
+    dates, credits, debits, amounts, memos = [], [], [], [], []
+    for _ in range(count):
+        if rng.random() < 0.9:
+            dates.append(f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024")
+        else:
+            dates.append(rng.choice(EDGE_DATES))
+        if rng.random() < 0.9:
+            amounts.append(f"${rng.randint(1, 999999):,}.{rng.randint(0, 99):02d}")
+        else:
+            amounts.append(rng.choice(EDGE_AMOUNTS))
+        credits.append(rng.choice(["Checking", "Checking", ""]))
+        debits.append(rng.choice(["Expenses:Tools", " "]))
+        memos.append(rng.choice(["Memo", "Memo", ""]))
+    return dates, credits, debits, amounts, memos
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pyarrow"])
+def test_vectorized_backend_matches_python(backend):
+    """Test vectorized backends produce identical amounts and errors."""
+    pytest.importorskip(backend)
+    columns = make_columns(5000)
+    edge_columns = (
+        EDGE_DATES,
+        ["Checking"] * len(EDGE_DATES),
+        ["Savings"] * len(EDGE_DATES),
+        EDGE_AMOUNTS[: len(EDGE_DATES)],
+        ["Memo"] * len(EDGE_DATES),
+    )
+
+    for cols in (columns, edge_columns):
+        assert validate_columns(*cols, backend=backend) == validate_columns(*cols, backend="python")
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pyarrow"])
+def test_vectorized_backend_empty_block(backend):
+    """Test vectorized backends handle an empty block."""
+    pytest.importorskip(backend)
+    assert validate_columns([], [], [], [], [], backend=backend) == ([], [])
+
+
+def test_validate_columns_reports_every_error():
+    """Test all failing rows are reported with their field and message."""
+    result = validate_columns(
+        ["01/15/2024", "13/45/2024", "01/15/2024", "01/15/2024"],
+        ["Sales", "Sales", "Sales", ""],
+        ["Checking", "Checking", "Checking", "Checking"],
+        ["$1,275", "5.00", "-5.00", "5"],
+        ["Memo", "Memo", "Memo", ""],
+        backend="python",
+    )
+
+    assert result.amounts == ["1275.00", "5.00", "-5.00", "5.00"]
+    assert [(e.index, e.field) for e in result.errors] == [
+        (1, "date"),
+        (2, "amount"),
+        (3, "required"),
+    ]
+    assert result.errors[2].message == "Required fields cannot be empty: credit_account, memo"
+
+
+def test_select_backend_auto_skips_small_blocks():
+    """Test automatic selection stays in pure Python for small blocks."""
+    assert select_backend("auto", rows=VECTORIZE_MIN_ROWS - 1) == "python"
+    assert select_backend("auto", rows=VECTORIZE_MIN_ROWS) == available_backends()[0]
+
+
+def test_select_backend_env(monkeypatch):
+    """Test the CSV2IIF_BACKEND environment variable picks the backend."""
+    monkeypatch.setenv("CSV2IIF_BACKEND", "PYTHON")
+    assert select_backend() == "python"
+
+
+def test_select_backend_unknown():
+    """Test unknown backend names are rejected."""
+    with pytest.raises(ValueError, match="Unknown backend 'fortran'"):
+        select_backend("fortran")
+
+
+def test_falls_back_to_python_without_optional_libraries(monkeypatch):
+    """Test pure Python is used automatically when NumPy and PyArrow are missing."""
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        backends.importlib.util,
+        "find_spec",
+        lambda name: None if name in ("numpy", "pyarrow") else real_find_spec(name),
+    )
+
+    assert available_backends() == ["python"]
+    assert select_backend("auto", rows=VECTORIZE_MIN_ROWS * 10) == "python"
+    with pytest.raises(ValueError, match="Backend 'numpy' is not installed"):
+        select_backend("numpy")
@@ -0,0 +1,129 @@
+"""Tests for batch module."""
+
+import gzip
+import lzma
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.batch import convert_directory, find_csv_files, iif_path
+
+VALID_CSV = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received
+01/16/2024,Checking,Office Supplies,1002,Office Depot,75.50,Printer paper
+"""
+
+INVALID_CSV = """date,credit-account,debit-account,number,name,amount,memo
+13/45/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received
+"""
+
+
+def create_tree(root: Path) -> None:
+    """Helper to create a directory of store exports."""
+    (root / "north").mkdir()
+    (root / "store1.csv").write_text(VALID_CSV)
+    (root / "north" / "store2.CSV").write_text(VALID_CSV)
+    (root / "broken.csv").write_text(INVALID_CSV)
+    (root / "notes.txt").write_text("not a csv")
+
+
+def test_find_csv_files():
+    """Test CSV discovery is recursive, case-insensitive and sorted."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        create_tree(root)
+
+        files = find_csv_files(root)
+        assert [p.relative_to(root).as_posix() for p in files] == [
+            "broken.csv",
+            "north/store2.CSV",
+            "store1.csv",
+        ]
+
+
+def test_find_csv_files_missing_directory():
+    """Test CSV discovery with non-existent directory."""
+    with pytest.raises(NotADirectoryError):
+        find_csv_files(Path("/nonexistent/dir"))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_directory(jobs):
+    """Test every file is converted and one bad file does not stop the rest."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "in"
+        out = Path(temp_dir) / "out"
+        root.mkdir()
+        create_tree(root)
+
+        results = convert_directory(str(root), str(out), jobs=jobs)
+
+        by_name = {r.input_path.name: r for r in results}
+        assert len(results) == 3
+        assert not by_name["broken.csv"].ok
+        assert "Error in row 2" in by_name["broken.csv"].error
+        assert by_name["store1.csv"].ok
+        assert by_name["store1.csv"].transactions == 2
+        assert (out / "store1.iif").read_text().count("ENDTRNS\n") == 3
+        assert (out / "north" / "store2.iif").exists()
+        assert not (out / "broken.iif").exists()
+
+
+def test_convert_directory_defaults_to_input_dir():
+    """Test IIF files are written next to their CSV without an output dir."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "store1.csv").write_text(VALID_CSV)
+
+        results = convert_directory(str(root))
+
+        assert results[0].output_path == root / "store1.iif"
+        assert (root / "store1.iif").exists()
+
+
+def test_convert_directory_invalid_jobs():
+    """Test batch conversion rejects a non-positive job count."""
+    with pytest.raises(ValueError, match="jobs must be at least 1"):
+        convert_directory(".", jobs=0)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("bank.csv", "bank.iif"),
+        ("bank.CSV", "bank.iif"),
+        ("bank.csv.gz", "bank.iif"),
+        ("bank.csv.BZ2", "bank.iif"),
+        ("q1.2024.csv.xz", "q1.2024.iif"),
+    ],
+)
+def test_iif_path(name, expected):
+    """Test output names drop the compression suffix."""
+    assert iif_path(Path("exports") / name) == Path("exports") / expected
+
+
+def test_convert_directory_compressed_inputs(tmp_path):
+    """Test compressed exports are found and converted to .iif files."""
+    root = tmp_path / "in"
+    root.mkdir()
+    (root / "plain.csv").write_text(VALID_CSV)
+    (root / "gz.csv.gz").write_bytes(gzip.compress(VALID_CSV.encode()))
+    (root / "xz.CSV.XZ").write_bytes(lzma.compress(VALID_CSV.encode()))
+    (root / "data.gz").write_bytes(gzip.compress(VALID_CSV.encode()))
+
+    results = convert_directory(str(root), str(tmp_path / "out"))
+
+    assert [r.ok for r in results] == [True, True, True]
+    expected = (tmp_path / "out" / "plain.iif").read_text()
+    assert (tmp_path / "out" / "gz.iif").read_text() == expected
+    assert (tmp_path / "out" / "xz.iif").read_text() == expected
+
+
+def test_convert_directory_rejects_clashing_outputs(tmp_path):
+    """Test a plain and a compressed copy of one export are not both written."""
+    (tmp_path / "bank.csv").write_text(VALID_CSV)
+    (tmp_path / "bank.csv.gz").write_bytes(gzip.compress(VALID_CSV.encode()))
+
+    with pytest.raises(ValueError, match="bank.iif"):
+        convert_directory(str(tmp_path))
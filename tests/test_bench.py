@@ -0,0 +1,84 @@
+"""Tests for bench module."""
+
+import csv
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.bench import STAGES, generate_csv, run_benchmarks
+from csv2iif.csv_reader import CSVReader
+
+
+def test_generate_csv_is_readable():
+    """Test generated data passes CSVReader validation."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "synthetic.csv"
+        blanks = generate_csv(path, 200, blank_every=20)
+
+        transactions = CSVReader(str(path)).read()
+        with open(path, encoding="utf-8") as f:
+            records = list(csv.reader(f))
+
+    assert len(transactions) == 200
+    assert blanks == 10
+    assert len(records) == 1 + 200 + 10
+    assert any(":" in t.debit_account for t in transactions)
+    assert any("$" in cell and "," in cell for row in records for cell in row)
+
+
+def test_generate_csv_is_deterministic():
+    """Test the same seed produces the same file and a different seed does not."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = Path(temp_dir) / "a.csv"
+        second = Path(temp_dir) / "b.csv"
+        third = Path(temp_dir) / "c.csv"
+        generate_csv(first, 50, seed=7)
+        generate_csv(second, 50, seed=7)
+        generate_csv(third, 50, seed=8)
+
+        assert first.read_bytes() == second.read_bytes()
+        assert first.read_bytes() != third.read_bytes()
+
+
+def test_generate_csv_standard_column_order():
+    """Test shuffling can be turned off."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "plain.csv"
+        generate_csv(path, 5, shuffle_columns=False, blank_every=0)
+        with open(path, encoding="utf-8") as f:
+            header = next(csv.reader(f))
+
+    assert [h.strip().lower() for h in header][:3] == ["date", "credit-account", "debit-account"]
+
+
+def test_run_benchmarks_reports_every_stage():
+    """Test the report has timings and memory for each stage."""
+    report = run_benchmarks(rows=100, repeat=1)
+
+    assert report["rows"] == 100
+    assert report["input_bytes"] > 0
+    assert list(report["stages"]) == list(STAGES)
+    for result in report["stages"].values():
+        assert result["seconds"] > 0
+        assert result["rows_per_sec"] > 0
+        assert result["peak_memory_bytes"] > 0
+
+
+def test_run_benchmarks_selected_stages_and_kept_csv():
+    """Test running a subset of stages and keeping the generated file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "kept.csv"
+        report = run_benchmarks(rows=10, repeat=1, stages=["write"], csv_path=path)
+
+        assert path.exists()
+    assert list(report["stages"]) == ["write"]
+
+
+def test_run_benchmarks_rejects_bad_arguments():
+    """Test unknown stages and repeat < 1 are rejected."""
+    with pytest.raises(ValueError, match="Unknown benchmark stage: parse"):
+        run_benchmarks(rows=10, stages=["parse"])
+
+    with pytest.raises(ValueError, match="repeat must be at least 1"):
+        run_benchmarks(rows=10, repeat=0)
@@ -0,0 +1,176 @@
+"""Tests for cache module."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from csv2iif.cache import CacheHit, ConversionCache, parse_size
+from csv2iif.converter import Converter
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+
+
+def write_csv(path: Path, rows: int, amount: str = "10.00") -> Path:
+    """Helper to write a CSV file with one blank line at the end."""
+    lines = [
+        f"01/15/2024,Sales Income,Checking,{i},John Doe,{amount},Memo {i}\n" for i in range(rows)
+    ]
+    path.write_text(HEADER + "".join(lines) + "\n")
+    return path
+
+
+def convert(csv_file: Path, iif_file: Path, cache: ConversionCache):
+    """Helper to run a cached conversion."""
+    return Converter(str(csv_file), str(iif_file), cache=cache).convert()
+
+
+def test_second_conversion_is_a_hit(tmp_path):
+    """Test identical input is served from the cache with the same counts."""
+    cache = ConversionCache(tmp_path / "cache")
+    csv_file = write_csv(tmp_path / "in.csv", 3)
+
+    first = convert(csv_file, tmp_path / "a.iif", cache)
+    second = convert(csv_file, tmp_path / "b.iif", cache)
+
+    assert not first.cached
+    assert second.cached
+    assert (second.transactions, second.rows_read, second.blank_rows) == (3, 4, 1)
+    assert (tmp_path / "b.iif").read_text() == (tmp_path / "a.iif").read_text()
+    assert "cache" in second.stages
+    assert cache.stats().entries == 1
+
+
+def test_changed_input_is_a_miss(tmp_path):
+    """Test different content or options produce a different key."""
+    cache = ConversionCache(tmp_path / "cache")
+    csv_file = write_csv(tmp_path / "in.csv", 3)
+    convert(csv_file, tmp_path / "a.iif", cache)
+    key = cache.key(csv_file)
+
+    write_csv(csv_file, 3, amount="20.00")
+    result = convert(csv_file, tmp_path / "b.iif", cache)
+
+    assert not result.cached
+    assert "20.00" in (tmp_path / "b.iif").read_text()
+    assert cache.key(csv_file) != key
+    assert cache.key(csv_file, {"option": 1}) != cache.key(csv_file)
+
+
+def test_link_mode_hard_links_output(tmp_path):
+    """Test link mode shares the entry's inode with the output."""
+    cache = ConversionCache(tmp_path / "cache", link=True)
+    csv_file = write_csv(tmp_path / "in.csv", 2)
+    convert(csv_file, tmp_path / "a.iif", cache)
+
+    assert convert(csv_file, tmp_path / "b.iif", cache).cached
+    assert os.stat(tmp_path / "b.iif").st_ino == os.stat(tmp_path / "a.iif").st_ino
+
+
+def test_lru_eviction(tmp_path):
+    """Test the least recently used entries are evicted first."""
+    cache = ConversionCache(tmp_path / "cache")
+    for i in range(3):
+        output = tmp_path / f"{i}.iif"
+        output.write_text("x" * 100)
+        cache.store(f"{i:02d}key", output, CacheHit(i, i, 0))
+        os.utime(cache._entry_paths(f"{i:02d}key")[1], ns=(i * 10**9, i * 10**9))
+
+    # Using the oldest entry makes the middle one least recently used.
+    assert cache.fetch("00key", tmp_path / "out.iif") is not None
+    cache.max_size = 250
+    assert cache.evict() == 1
+
+    assert cache.fetch("01key", tmp_path / "out.iif") is None
+    assert cache.fetch("00key", tmp_path / "out.iif") == CacheHit(0, 0, 0)
+    assert cache.stats().size_bytes == 200
+
+
+def test_clear_and_stats(tmp_path):
+    """Test clear removes every entry."""
+    cache = ConversionCache(tmp_path / "cache", max_size=1234)
+    assert cache.stats().entries == 0
+    convert(write_csv(tmp_path / "a.csv", 1), tmp_path / "a.iif", cache)
+    convert(write_csv(tmp_path / "b.csv", 2), tmp_path / "b.iif", cache)
+
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.max_size_bytes == 1234
+
+    assert cache.clear() == 2
+    assert cache.stats().entries == 0
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    """Test an unreadable entry is ignored and replaced."""
+    cache = ConversionCache(tmp_path / "cache")
+    csv_file = write_csv(tmp_path / "in.csv", 1)
+    convert(csv_file, tmp_path / "a.iif", cache)
+    cache._entry_paths(cache.key(csv_file))[1].write_text("not json")
+
+    assert not convert(csv_file, tmp_path / "b.iif", cache).cached
+    assert convert(csv_file, tmp_path / "c.iif", cache).cached
+
+
+def test_cache_and_incremental_are_exclusive(tmp_path):
+    """Test the cache cannot be combined with incremental conversion."""
+    with pytest.raises(ValueError, match="Incremental"):
+        Converter("in.csv", "out.iif", incremental=True, cache=ConversionCache(tmp_path))
+
+
+def test_environment_defaults(tmp_path, monkeypatch):
+    """Test the directory and size limit come from the environment."""
+    monkeypatch.setenv("CSV2IIF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("CSV2IIF_CACHE_MAX_SIZE", "2M")
+
+    cache = ConversionCache()
+
+    assert cache.directory == tmp_path
+    assert cache.max_size == 2 * 1024 * 1024
+
+
+@pytest.mark.parametrize(
+    "value,expected", [("100", 100), ("4k", 4096), ("1MB", 1024**2), (" 2G ", 2 * 1024**3)]
+)
+def test_parse_size(value, expected):
+    """Test sizes with and without suffixes."""
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "abc", "-1", "1T"])
+def test_parse_size_invalid(value):
+    """Test invalid sizes are rejected."""
+    with pytest.raises(ValueError, match="Invalid cache size"):
+        parse_size(value)
+
+
+def _convert_shared(args: tuple[str, str, str, int]) -> str:
+    """Worker for the shared-cache test."""
+    csv_file, iif_file, cache_dir, max_size = args
+    cache = ConversionCache(cache_dir, max_size=max_size)
+    Converter(csv_file, iif_file, cache=cache).convert()
+    return Path(iif_file).read_text()
+
+
+def test_shared_cache_across_processes(tmp_path):
+    """Test processes sharing a small cache always produce correct output."""
+    inputs = [write_csv(tmp_path / f"{i}.csv", 20 + i) for i in range(4)]
+    expected = {}
+    for csv_file in inputs:
+        Converter(str(csv_file), str(csv_file.with_suffix(".iif"))).convert()
+        expected[csv_file] = csv_file.with_suffix(".iif").read_text()
+
+    # Room for about two entries, so processes keep evicting each other.
+    max_size = 2 * len(expected[inputs[-1]])
+    tasks = [
+        (str(csv_file), str(tmp_path / f"out{n}.iif"), str(tmp_path / "cache"), max_size)
+        for n, csv_file in enumerate(inputs * 6)
+    ]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_convert_shared, tasks))
+
+    for (csv_file, *_), text in zip(tasks, results, strict=True):
+        assert text == expected[Path(csv_file)]
+    assert ConversionCache(tmp_path / "cache", max_size=max_size).stats().size_bytes <= max_size
+    assert not list((tmp_path / "cache").rglob("*.tmp"))
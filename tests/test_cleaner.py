@@ -0,0 +1,91 @@
+"""Tests for cleaner module."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.cleaner import clean_csv
+
+
+def test_clean_csv_trims_and_dedupes():
+    """Test headers are deduplicated, cells trimmed and blank rows dropped."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir) / "in.csv"
+        output_path = Path(temp_dir) / "out.csv"
+        input_path.write_text(" date ,Memo,memo,\n 01/15/2024 , Pay ,x,y\n , ,\n\n01/16/2024,A,b\n")
+
+        assert clean_csv(input_path, output_path) == 2
+        assert output_path.read_bytes() == b"date,Memo\r\n01/15/2024,Pay\r\n01/16/2024,A\r\n"
+
+
+def test_clean_csv_empty_file():
+    """Test an empty input is rejected."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir) / "in.csv"
+        input_path.write_text("")
+
+        with pytest.raises(ValueError, match="CSV file is empty"):
+            clean_csv(input_path, Path(temp_dir) / "out.csv")
+
+
+def test_clean_csv_in_place():
+    """Test input and output may be the same file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "data.csv"
+        path.write_text("a,b,B\n 1 , 2 ,3\n\n")
+
+        assert clean_csv(path, path) == 1
+        assert path.read_bytes() == b"a,b\r\n1,2\r\n"
+        assert [p.name for p in Path(temp_dir).iterdir()] == ["data.csv"]
+
+
+def test_clean_csv_failure_keeps_existing_output():
+    """Test a failed clean leaves the previous output and no temp file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir) / "in.csv"
+        output_path = Path(temp_dir) / "out.csv"
+        input_path.write_text("")
+        output_path.write_text("previous")
+
+        with pytest.raises(ValueError):
+            clean_csv(input_path, output_path)
+
+        assert output_path.read_text() == "previous"
+        assert sorted(p.name for p in Path(temp_dir).iterdir()) == ["in.csv", "out.csv"]
+
+
+def test_clean_csv_streams_rows():
+    """Test memory use stays well below the size of the file."""
+    import tracemalloc
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir) / "in.csv"
+        output_path = Path(temp_dir) / "out.csv"
+        with open(input_path, "w") as f:
+            f.write("date,memo\n")
+            for i in range(50_000):
+                f.write(f" 01/15/2024 , memo number {i} \n")
+
+        tracemalloc.start()
+        try:
+            assert clean_csv(input_path, output_path) == 50_000
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < input_path.stat().st_size // 4
+
+
+def test_clean_csv_profiler_stages():
+    """Test a profiled clean times the read, clean and write stages."""
+    from csv2iif.profiling import StageTimer
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir) / "in.csv"
+        input_path.write_text("a\n1\n2\n")
+        timer = StageTimer()
+
+        clean_csv(input_path, Path(temp_dir) / "out.csv", profiler=timer)
+
+    assert timer.calls == {"read": 4, "write": 3, "clean": 1}
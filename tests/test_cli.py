@@ -244,7 +244,7 @@ def test_main_unexpected_error():
     try:
         with (
             patch("sys.argv", ["csv2iif", str(csv_file), str(iif_path)]),
-            patch("csv2iif.cli.Converter") as mock_converter,
+            patch("csv2iif.converter.Converter") as mock_converter,
         ):
             mock_converter.return_value.convert.side_effect = RuntimeError("Unexpected")
             with pytest.raises(SystemExit) as exc_info:
@@ -307,3 +307,405 @@ def test_clean_with_all_empty_rows():
     finally:
         csv_file.unlink()
         output_path.unlink()
+
+
+def test_parse_args_jobs():
+    """Test parsing the --jobs option on convert."""
+    with patch("sys.argv", ["csv2iif", "convert", "input.csv", "output.iif", "--jobs", "4"]):
+        args = parse_args()
+        assert args.jobs == 4
+
+
+def test_convert_dir_command(capsys):
+    """Test convert-dir prints a summary and exits 1 when a file fails."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "good.csv").write_text(
+            "date,credit-account,debit-account,number,name,amount,memo\n"
+            "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+        )
+        (root / "bad.csv").write_text("date,amount\n01/15/2024,500.00\n")
+
+        with patch("sys.argv", ["csv2iif", "convert-dir", str(root)]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+
+        output = capsys.readouterr().out
+        assert "✓" in output
+        assert "✗" in output
+        assert "Converted 1 of 2 files" in output
+        assert (root / "good.iif").exists()
+
+
+def test_convert_dir_command_all_succeed():
+    """Test convert-dir exits 0 when every file converts."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "good.csv").write_text(
+            "date,credit-account,debit-account,number,name,amount,memo\n"
+            "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+        )
+
+        with patch("sys.argv", ["csv2iif", "convert-dir", str(root), str(root / "out")]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+
+
+def test_bench_command(capsys):
+    """Test bench prints a JSON report to stdout."""
+    import json
+
+    with patch(
+        "sys.argv", ["csv2iif", "bench", "--rows", "20", "--repeat", "1", "--stage", "read"]
+    ):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["rows"] == 20
+    assert list(report["stages"]) == ["read"]
+
+
+def test_bench_command_output_file():
+    """Test bench writes the report to --output."""
+    import json
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = Path(temp_dir) / "bench.json"
+        argv = ["csv2iif", "bench", "--rows", "10", "--repeat", "1", "--no-shuffle", "-o"]
+        with patch("sys.argv", [*argv, str(output)]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+
+        report = json.loads(output.read_text())
+    assert set(report["stages"]) == {"read", "validate", "write", "convert", "clean"}
+
+
+def test_convert_profile(capsys):
+    """Test --profile prints a stage breakdown and --profile-output saves pstats."""
+    import pstats
+
+    csv_content = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received"""
+    csv_file = create_temp_csv(csv_content)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        iif_path = Path(temp_dir) / "out.iif"
+        stats_path = Path(temp_dir) / "out.prof"
+        argv = ["csv2iif", "convert", str(csv_file), str(iif_path)]
+        try:
+            with patch("sys.argv", [*argv, "--profile-output", str(stats_path)]):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 0
+
+            pstats.Stats(str(stats_path))
+        finally:
+            csv_file.unlink()
+
+    err = capsys.readouterr().err
+    assert "Stage" in err
+    assert "validate" in err
+    assert "cProfile stats written to" in err
+
+
+@pytest.mark.parametrize("command", ["validate", "clean"])
+def test_profile_on_failure(command, capsys):
+    """Test the breakdown is printed even when the command fails."""
+    csv_file = create_temp_csv("")
+
+    try:
+        argv = ["csv2iif", command, str(csv_file)]
+        if command == "clean":
+            argv.append(str(csv_file) + ".out")
+        with patch("sys.argv", [*argv, "--profile"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+    finally:
+        csv_file.unlink()
+
+    assert "total" in capsys.readouterr().err
+
+
+def test_convert_metrics_json():
+    """Test --metrics-json writes the run's metrics."""
+    import json
+
+    csv_content = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received"""
+    csv_file = create_temp_csv(csv_content)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        iif_path = Path(temp_dir) / "out.iif"
+        metrics_path = Path(temp_dir) / "metrics.json"
+        argv = ["csv2iif", "convert", str(csv_file), str(iif_path)]
+        try:
+            with patch("sys.argv", [*argv, "--metrics-json", str(metrics_path)]):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 0
+        finally:
+            csv_file.unlink()
+
+        metrics = json.loads(metrics_path.read_text())
+
+    assert metrics["transactions"] == 1
+    assert metrics["rows_read"] == 1
+    assert set(metrics["stages"]) == {"read", "validate", "write"}
+
+
+def test_convert_profile_metrics_json_has_cpu_time(tmp_path, capsys):
+    """Test --profile with --metrics-json still measures CPU time per stage."""
+    import json
+
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        + "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n" * 2000
+    )
+    metrics_path = tmp_path / "metrics.json"
+    argv = ["csv2iif", "convert", str(csv_file), str(tmp_path / "out.iif"), "--profile"]
+    argv += ["--metrics-json", str(metrics_path)]
+
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 0
+    stages = json.loads(metrics_path.read_text())["stages"]
+    assert sum(stage["cpu_seconds"] for stage in stages.values()) > 0
+    assert "CPU (s)" in capsys.readouterr().err
+
+
+def test_validate_all_errors(capsys):
+    """Test validate --all-errors reports every bad row."""
+    csv_content = """date,credit-account,debit-account,number,name,amount,memo
+13/45/2024,Sales Income,Checking,1001,John Doe,500.00,Payment
+01/15/2024,Sales Income,Checking,1002,John Doe,abc,Payment
+01/15/2024,Sales Income,Checking,1003,John Doe,5.00,Payment"""
+    csv_file = create_temp_csv(csv_content)
+
+    try:
+        with patch("sys.argv", ["csv2iif", "validate", str(csv_file), "--all-errors"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+    finally:
+        csv_file.unlink()
+
+    out = capsys.readouterr().out
+    assert "Row 2, column date" in out
+    assert "Row 3, column amount" in out
+    assert "2 errors in 3 records" in out
+
+
+def test_validate_all_errors_json_report():
+    """Test validate --all-errors writes a JSON report and exits 0 when clean."""
+    import json
+
+    csv_content = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment"""
+    csv_file = create_temp_csv(csv_content)
+    report_file = csv_file.with_suffix(".json")
+    argv = ["csv2iif", "validate", str(csv_file), "--all-errors", "-j", "2"]
+    argv += ["--format", "json", "--report", str(report_file)]
+
+    try:
+        with patch("sys.argv", argv):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+        data = json.loads(report_file.read_text())
+    finally:
+        csv_file.unlink()
+        report_file.unlink(missing_ok=True)
+
+    assert data["records"] == 1
+    assert data["errors"] == []
+
+
+@pytest.mark.parametrize(
+    "option", [["--max-errors", "5"], ["--format", "text"], ["--report", "report.txt"], ["-j", "1"]]
+)
+def test_validate_report_options_imply_all_errors(tmp_path, monkeypatch, capsys, option):
+    """Test report options check every row instead of being ignored."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "13/45/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+        "01/15/2024,Sales Income,Checking,1002,John Doe,abc,Payment\n"
+    )
+    monkeypatch.chdir(tmp_path)
+
+    argv = ["csv2iif", "validate", "in.csv", *option]
+
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
+    report = tmp_path / "report.txt"
+    out = report.read_text() if report.exists() else capsys.readouterr().out
+    assert "2 errors in 2 records" in out
+
+
+def test_convert_incremental(tmp_path):
+    """Test convert --incremental appends on the second run."""
+    csv_file = tmp_path / "bank.csv"
+    iif_file = tmp_path / "bank.iif"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+    )
+    argv = ["csv2iif", "convert", str(csv_file), str(iif_file), "--incremental"]
+
+    for _ in range(2):
+        with patch("sys.argv", argv):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+        with open(csv_file, "a") as f:
+            f.write("01/16/2024,Sales Income,Checking,1002,Jane Doe,20.00,Payment\n")
+
+    assert iif_file.read_text().count("\nENDTRNS\n") == 2
+    assert (tmp_path / "bank.iif.manifest.json").exists()
+
+
+def test_convert_cache_and_cache_command(tmp_path, capsys):
+    """Test convert --cache fills the cache and cache stats/clear manage it."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+    )
+    cache_dir = str(tmp_path / "cache")
+    commands = [
+        ["convert", str(csv_file), str(tmp_path / "out.iif"), "--cache-dir", cache_dir],
+        ["cache", "stats", "--cache-dir", cache_dir],
+        ["cache", "clear", "--cache-dir", cache_dir],
+    ]
+
+    for command in commands:
+        with patch("sys.argv", ["csv2iif", *command]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+
+    out = capsys.readouterr().out
+    assert "Entries:   1" in out
+    assert "Removed 1 cache entries" in out
+
+
+def test_watch_once(tmp_path, capsys):
+    """Test watch --once converts the files already in the inbox and exits."""
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "a.csv").write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+    )
+    argv = ["csv2iif", "watch", str(inbox), str(tmp_path / "out"), "--once", "--interval", "0.01"]
+
+    with patch("sys.argv", argv):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+
+    assert (tmp_path / "out" / "a.iif").exists()
+    assert "Converted 1 files (0 failed)" in capsys.readouterr().out
+
+
+def test_serve_command():
+    """Test serve passes its options to the server."""
+    argv = ["csv2iif", "serve", "--port", "0", "--max-concurrent", "2"]
+    with patch("sys.argv", argv), patch("csv2iif.server.serve") as serve:
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+
+    serve.assert_called_once_with(
+        "127.0.0.1", 0, max_concurrent=2, backend=None, account_types=None, read_timeout=30.0
+    )
+
+
+def test_convert_command_compress(tmp_path):
+    """Test convert --compress writes a compressed IIF file."""
+    import gzip
+
+    csv_file = tmp_path / "input.csv"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+    )
+    output = tmp_path / "output.iif"
+
+    argv = ["csv2iif", "convert", str(csv_file), str(output), "--compress", "gzip"]
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 0
+    assert "John Doe" in gzip.decompress(output.read_bytes()).decode()
+
+
+def test_clean_command_in_place_keeps_compression(tmp_path):
+    """Test cleaning a compressed file in place keeps it compressed."""
+    import bz2
+
+    csv_file = tmp_path / "input.csv"
+    csv_file.write_bytes(bz2.compress(b"date , memo\n a ,b \n"))
+
+    argv = ["csv2iif", "clean", str(csv_file), "-i"]
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 0
+    assert bz2.decompress(csv_file.read_bytes()) == b"date,memo\r\na,b\r\n"
+
+
+def test_convert_command_accounts(tmp_path):
+    """Test convert --accounts starts the file with an account list."""
+    types = tmp_path / "types.json"
+    types.write_text('{"Checking": "BANK", "Sales Income": "INC"}')
+    csv_file = tmp_path / "input.csv"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+    )
+    output = tmp_path / "output.iif"
+
+    argv = ["csv2iif", "convert", str(csv_file), str(output), "--accounts", str(types)]
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 0
+    assert output.read_text().startswith(
+        "!ACCNT\tNAME\tACCNTTYPE\nACCNT\tChecking\tBANK\nACCNT\tSales Income\tINC\n!TRNS"
+    )
+
+    types.write_text('{"Checking": "BANK"}')
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
+
+
+def test_convert_command_schema(tmp_path):
+    """Test convert --schema reads renamed columns."""
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"aliases": {"date": ["Txn Date"]}, "defaults": {"memo": "Imported"}}')
+    csv_file = tmp_path / "input.csv"
+    csv_file.write_text(
+        "Txn Date,credit-account,debit-account,number,name,amount\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00\n"
+    )
+    output = tmp_path / "output.iif"
+
+    argv = ["csv2iif", "convert", str(csv_file), str(output), "--schema", str(schema)]
+    with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 0
+    assert "01/15/2024\tChecking\tJohn Doe\t500.00\t1001\tImported\n" in output.read_text()
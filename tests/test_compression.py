@@ -0,0 +1,147 @@
+"""Tests for compression module."""
+
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from csv2iif.cleaner import clean_csv
+from csv2iif.compression import (
+    compression_from_suffix,
+    detect_compression,
+    open_input,
+    open_text,
+)
+from csv2iif.converter import Converter
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.validation import validate_file
+
+CSV = "date,credit-account,debit-account,number,name,amount,memo\r\n" + "".join(
+    f'01/15/2024,Sales Income,Checking,{i},José,{i}.50,"Memo\nline {i}"\r\n' for i in range(50)
+)
+
+OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+def write_compressed(path, compression: str, text: str) -> None:
+    """Helper to write text with a stdlib codec."""
+    with OPENERS[compression](path, "wt", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def read_compressed(path, compression: str) -> str:
+    """Helper to read text with a stdlib codec."""
+    with OPENERS[compression](path, "rt", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+@pytest.fixture
+def plain_iif(tmp_path):
+    """IIF text converted from the uncompressed CSV."""
+    csv_file = tmp_path / "plain.csv"
+    csv_file.write_text(CSV, newline="")
+    Converter(str(csv_file), str(tmp_path / "plain.iif")).convert()
+    return (tmp_path / "plain.iif").read_text()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+def test_detect_by_magic_bytes(tmp_path, compression):
+    """Test the contents decide, whatever the file is called."""
+    path = tmp_path / "export.csv"
+    write_compressed(path, compression, CSV)
+
+    assert detect_compression(path) == compression
+    with open_input(path, newline="") as f:
+        assert f.read() == CSV
+
+
+def test_detect_plain_and_missing(tmp_path):
+    """Test plain files are not compressed and missing ones go by extension."""
+    plain = tmp_path / "plain.csv.gz"
+    plain.write_text(CSV)
+
+    assert detect_compression(plain) is None
+    assert detect_compression(tmp_path / "missing.iif.xz") == "xz"
+    assert compression_from_suffix("out.IIF.BZ2") == "bz2"
+    assert compression_from_suffix("out.iif") is None
+
+
+def test_unknown_compression(tmp_path):
+    """Test unsupported compression names are rejected."""
+    with pytest.raises(ValueError, match="Unknown compression: zip"):
+        open_text(tmp_path / "x", "w", "zip")
+    with pytest.raises(ValueError, match="Unknown compression"):
+        IIFWriter(str(tmp_path / "x.iif"), compression="zip")
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_compressed_input(tmp_path, plain_iif, compression, jobs):
+    """Test compressed input converts to the same IIF, falling back to one process."""
+    csv_file = tmp_path / "in.csv.data"
+    write_compressed(csv_file, compression, CSV)
+    output = tmp_path / "out.iif"
+
+    result = Converter(str(csv_file), str(output), jobs=jobs).convert()
+
+    assert result.transactions == 50
+    assert output.read_text() == plain_iif
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+def test_convert_compressed_output(tmp_path, plain_iif, compression):
+    """Test the output extension selects the codec."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(CSV, newline="")
+    suffix = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}[compression]
+    output = tmp_path / f"out.iif{suffix}"
+
+    Converter(str(csv_file), str(output)).convert()
+
+    assert detect_compression(output) == compression
+    assert read_compressed(output, compression) == plain_iif
+
+
+def test_explicit_compression_overrides_extension(tmp_path, plain_iif):
+    """Test compression can be chosen regardless of the output name."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(CSV, newline="")
+    output = tmp_path / "out.iif"
+
+    Converter(str(csv_file), str(output), compression="xz").convert()
+
+    assert read_compressed(output, "xz") == plain_iif
+
+
+def test_incremental_and_append_reject_compression(tmp_path):
+    """Test byte-offset features refuse compressed files."""
+    csv_file = tmp_path / "in.csv"
+    write_compressed(csv_file, "gzip", CSV)
+
+    with pytest.raises(ValueError, match="compressed"):
+        Converter(str(csv_file), str(tmp_path / "out.iif"), incremental=True).convert()
+    with pytest.raises(ValueError, match="compressed"):
+        IIFWriter(str(tmp_path / "out.iif.gz")).append_batches([])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_compressed_input(tmp_path, jobs):
+    """Test whole-file validation reads compressed input."""
+    csv_file = tmp_path / "in.csv.bz2"
+    write_compressed(csv_file, "bz2", CSV.replace(",7.50,", ",abc,"))
+
+    report = validate_file(str(csv_file), jobs=jobs)
+
+    assert report.records == 50
+    assert [issue.row for issue in report.issues] == [9]
+
+
+def test_clean_compressed(tmp_path):
+    """Test clean reads compressed input and compresses by output extension."""
+    csv_file = tmp_path / "in.csv.gz"
+    write_compressed(csv_file, "gzip", "date , name\n  a ,b\n\n")
+
+    clean_csv(csv_file, tmp_path / "out.csv.xz")
+
+    assert read_compressed(tmp_path / "out.csv.xz", "xz") == "date,name\r\na,b\r\n"
@@ -6,6 +6,7 @@ from pathlib import Path
 import pytest
 
 from csv2iif.converter import Converter
+from csv2iif.profiling import StageTimer
 
 
 def create_temp_csv(content: str) -> Path:
@@ -89,3 +90,102 @@ def test_converter_multiple_transactions():
     finally:
         csv_file.unlink()
         iif_path.unlink()
+
+
+def test_converter_invalid_row_leaves_no_partial_output():
+    """Test a bad row mid-file does not leave a partially written IIF."""
+    csv_content = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received
+01/16/2024,Checking,Office Supplies,1002,Office Depot,-75.50,Printer paper"""
+    csv_file = create_temp_csv(csv_content)
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".iif") as temp_iif:
+        iif_path = Path(temp_iif.name)
+
+    try:
+        converter = Converter(str(csv_file), str(iif_path))
+        with pytest.raises(ValueError, match="Error in row 3"):
+            converter.convert()
+
+        assert iif_path.read_text() == ""
+    finally:
+        csv_file.unlink()
+        iif_path.unlink()
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "pyarrow"])
+def test_converter_backends_produce_identical_output(backend):
+    """Test every validation backend writes the same IIF bytes."""
+    if backend != "python":
+        pytest.importorskip(backend)
+    rows = "\n".join(
+        f'{month:02d}/{day:02d}/2024,Sales Income,Checking,{day},John Doe,"${day},{month}00.5",Memo'
+        for month in range(1, 13)
+        for day in range(1, 29)
+    )
+    csv_file = create_temp_csv(f"date,credit-account,debit-account,number,name,amount,memo\n{rows}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        expected_path = Path(temp_dir) / "expected.iif"
+        actual_path = Path(temp_dir) / "actual.iif"
+        try:
+            Converter(str(csv_file), str(expected_path), backend="python").convert()
+            Converter(str(csv_file), str(actual_path), backend=backend).convert()
+            assert actual_path.read_bytes() == expected_path.read_bytes()
+        finally:
+            csv_file.unlink()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_converter_returns_metrics(jobs):
+    """Test convert() reports counts, sizes, timings and calls on_metrics."""
+    csv_content = (
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+        "\n"
+        " , , \n"
+        "01/16/2024,Checking,Supplies,1002,Office Depot,75.50,Paper\n"
+    )
+    csv_file = create_temp_csv(csv_content)
+    received = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        iif_path = Path(temp_dir) / "out.iif"
+        try:
+            converter = Converter(
+                str(csv_file), str(iif_path), jobs=jobs, on_metrics=received.append
+            )
+            result = converter.convert()
+        finally:
+            csv_file.unlink()
+        bytes_out = iif_path.stat().st_size
+
+    assert received == [result]
+    assert result.transactions == 2
+    assert result.rows_read == 4
+    assert result.blank_rows == 2
+    assert result.bytes_in == len(csv_content.encode())
+    assert result.bytes_out == bytes_out
+    assert result.wall_seconds > 0
+    assert result.rows_per_sec > 0
+    assert "write" in result.stages
+    assert result.to_dict()["stages"]["write"]["calls"] == 1
+
+
+def test_profilers_are_kept_between_runs(tmp_path):
+    """Test convert() neither replaces a caller's profiler nor mixes runs in the default one."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+    )
+    converter = Converter(str(csv_file), str(tmp_path / "out.iif"))
+
+    assert converter.reader.profiler is converter.writer.profiler is converter.profiler
+    assert [converter.convert().stages["write"].calls for _ in range(2)] == [1, 1]
+
+    timer = StageTimer()
+    converter.reader.profiler = timer
+    converter.convert()
+    assert converter.reader.profiler is timer
+    assert "read" in timer.calls
@@ -193,3 +193,103 @@ def test_csv_reader_skip_empty_rows():
         assert len(transactions) == 2
     finally:
         csv_file.unlink()
+
+
+def test_csv_reader_iter_transactions_is_lazy():
+    """Test iter_transactions yields rows before reaching a bad row."""
+    content = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received
+
+13/45/2024,Sales Income,Checking,1002,Jane Doe,75.00,Bad date"""
+    csv_file = create_temp_csv(content)
+
+    try:
+        reader = CSVReader(str(csv_file))
+        transactions = reader.iter_transactions()
+        first = next(transactions)
+        assert first.name == "John Doe"
+        with pytest.raises(ValueError, match="Error in row 4"):
+            next(transactions)
+    finally:
+        csv_file.unlink()
+
+
+def test_csv_reader_iter_transactions_file_not_found():
+    """Test iter_transactions raises before iteration for missing file."""
+    reader = CSVReader("/nonexistent/file.csv")
+    with pytest.raises(FileNotFoundError):
+        reader.iter_transactions()
+
+
+def test_csv_reader_iter_batches():
+    """Test reading validated batches matches reading transactions."""
+    rows = "\n".join(
+        f"01/{day:02d}/2024,Sales Income,Checking,{day},John Doe,$1,{day}00.00,Memo {day}"
+        for day in range(1, 26)
+    )
+    content = "date,credit-account,debit-account,number,name,amount,memo\n" + rows.replace(
+        "$1,", '"$1,'
+    ).replace(".00,", '.00",')
+    csv_file = create_temp_csv(content)
+
+    try:
+        reader = CSVReader(str(csv_file))
+        batches = list(reader.iter_batches(batch_size=10))
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+        rows_from_batches = [row for batch in batches for row in batch]
+        transactions = CSVReader(str(csv_file)).read()
+        assert [tuple(row) for row in rows_from_batches] == [
+            (t.date, t.credit_account, t.debit_account, t.number, t.name, t.amount, t.memo)
+            for t in transactions
+        ]
+    finally:
+        csv_file.unlink()
+
+
+def test_csv_reader_iter_batches_reports_first_error():
+    """Test batch reading reports the earliest bad row, including short rows."""
+    content = """date,credit-account,debit-account,number,name,amount,memo
+13/45/2024,Sales Income,Checking,1001,John Doe,500.00,Payment received
+01/16/2024,Checking"""
+    csv_file = create_temp_csv(content)
+
+    try:
+        reader = CSVReader(str(csv_file))
+        with pytest.raises(ValueError, match="Error in row 2"):
+            list(reader.iter_batches())
+    finally:
+        csv_file.unlink()
+
+
+def test_csv_reader_iter_batches_short_row():
+    """Test batch reading reports rows with missing cells."""
+    content = """date,credit-account,debit-account,number,name,amount,memo
+01/16/2024,Checking"""
+    csv_file = create_temp_csv(content)
+
+    try:
+        reader = CSVReader(str(csv_file))
+        with pytest.raises(ValueError, match="Error in row 2: list index out of range"):
+            list(reader.iter_batches())
+    finally:
+        csv_file.unlink()
+
+
+def test_csv_reader_iter_batches_file_not_found():
+    """Test iter_batches raises before iteration for missing file."""
+    reader = CSVReader("/nonexistent/file.csv")
+    with pytest.raises(FileNotFoundError):
+        reader.iter_batches()
+
+
+def test_csv_reader_iter_batches_empty_file():
+    """Test iter_batches on an empty file."""
+    csv_file = create_temp_csv("")
+
+    try:
+        reader = CSVReader(str(csv_file))
+        with pytest.raises(ValueError, match="CSV file is empty"):
+            list(reader.iter_batches())
+    finally:
+        csv_file.unlink()
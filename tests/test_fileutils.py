@@ -0,0 +1,31 @@
+"""Tests for fileutils module."""
+
+import pytest
+
+from csv2iif.fileutils import atomic_write
+
+
+def test_concurrent_writes_to_one_path(tmp_path):
+    """Test overlapping writes of the same path use separate temporary files."""
+    path = tmp_path / "out.iif"
+
+    with atomic_write(path) as first:
+        with atomic_write(path) as second:
+            second.write("second\n")
+        first.write("first\n")
+
+    assert path.read_text() == "first\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.iif"]
+
+
+def test_failed_write_keeps_original(tmp_path):
+    """Test an exception removes the temporary file and keeps the old output."""
+    path = tmp_path / "out.iif"
+    path.write_text("old\n")
+
+    with pytest.raises(RuntimeError), atomic_write(path) as f:
+        f.write("new\n")
+        raise RuntimeError("boom")
+
+    assert path.read_text() == "old\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.iif"]
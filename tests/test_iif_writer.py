@@ -1,10 +1,20 @@
 """Tests for iif_writer module."""
 
+import json
 import tempfile
 from pathlib import Path
 
-from csv2iif.iif_writer import IIFWriter
-from csv2iif.models import Transaction
+import pytest
+
+from csv2iif import iif_writer
+from csv2iif.iif_writer import (
+    HEADERS,
+    IIFWriter,
+    account_type,
+    expand_accounts,
+    load_account_types,
+)
+from csv2iif.models import Transaction, TransactionBatch
 
 
 def test_iif_writer_single_transaction():
@@ -164,3 +174,271 @@ def test_iif_writer_tab_delimited():
         assert trns_line.count("\t") >= 7
     finally:
         temp_path.unlink()
+
+
+def test_iif_writer_accepts_generator():
+    """Test writing transactions from a generator returns the count."""
+
+    def generate():
+        for i in range(3):
+            yield Transaction(
+                date="01/15/2024",
+                credit_account="Sales Income",
+                debit_account="Checking",
+                number=str(1000 + i),
+                name="John Doe",
+                amount="500.00",
+                memo="Payment",
+            )
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".iif") as temp_file:
+        temp_path = Path(temp_file.name)
+
+    try:
+        writer = IIFWriter(str(temp_path))
+        assert writer.write(generate()) == 3
+
+        content = temp_path.read_text()
+        assert content.count("ENDTRNS\n") == 4
+    finally:
+        temp_path.unlink()
+
+
+def test_iif_writer_failure_keeps_existing_file():
+    """Test a failing iterable does not leave a truncated file behind."""
+
+    def generate():
+        yield Transaction(
+            date="01/15/2024",
+            credit_account="Sales Income",
+            debit_account="Checking",
+            number="1001",
+            name="John Doe",
+            amount="500.00",
+            memo="Payment",
+        )
+        raise ValueError("Error in row 3: boom")
+
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".iif") as temp_file:
+        temp_file.write("previous output")
+        temp_path = Path(temp_file.name)
+
+    try:
+        writer = IIFWriter(str(temp_path))
+        with pytest.raises(ValueError, match="row 3"):
+            writer.write(generate())
+
+        assert temp_path.read_text() == "previous output"
+        assert list(temp_path.parent.glob(f".{temp_path.name}.*.tmp")) == []
+    finally:
+        temp_path.unlink()
+
+
+def test_iif_writer_accepts_transaction_batch():
+    """Test a TransactionBatch writes the same bytes as Transaction objects."""
+    batch = TransactionBatch()
+    batch.append("01/15/2024", "Sales Income", "Checking", "1001", "John Doe", "$500", "Pay", 2)
+    batch.append("01/16/2024", "Checking", "Supplies", "", "", "75.5", "Paper", 3)
+    batch.validate()
+    transactions = [
+        Transaction("01/15/2024", "Sales Income", "Checking", "1001", "John Doe", "$500", "Pay"),
+        Transaction("01/16/2024", "Checking", "Supplies", "", "", "75.5", "Paper"),
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        batch_path = Path(temp_dir) / "batch.iif"
+        list_path = Path(temp_dir) / "list.iif"
+
+        assert IIFWriter(str(batch_path)).write(batch) == 2
+        IIFWriter(str(list_path)).write(transactions)
+
+        assert batch_path.read_bytes() == list_path.read_bytes()
+
+
+@pytest.mark.parametrize("buffer_size", [0, 1, 100, 256 * 1024])
+def test_iif_writer_buffer_size_does_not_change_output(buffer_size):
+    """Test every buffer size and input shape writes identical bytes."""
+    batches = []
+    for first in range(0, 25, 10):
+        batch = TransactionBatch()
+        for i in range(first, min(first + 10, 25)):
+            batch.append(f"01/{i + 1:02d}/2024", "Checking", "Supplies", str(i), "", "9.5", "M", i)
+        batch.validate()
+        batches.append(batch)
+    rows = [row for batch in batches for row in batch]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        expected_path = Path(temp_dir) / "expected.iif"
+        IIFWriter(str(expected_path), buffer_size=0).write(rows)
+        expected = expected_path.read_bytes()
+
+        out = Path(temp_dir) / "out.iif"
+        writer = IIFWriter(str(out), buffer_size=buffer_size)
+
+        assert writer.write(rows) == 25
+        assert out.read_bytes() == expected
+        assert writer.write(iter(rows)) == 25
+        assert out.read_bytes() == expected
+        assert writer.write_batches(iter(batches)) == 25
+        assert out.read_bytes() == expected
+
+    assert expected.count(b"\nENDTRNS\n") == 25
+
+
+TYPES = {"Checking": "BANK", "Sales Income": "INC", "Expenses": "EXP"}
+
+
+def account_batch() -> TransactionBatch:
+    """Helper to build a batch that uses subaccounts."""
+    batch = TransactionBatch()
+    batch.append("01/15/2024", "Sales Income", "Checking", "1", "", "5", "A", 2)
+    batch.append("01/16/2024", "Checking", "Expenses:Tools:Saws", "2", "", "7", "B", 3)
+    batch.validate()
+    return batch
+
+
+def test_expand_accounts_adds_parents():
+    """Test parent accounts are added and sorted before their subaccounts."""
+    accounts = expand_accounts(["Expenses:Tools:Saws", "Checking", "Expenses Other", ""])
+
+    assert accounts == [
+        "Checking",
+        "Expenses",
+        "Expenses Other",
+        "Expenses:Tools",
+        "Expenses:Tools:Saws",
+    ]
+
+
+@pytest.mark.parametrize(
+    "account, expected",
+    [
+        ("Checking", "BANK"),
+        ("Expenses:Tools", "EXP"),
+        ("Expenses:Tools:Saws", "FIXASSET"),
+        ("Expenses:Tools:Saws:Blades", "FIXASSET"),
+        ("Sales Tax Payable", None),
+        ("Expenses Other", None),
+    ],
+)
+def test_account_type(account, expected):
+    """Test types come from the account or its nearest listed parent."""
+    types = {**TYPES, "Expenses:Tools:Saws": "FIXASSET"}
+
+    assert account_type(account, types) == expected
+
+
+@pytest.mark.parametrize(
+    "types, message",
+    [
+        ({"Checking": "BANKING"}, "Unknown account type for Checking: BANKING"),
+        ({"Checking": ""}, "Unknown account type"),
+        ({"Checking": None}, "must map names to codes"),
+    ],
+)
+def test_invalid_account_types(types, message):
+    """Test only QuickBooks ACCNTTYPE codes are accepted."""
+    with pytest.raises(ValueError, match=message):
+        IIFWriter("out.iif", account_types=types)
+
+
+def test_load_account_types(tmp_path):
+    """Test account types are read from a JSON object."""
+    path = tmp_path / "types.json"
+    path.write_text(json.dumps(TYPES))
+
+    assert load_account_types(path) == TYPES
+
+    path.write_text("[]")
+    with pytest.raises(ValueError, match="must hold a JSON object"):
+        load_account_types(path)
+
+
+def test_account_list_precedes_headers(tmp_path):
+    """Test the !ACCNT section is written first and the rest is unchanged."""
+    plain = tmp_path / "plain.iif"
+    listed = tmp_path / "listed.iif"
+    IIFWriter(str(plain)).write_batches([account_batch()])
+    writer = IIFWriter(str(listed), account_types=TYPES)
+
+    assert writer.write_batches([account_batch()]) == 2
+
+    assert (
+        listed.read_text()
+        == (
+            "!ACCNT\tNAME\tACCNTTYPE\n"
+            "ACCNT\tChecking\tBANK\n"
+            "ACCNT\tExpenses\tEXP\n"
+            "ACCNT\tExpenses:Tools\tEXP\n"
+            "ACCNT\tExpenses:Tools:Saws\tEXP\n"
+            "ACCNT\tSales Income\tINC\n"
+        )
+        + plain.read_text()
+    )
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_untyped_account_fails_and_keeps_output(tmp_path):
+    """Test an account without a type is an error, never a blank ACCNTTYPE."""
+    output = tmp_path / "out.iif"
+    output.write_text("previous")
+    writer = IIFWriter(str(output), account_types={"Checking": "BANK", "Expenses": "EXP"})
+
+    with pytest.raises(ValueError, match="No account type for 1 accounts: Sales Income"):
+        writer.write_batches([account_batch()])
+    with pytest.raises(ValueError, match="Sales Income"):
+        list(writer.render_stream([account_batch()]))
+
+    assert output.read_text() == "previous"
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_accounts_collected_for_every_input_shape(tmp_path):
+    """Test rows, batches and streams all produce the same account list."""
+    output = tmp_path / "out.iif"
+    writer = IIFWriter(str(output), account_types=TYPES)
+    writer.write_batches([account_batch()])
+    expected = output.read_text()
+
+    writer.write(account_batch())
+    assert output.read_text() == expected
+    writer.write(iter(list(account_batch())))
+    assert output.read_text() == expected
+    assert "".join(writer.render_stream([account_batch()])) == expected
+    assert writer.accounts == {"Sales Income", "Checking", "Expenses:Tools:Saws"}
+
+
+def test_accounts_collected_without_account_list(tmp_path):
+    """Test the accounts are available even when no section is written."""
+    writer = IIFWriter(str(tmp_path / "out.iif"))
+
+    writer.write_batches([account_batch()])
+
+    assert writer.accounts == {"Sales Income", "Checking", "Expenses:Tools:Saws"}
+    assert (tmp_path / "out.iif").read_text().startswith(HEADERS)
+
+
+def test_account_list_spools_to_disk(tmp_path, monkeypatch):
+    """Test output larger than the spool limit is written unchanged."""
+    expected = tmp_path / "expected.iif"
+    IIFWriter(str(expected), account_types=TYPES).write_batches([account_batch()] * 3)
+    monkeypatch.setattr(iif_writer, "_SPOOL_SIZE", 10)
+    output = tmp_path / "out.iif"
+
+    IIFWriter(str(output), account_types=TYPES).write_batches([account_batch()] * 3)
+
+    assert output.read_text() == expected.read_text()
+
+
+def test_append_never_repeats_account_list(tmp_path):
+    """Test only an append to an empty file writes the !ACCNT section and headers."""
+    output = tmp_path / "out.iif"
+    writer = IIFWriter(str(output), account_types=TYPES)
+
+    writer.append_batches([account_batch()])
+    writer.append_batches([account_batch()])
+
+    text = output.read_text()
+    assert text.startswith("!ACCNT\tNAME\tACCNTTYPE\n")
+    assert text.count("!ACCNT") == text.count("!TRNS") == 1
+    assert text.count("\nENDTRNS\n") == 4
@@ -0,0 +1,221 @@
+"""Tests for incremental module."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.converter import Converter
+from csv2iif.incremental import load_manifest, manifest_path
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+TYPES = {"Sales Income": "INC", "Checking": "BANK", "Savings": "BANK"}
+
+
+def row(i: int, amount: str = "10.00") -> str:
+    """Helper to build one data row."""
+    return f"01/15/2024,Sales Income,Checking,{i},John Doe,{amount},Memo {i}\n"
+
+
+@pytest.fixture
+def paths():
+    """CSV and IIF paths in a temporary directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp) / "bank.csv", Path(tmp) / "bank.iif"
+
+
+def convert(csv_file: Path, iif_file: Path):
+    """Helper to run an incremental conversion."""
+    return Converter(str(csv_file), str(iif_file), incremental=True).convert()
+
+
+def full_output(csv_file: Path, tmp_name: str = "full.iif") -> str:
+    """Helper to convert from scratch and return the IIF text."""
+    iif_file = csv_file.with_name(tmp_name)
+    Converter(str(csv_file), str(iif_file)).convert()
+    return iif_file.read_text()
+
+
+def test_first_run_writes_manifest(paths):
+    """Test the first incremental run converts everything and saves a manifest."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1) + "\n" + row(2))
+
+    result = convert(csv_file, iif_file)
+
+    assert result.transactions == 2
+    assert not result.appended
+    manifest = load_manifest(manifest_path(iif_file))
+    assert manifest.offset == csv_file.stat().st_size
+    assert manifest.rows == 3
+    assert manifest.transactions == 2
+    assert manifest.output_size == iif_file.stat().st_size
+
+
+def test_appends_only_new_rows(paths):
+    """Test a second run appends the new rows and matches a full conversion."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1) + row(2))
+    convert(csv_file, iif_file)
+
+    with open(csv_file, "a") as f:
+        f.write(row(3) + "\n" + row(4))
+    result = convert(csv_file, iif_file)
+
+    assert result.appended
+    assert result.transactions == 2
+    assert result.rows_read == 3
+    assert result.blank_rows == 1
+    assert iif_file.read_text() == full_output(csv_file)
+    assert load_manifest(manifest_path(iif_file)).transactions == 4
+
+
+def test_no_new_rows(paths):
+    """Test an unchanged input leaves the output alone."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1))
+    convert(csv_file, iif_file)
+    before = iif_file.read_text()
+
+    result = convert(csv_file, iif_file)
+
+    assert result.appended
+    assert result.transactions == 0
+    assert iif_file.read_text() == before
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda csv_file, iif_file: csv_file.write_text(HEADER + row(1, "99.00") + row(2)),
+        lambda csv_file, iif_file: csv_file.write_text(HEADER),
+        lambda csv_file, iif_file: iif_file.write_text("edited\n"),
+        lambda csv_file, iif_file: manifest_path(iif_file).write_text("not json"),
+    ],
+)
+def test_rebuilds_when_prefix_changes(paths, change):
+    """Test edited input, a truncated input, an edited output or a bad manifest rebuild."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1) + row(2))
+    convert(csv_file, iif_file)
+
+    change(csv_file, iif_file)
+    result = convert(csv_file, iif_file)
+
+    assert not result.appended
+    assert iif_file.read_text() == full_output(csv_file)
+
+
+@pytest.mark.parametrize("appended", ["\n" + row(2), row(2)])
+def test_rebuilds_after_unterminated_last_row(paths, appended):
+    """Test rows after a last row without a line break are not misnumbered or merged."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1).rstrip("\n"))
+    convert(csv_file, iif_file)
+    assert convert(csv_file, iif_file).appended
+
+    with open(csv_file, "a") as f:
+        f.write(appended)
+    result = convert(csv_file, iif_file)
+
+    assert not result.appended
+    assert iif_file.read_text() == full_output(csv_file)
+    assert load_manifest(manifest_path(iif_file)).rows == result.rows_read
+
+
+def test_invalid_appended_row_leaves_output_unchanged(paths):
+    """Test a bad appended row reports its absolute row number and rolls back."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1) + row(2))
+    convert(csv_file, iif_file)
+    before = iif_file.read_text()
+    manifest_before = manifest_path(iif_file).read_text()
+
+    with open(csv_file, "a") as f:
+        f.write(row(3) + row(4, "abc"))
+    with pytest.raises(ValueError, match="row 5"):
+        convert(csv_file, iif_file)
+
+    assert iif_file.read_text() == before
+    assert manifest_path(iif_file).read_text() == manifest_before
+
+
+def test_manifest_from_other_version_is_ignored(paths):
+    """Test a manifest with an unknown version forces a rebuild."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1))
+    convert(csv_file, iif_file)
+
+    path = manifest_path(iif_file)
+    data = json.loads(path.read_text())
+    data["version"] = 99
+    path.write_text(json.dumps(data))
+
+    assert load_manifest(path) is None
+    assert not convert(csv_file, iif_file).appended
+
+
+def convert_listed(csv_file: Path, iif_file: Path, types: dict[str, str] = TYPES):
+    """Helper to run an incremental conversion with an account list."""
+    return Converter(str(csv_file), str(iif_file), incremental=True, account_types=types).convert()
+
+
+def listed_output(csv_file: Path) -> str:
+    """Helper to convert from scratch with an account list and return the IIF text."""
+    iif_file = csv_file.with_name("full.iif")
+    Converter(str(csv_file), str(iif_file), account_types=TYPES).convert()
+    return iif_file.read_text()
+
+
+def test_account_list_appends_rows_with_known_accounts(paths):
+    """Test rows using listed accounts are appended below the single !ACCNT section."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1))
+    convert_listed(csv_file, iif_file)
+
+    with open(csv_file, "a") as f:
+        f.write(row(2))
+    result = convert_listed(csv_file, iif_file)
+
+    assert result.appended
+    assert iif_file.read_text() == listed_output(csv_file)
+    assert iif_file.read_text().count("!ACCNT") == 1
+    assert load_manifest(manifest_path(iif_file)).accounts == ["Checking", "Sales Income"]
+
+
+def test_account_list_rebuilds_for_new_accounts(paths):
+    """Test rows using an unlisted account rebuild the file instead of appending."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1))
+    convert_listed(csv_file, iif_file)
+
+    with open(csv_file, "a") as f:
+        f.write("01/16/2024,Sales Income,Savings,2,John Doe,5.00,Memo\n")
+    result = convert_listed(csv_file, iif_file)
+
+    assert not result.appended
+    assert result.transactions == 2
+    text = iif_file.read_text()
+    assert text == listed_output(csv_file)
+    assert text.count("!ACCNT") == text.count("!TRNS") == 1
+    assert "ACCNT\tSavings\tBANK\n" in text
+    assert load_manifest(manifest_path(iif_file)).accounts == [
+        "Checking",
+        "Sales Income",
+        "Savings",
+    ]
+
+
+def test_account_types_change_rebuilds(paths):
+    """Test changing or dropping the account types rebuilds the file."""
+    csv_file, iif_file = paths
+    csv_file.write_text(HEADER + row(1))
+    convert_listed(csv_file, iif_file)
+
+    result = convert_listed(csv_file, iif_file, {**TYPES, "Checking": "OCASSET"})
+    assert not result.appended
+    assert "ACCNT\tChecking\tOCASSET\n" in iif_file.read_text()
+
+    assert not convert(csv_file, iif_file).appended
+    assert "!ACCNT" not in iif_file.read_text()
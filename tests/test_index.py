@@ -0,0 +1,180 @@
+"""Tests for index module."""
+
+import codecs
+import csv
+import io
+
+import pytest
+
+from csv2iif import index
+from csv2iif.index import RecordIndex
+from csv2iif.parallel import split_chunks
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo"
+
+
+def make_csv(rows: int, newline: str = "\n") -> str:
+    """Helper to build CSV text with quoted newlines, escaped quotes and blank lines."""
+    lines = [HEADER]
+    for i in range(rows):
+        memo = f'"Line one{newline}said ""hi"" {i}"' if i % 3 == 0 else f"Memo {i}"
+        lines.append(f"01/15/2024,Sales Income,Checking,{i},John Doe,1.50,{memo}")
+        if i % 5 == 0:
+            lines.append("")
+    return newline.join(lines) + newline
+
+
+def csv_records(data: bytes) -> list[list[str]]:
+    """Helper to parse bytes the way csv.reader does."""
+    return list(csv.reader(io.StringIO(data.decode("utf-8-sig"), newline=None)))
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("block_size", [7, 4 * 1024 * 1024])
+def test_offsets_match_csv_reader(tmp_path, monkeypatch, newline, block_size):
+    """Test every record is found, including across scan blocks."""
+    monkeypatch.setattr(index, "_SCAN_BLOCK_SIZE", block_size)
+    data = make_csv(40, newline).encode()
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_bytes(data)
+
+    idx = RecordIndex.build(csv_file)
+    records = csv_records(data)
+
+    assert idx.records == len(records)
+    assert idx.rows == len(records) - 1
+    assert idx.offset(1) == 0
+    assert [idx.read(row)[0] for row in range(1, idx.records + 1)] == records
+    assert idx.read(1, 1000) == records
+
+
+def stray_quote_csv(rows: int) -> str:
+    """Helper to build CSV text with quotes inside unquoted fields and multi-line memos."""
+    lines = [HEADER]
+    for i in range(rows):
+        if i % 100 == 7:
+            memo = '2" PVC pipe'
+        elif i % 100 == 50:
+            memo = '"Line one\nsaid ""hi"""'
+        elif i % 100 == 80:
+            memo = '"quoted"tail'
+        else:
+            memo = f"Memo {i}"
+        lines.append(f'01/15/2024,Sales Income,Checking,{i},O"Brien,1.50,{memo}')
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("block_size", [7, 4 * 1024 * 1024])
+def test_stray_quotes_match_csv_reader(tmp_path, monkeypatch, block_size):
+    """Test quotes inside unquoted fields do not open a quoted field."""
+    monkeypatch.setattr(index, "_SCAN_BLOCK_SIZE", block_size)
+    data = stray_quote_csv(3000).encode()
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_bytes(data)
+
+    idx = RecordIndex.build(csv_file)
+    records = csv_records(data)
+
+    assert idx.records == len(records) == 3001
+    assert idx.read(1500) == [records[1499]]
+    assert idx.read(1, len(records)) == records
+
+
+def test_byte_order_mark_is_skipped(tmp_path):
+    """Test the header record starts after a UTF-8 BOM."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_bytes(codecs.BOM_UTF8 + make_csv(3, "\r\n").encode())
+
+    idx = RecordIndex.build(csv_file)
+
+    assert idx.bom
+    assert idx.offset(1) == 3
+    assert idx.read(1)[0][0] == "date"
+
+
+def test_without_trailing_newline(tmp_path):
+    """Test the last record is counted when no newline follows it."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text("a,b\nc,d\ne,f")
+
+    idx = RecordIndex.build(csv_file)
+
+    assert idx.rows == 2
+    assert idx.byte_range(3) == (8, 11)
+    assert idx.offset(4) == 11
+
+
+def test_chunks_skip_quoted_newlines(tmp_path):
+    """Test record starts and chunk boundaries never fall inside a quoted field."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_bytes(b'a,b\n"x\ny",1\nz,2\n')
+
+    idx = RecordIndex.build(csv_file)
+
+    assert [idx.offset(row) for row in range(1, 5)] == [0, 4, 12, 16]
+    assert idx.chunks(1) == [(4, 12), (12, 16)]
+    assert idx.chunks(5) == [(4, 12), (12, 16)]
+
+
+def test_chunks_without_trailing_newline(tmp_path):
+    """Test the last chunk ends at the file size when no newline follows."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_bytes(b"a,b\nc,d")
+
+    idx = RecordIndex.build(csv_file)
+
+    assert idx.offset(3) == 7
+    assert idx.chunks(1) == [(4, 7)]
+
+
+def test_unterminated_quote_runs_to_end(tmp_path):
+    """Test a quote that never closes makes the rest of the file one record."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text('a,b\n"open,1\nc,d\n')
+
+    assert RecordIndex.build(csv_file).rows == 1
+
+
+def test_empty_and_header_only(tmp_path):
+    """Test files without data rows."""
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    header = tmp_path / "header.csv"
+    header.write_text(HEADER + "\n")
+
+    assert (RecordIndex.build(empty).records, RecordIndex.build(empty).rows) == (0, 0)
+    assert (RecordIndex.build(header).records, RecordIndex.build(header).rows) == (1, 0)
+    assert RecordIndex.build(header).chunks(10) == []
+
+
+def test_row_out_of_range(tmp_path):
+    """Test seeking past the last row raises IndexError."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text("a,b\nc,d\n")
+    idx = RecordIndex.build(csv_file)
+
+    with pytest.raises(IndexError, match="Row 4"):
+        idx.offset(4)
+    with pytest.raises(IndexError):
+        idx.read(0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 50, 333, 10_000])
+def test_split_chunks_cover_data_records(tmp_path, chunk_size):
+    """Test split_chunks gives the index's ranges, which parse to every data record."""
+    data = make_csv(60).encode()
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_bytes(data)
+
+    chunks = split_chunks(csv_file, chunk_size)
+
+    assert chunks == RecordIndex.build(csv_file).chunks(chunk_size)
+    assert [record for start, end in chunks for record in csv_records(data[start:end])] == (
+        csv_records(data)[1:]
+    )
+
+
+def test_missing_file(tmp_path):
+    """Test a missing file raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        RecordIndex.build(tmp_path / "missing.csv")
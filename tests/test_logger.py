@@ -34,3 +34,77 @@ def test_setup_logger_has_handler():
     """Test logger has a handler configured."""
     logger = setup_logger("test_handler")
     assert len(logger.handlers) > 0
+
+
+def test_json_formatter():
+    """Test JSON output carries the merged message and exception text."""
+    import json
+
+    from csv2iif.logger import JSONFormatter
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+
+        record = logging.LogRecord(
+            "csv2iif.test",
+            logging.ERROR,
+            __file__,
+            1,
+            "Failed %s: %d",
+            ("x.csv", 3),
+            sys.exc_info(),
+        )
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "csv2iif.test"
+    assert entry["message"] == "Failed x.csv: 3"
+    assert "ValueError: boom" in entry["exception"]
+    assert "time" in entry
+
+
+def test_setup_logger_json_format(monkeypatch, capsys):
+    """Test LOG_FORMAT=json switches the handler to JSON lines."""
+    import json
+
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    logger = setup_logger("test_json_format")
+    logger.info("Read %s rows", 5)
+
+    entry = json.loads(capsys.readouterr().err.strip())
+    assert entry["message"] == "Read 5 rows"
+
+
+def test_setup_logger_queue_mode(monkeypatch, capsys):
+    """Test LOG_QUEUE=1 routes records through the background listener."""
+    from logging.handlers import QueueHandler
+
+    from csv2iif.logger import stop_listener
+
+    monkeypatch.setenv("LOG_QUEUE", "1")
+    logger = setup_logger("test_queue_mode", level="DEBUG")
+
+    assert isinstance(logger.handlers[0], QueueHandler)
+    logger.debug("Column mapping: %s", {"date": 0})
+    stop_listener()
+    stop_listener()
+
+    assert "Column mapping: {'date': 0}" in capsys.readouterr().err
+
+
+def test_setup_logger_queue_mode_filters_before_formatting(monkeypatch):
+    """Test records below the level never reach the queue."""
+    from csv2iif import logger as logger_module
+
+    monkeypatch.setenv("LOG_QUEUE", "true")
+    logger = setup_logger("test_queue_filter", level="WARNING")
+
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("formatted a filtered record")
+
+    logger.info("value %s", Unformattable())
+    logger_module.stop_listener()
@@ -0,0 +1,61 @@
+"""Tests for metrics module."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from csv2iif.metrics import ConversionResult, StageMetrics, peak_rss_bytes, stage_metrics
+from csv2iif.profiling import StageTimer
+
+
+def make_result(**overrides) -> ConversionResult:
+    """Helper to build a ConversionResult with sample values."""
+    values = {
+        "input_path": "in.csv",
+        "output_path": "out.iif",
+        "transactions": 100,
+        "rows_read": 105,
+        "blank_rows": 5,
+        "bytes_in": 2048,
+        "bytes_out": 4096,
+        "wall_seconds": 0.5,
+        "cpu_seconds": 0.4,
+        "peak_rss_bytes": 1 << 20,
+        "stages": {"write": StageMetrics(0.1, 0.1, 1)},
+    }
+    values.update(overrides)
+    return ConversionResult(**values)
+
+
+def test_rows_per_sec():
+    """Test throughput is transactions per wall second."""
+    assert make_result().rows_per_sec == 200.0
+    assert make_result(wall_seconds=0.0).rows_per_sec is None
+
+
+def test_write_json():
+    """Test the JSON file contains every field and nested stage metrics."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "metrics.json"
+        make_result().write_json(path)
+        data = json.loads(path.read_text())
+
+    assert data["rows_read"] == 105
+    assert data["rows_per_sec"] == 200.0
+    assert data["stages"] == {"write": {"wall_seconds": 0.1, "cpu_seconds": 0.1, "calls": 1}}
+
+
+def test_stage_metrics_from_timer():
+    """Test wall time, CPU time and call counts are taken from the timer."""
+    timer = StageTimer(cpu=True)
+    timer.record("read", 0.25, 0.2)
+    timer.record("read", 0.25, 0.2)
+
+    assert stage_metrics(timer) == {"read": StageMetrics(0.5, 0.4, 2)}
+
+
+def test_peak_rss_bytes():
+    """Test peak RSS is reported in bytes."""
+    peak = peak_rss_bytes()
+
+    assert peak is None or peak > 1 << 20
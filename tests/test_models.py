@@ -2,7 +2,7 @@
 
 import pytest
 
-from csv2iif.models import Transaction
+from csv2iif.models import RowError, Transaction, TransactionBatch, TransactionRow
 
 
 def test_transaction_valid():
@@ -158,3 +158,50 @@ def test_transaction_empty_name_allowed():
         memo="Payment",
     )
     assert transaction.name == ""
+
+
+def test_transaction_batch_validate_normalizes_amounts():
+    """Test batch validation normalizes amounts like Transaction."""
+    batch = TransactionBatch()
+    batch.append("01/15/2024", "Sales Income", "Checking", "1001", "John Doe", "$1,275", "Memo", 2)
+    batch.append("01/16/2024", "Checking", "Supplies", "", "", "75.5", "Paper", 3)
+
+    batch.validate()
+
+    assert len(batch) == 2
+    assert batch.amounts == ["1275.00", "75.50"]
+    assert batch[1] == TransactionRow(
+        "01/16/2024", "Checking", "Supplies", "", "", "75.50", "Paper"
+    )
+
+
+def test_transaction_batch_iterates_rows():
+    """Test iterating a batch yields rows with Transaction attribute names."""
+    batch = TransactionBatch()
+    batch.append("01/15/2024", "Sales Income", "Checking", "1001", "John Doe", "500", "Memo", 2)
+    batch.validate()
+
+    (row,) = list(batch)
+    assert row.debit_account == "Checking"
+    assert row.amount == "500.00"
+
+
+def test_transaction_batch_reports_first_invalid_row():
+    """Test batch validation raises RowError with the same message as Transaction."""
+    batch = TransactionBatch()
+    batch.append("01/15/2024", "Sales Income", "Checking", "1", "", "500", "Memo", 2)
+    batch.append("01/15/2024", "", "Checking", "2", "", "500", "", 5)
+    batch.append("13/45/2024", "Sales Income", "Checking", "3", "", "500", "Memo", 6)
+
+    with pytest.raises(RowError) as exc_info:
+        batch.validate()
+
+    assert exc_info.value.row_num == 5
+    with pytest.raises(ValueError) as single:
+        Transaction("01/15/2024", "", "Checking", "2", "", "500", "")
+    assert exc_info.value.reason == str(single.value)
+
+
+def test_transaction_batch_uses_slots():
+    """Test batches do not carry a per-instance __dict__."""
+    assert not hasattr(TransactionBatch(), "__dict__")
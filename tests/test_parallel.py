@@ -0,0 +1,143 @@
+"""Tests for parallel module."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.converter import Converter
+from csv2iif.csv_reader import CSVReader
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.parallel import convert_parallel
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+
+
+def create_temp_csv(content: str) -> Path:
+    """Helper to create temporary CSV file."""
+    with tempfile.NamedTemporaryFile(
+        mode="w", delete=False, suffix=".csv", newline=""
+    ) as temp_file:
+        temp_file.write(content)
+        return Path(temp_file.name)
+
+
+def make_rows(count: int) -> str:
+    """Helper to build data rows, some with quoted newlines and blank lines."""
+    lines = []
+    for i in range(count):
+        memo = f'"Line one\nline two {i}"' if i % 7 == 0 else f"Memo {i}"
+        lines.append(f'01/15/2024,Sales Income,Checking,{i},John Doe,"$1,{i % 1000:03d}.50",{memo}')
+        if i % 11 == 0:
+            lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def test_convert_parallel_matches_serial_output():
+    """Test chunked conversion output is identical to serial conversion."""
+    csv_file = create_temp_csv(HEADER + make_rows(300))
+    serial_path = csv_file.with_suffix(".serial.iif")
+    parallel_path = csv_file.with_suffix(".parallel.iif")
+
+    try:
+        Converter(str(csv_file), str(serial_path)).convert()
+        count = convert_parallel(
+            CSVReader(str(csv_file)), IIFWriter(str(parallel_path)), jobs=2, chunk_size=512
+        )
+
+        assert count == 300
+        assert parallel_path.read_bytes() == serial_path.read_bytes()
+    finally:
+        csv_file.unlink()
+        serial_path.unlink(missing_ok=True)
+        parallel_path.unlink(missing_ok=True)
+
+
+def test_convert_parallel_with_stray_quotes_matches_serial_output(tmp_path):
+    """Test quotes inside unquoted fields never move a chunk boundary into a record."""
+    rows = []
+    for i in range(400):
+        memo = '2" PVC pipe' if i % 9 == 0 else f"Memo {i}"
+        if i % 13 == 0:
+            memo = f'"Line one\nline ""two"" {i}"'
+        rows.append(f"01/15/2024,Sales Income,Checking,{i},O'Neil 6\" pipe,5.00,{memo}\n")
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(HEADER + "".join(rows), newline="")
+
+    Converter(str(csv_file), str(tmp_path / "serial.iif")).convert()
+    count = convert_parallel(
+        CSVReader(str(csv_file)), IIFWriter(str(tmp_path / "parallel.iif")), jobs=2, chunk_size=512
+    )
+
+    assert count == 400
+    assert (tmp_path / "parallel.iif").read_bytes() == (tmp_path / "serial.iif").read_bytes()
+
+
+def test_convert_parallel_reports_absolute_row_number():
+    """Test errors in later chunks report their row number in the whole file."""
+    rows = make_rows(200) + "13/45/2024,Sales Income,Checking,1,John Doe,5.00,Bad\n"
+    csv_file = create_temp_csv(HEADER + rows)
+    iif_path = csv_file.with_suffix(".iif")
+
+    try:
+        with pytest.raises(ValueError) as serial_error:
+            Converter(str(csv_file), str(iif_path)).convert()
+        with pytest.raises(ValueError) as parallel_error:
+            convert_parallel(
+                CSVReader(str(csv_file)), IIFWriter(str(iif_path)), jobs=2, chunk_size=256
+            )
+
+        assert str(parallel_error.value) == str(serial_error.value)
+        assert not iif_path.exists()
+    finally:
+        csv_file.unlink()
+
+
+def test_convert_parallel_headers_only():
+    """Test chunked conversion of a file with no data rows."""
+    csv_file = create_temp_csv(HEADER)
+    iif_path = csv_file.with_suffix(".iif")
+
+    try:
+        count = convert_parallel(CSVReader(str(csv_file)), IIFWriter(str(iif_path)), jobs=2)
+        assert count == 0
+        assert iif_path.read_text().endswith("!ENDTRNS\n")
+    finally:
+        csv_file.unlink()
+        iif_path.unlink(missing_ok=True)
+
+
+def test_convert_parallel_empty_file():
+    """Test chunked conversion of an empty file."""
+    csv_file = create_temp_csv("")
+
+    try:
+        with pytest.raises(ValueError, match="CSV file is empty"):
+            convert_parallel(CSVReader(str(csv_file)), IIFWriter("/tmp/unused.iif"), jobs=2)
+    finally:
+        csv_file.unlink()
+
+
+def test_convert_parallel_file_not_found():
+    """Test chunked conversion with non-existent input file."""
+    with pytest.raises(FileNotFoundError):
+        convert_parallel(CSVReader("/nonexistent/file.csv"), IIFWriter("/tmp/x.iif"), jobs=2)
+
+
+def test_converter_with_jobs():
+    """Test Converter dispatches to chunked conversion when jobs > 1."""
+    csv_file = create_temp_csv(HEADER + make_rows(20))
+    iif_path = csv_file.with_suffix(".iif")
+
+    try:
+        Converter(str(csv_file), str(iif_path), jobs=2).convert()
+        assert iif_path.read_text().count("ENDTRNS\n") == 21
+    finally:
+        csv_file.unlink()
+        iif_path.unlink(missing_ok=True)
+
+
+def test_converter_invalid_jobs():
+    """Test Converter rejects a non-positive job count."""
+    with pytest.raises(ValueError, match="jobs must be at least 1"):
+        Converter("input.csv", "output.iif", jobs=0)
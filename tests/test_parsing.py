@@ -0,0 +1,197 @@
+"""Tests for parsing module."""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from csv2iif.parsing import (
+    _fast_normalize_amount,
+    _normalize_amount_decimal,
+    days_in_month,
+    is_leap_year,
+    normalize_amount,
+    parse_date,
+)
+
+
+def strptime_result(value: str) -> tuple[int, int, int] | str:
+    """Helper returning strptime's parse result or error message."""
+    try:
+        parsed = datetime.strptime(value, "%m/%d/%Y")
+    except ValueError as e:
+        return str(e)
+    return parsed.year, parsed.month, parsed.day
+
+
+def parse_date_result(value: str) -> tuple[int, int, int] | str:
+    """Helper returning parse_date's result or error message."""
+    try:
+        return parse_date(value)
+    except ValueError as e:
+        return str(e)
+
+
+def test_parse_date_valid():
+    """Test parsing a valid date."""
+    assert parse_date("01/15/2024") == (2024, 1, 15)
+
+
+def test_parse_date_single_digit_fields():
+    """Test single-digit month and day are accepted like strptime."""
+    assert parse_date("1/5/2024") == (2024, 1, 5)
+
+
+def test_parse_date_leap_years():
+    """Test February 29 follows the Gregorian leap year rules."""
+    assert parse_date("02/29/2024") == (2024, 2, 29)
+    assert parse_date("02/29/2000") == (2000, 2, 29)
+    with pytest.raises(ValueError, match="day is out of range for month"):
+        parse_date("02/29/1900")
+    with pytest.raises(ValueError, match="day is out of range for month"):
+        parse_date("02/29/2023")
+
+
+def test_parse_date_month_lengths():
+    """Test day 31 is rejected in 30-day months."""
+    with pytest.raises(ValueError, match="day is out of range for month"):
+        parse_date("04/31/2024")
+
+
+def test_parse_date_invalid_format():
+    """Test non-matching strings raise strptime's message."""
+    with pytest.raises(ValueError, match="does not match format"):
+        parse_date("2024-01-15")
+
+
+def test_parse_date_matches_strptime():
+    """Test parse_date agrees with strptime, errors included."""
+    values = [
+        f"{month}/{day}/{year}"
+        for month in ["0", "00", "1", "01", "9", "09", "10", "12", "13", " 1"]
+        for day in ["0", "1", "01", " 1", "28", "29", "30", "31", "32"]
+        for year in ["0000", "0001", "1900", "2000", "2023", "2024", "20245", "24"]
+    ]
+    values += ["", "01/15/2024 ", " 01/15/2024", "01-15-2024", "01/15/2024x", "٠١/١٥/٢٠٢٤"]
+
+    for value in values:
+        assert parse_date_result(value) == strptime_result(value), value
+
+
+def test_parse_date_cache_counters():
+    """Test repeated dates are served from the LRU cache."""
+    parse_date.cache_clear()
+
+    parse_date("03/01/2024")
+    parse_date("03/01/2024")
+    parse_date("03/02/2024")
+
+    info = parse_date.cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+    assert info.maxsize is not None
+
+
+def test_is_leap_year():
+    """Test leap year rule."""
+    assert is_leap_year(2024)
+    assert not is_leap_year(2100)
+    assert is_leap_year(2400)
+
+
+def test_days_in_month():
+    """Test month lengths."""
+    assert days_in_month(2023, 2) == 28
+    assert days_in_month(2024, 2) == 29
+    assert days_in_month(2024, 12) == 31
+
+
+def amount_result(normalize, value: str) -> str | tuple[type, str]:
+    """Helper returning a normalizer's output or its exception type and message."""
+    try:
+        return normalize(value)
+    except Exception as e:
+        return type(e), str(e)
+
+
+def random_amounts(count: int) -> list[str]:
+    """Helper generating amount strings in many shapes, valid and invalid."""
+    rng = random.Random(1234)
+    alphabet = "0123456789$,.-+ eE_"
+    values = []
+    for _ in range(count):
+        whole = str(rng.randint(0, 10 ** rng.randint(0, 12)))
+        if rng.random() < 0.3:
+            whole = f"{int(whole):,}"
+        if rng.random() < 0.1:
+            whole = "0" * rng.randint(1, 3) + whole
+        fraction = "".join(rng.choice("0123456789") for _ in range(rng.randint(0, 4)))
+        value = whole + ("." + fraction if rng.random() < 0.7 else "")
+        if rng.random() < 0.4:
+            value = "$" * rng.randint(1, 2) + value
+        if rng.random() < 0.1:
+            value = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        values.append(value)
+    return values
+
+
+AMOUNT_EDGE_CASES = [
+    "500",
+    "500.",
+    "500.5",
+    "500.50",
+    "500.505",
+    "$1,275.00",
+    "$$1,275.00",
+    "1,2,3",
+    "1234,567.1",
+    ",100",
+    "0",
+    "0.00",
+    "000.001",
+    "0.01",
+    "007.5",
+    ".5",
+    "",
+    "$",
+    " 12.00 ",
+    "-5.00",
+    "+5.00",
+    "1e3",
+    "1_000",
+    "abc",
+    "Infinity",
+    "12345678901234567890123456789012345678901234.99",
+    "١٢٣",
+]
+
+
+def test_normalize_amount_fast_path_matches_decimal():
+    """Differential test: the fast path is byte-identical to the Decimal path."""
+    fast_hits = 0
+    for value in AMOUNT_EDGE_CASES + random_amounts(20000):
+        fast = _fast_normalize_amount(value)
+        expected = amount_result(_normalize_amount_decimal, value)
+        if fast is not None:
+            fast_hits += 1
+            assert fast == expected, value
+        assert amount_result(normalize_amount, value) == expected, value
+
+    assert fast_hits > 10000
+
+
+def test_normalize_amount_common_shapes_use_fast_path():
+    """Test the common amount shapes never need Decimal."""
+    assert _fast_normalize_amount("123.45") == "123.45"
+    assert _fast_normalize_amount("$1,234.50") == "1234.50"
+    assert _fast_normalize_amount("500") == "500.00"
+    assert _fast_normalize_amount("1.005") is None
+    assert _fast_normalize_amount("0.00") is None
+
+
+def test_normalize_amount_errors():
+    """Test invalid and non-positive amounts raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid amount 'abc'"):
+        normalize_amount("abc")
+    with pytest.raises(ValueError, match="Amount must be positive, got: 0.00"):
+        normalize_amount("0.00")
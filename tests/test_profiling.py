@@ -0,0 +1,98 @@
+"""Tests for profiling module."""
+
+import itertools
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.converter import Converter
+from csv2iif.profiling import StageTimer
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Make perf_counter advance by one second per call."""
+    ticks = itertools.count()
+    monkeypatch.setattr("csv2iif.profiling.time.perf_counter", lambda: float(next(ticks)))
+
+
+def test_stage_timer_charges_exclusive_time(fake_clock):
+    """Test nested stages are subtracted from their parent."""
+    timer = StageTimer()
+    with timer.stage("outer"), timer.stage("inner"):
+        pass
+
+    assert timer.totals == {"inner": 1.0, "outer": 2.0}
+    assert timer.calls == {"inner": 1, "outer": 1}
+
+
+def test_stage_timer_stops_on_exception(fake_clock):
+    """Test a stage is recorded when its block raises."""
+    timer = StageTimer()
+    with pytest.raises(ValueError), timer.stage("boom"):
+        raise ValueError("bad")
+
+    assert timer.calls == {"boom": 1}
+    assert timer._stack == []
+
+
+def test_stage_timer_wrap_times_only_next(fake_clock):
+    """Test wrap charges each next() call, not the consumer's work."""
+    timer = StageTimer()
+    with timer.stage("consumer"):
+        items = list(timer.wrap(["a", "b"], "produce"))
+
+    assert items == ["a", "b"]
+    assert timer.calls == {"produce": 3, "consumer": 1}
+    assert timer.totals["produce"] == 3.0
+
+
+def test_stage_timer_timed_function(fake_clock):
+    """Test timed wraps a function and passes its result through."""
+    timer = StageTimer()
+    double = timer.timed(lambda x: x * 2, "double")
+
+    assert double(4) == 8
+    assert timer.totals == {"double": 1.0}
+
+
+def test_stage_timer_format_report():
+    """Test the report lists every stage plus other and total rows."""
+    timer = StageTimer()
+    timer.record("read", 0.5)
+    timer.record("write", 0.25)
+
+    report = timer.format_report()
+
+    lines = report.splitlines()
+    assert lines[0].split() == ["Stage", "Time", "(s)", "Share", "Calls"]
+    assert lines[1].startswith("read")
+    assert lines[2].startswith("write")
+    assert lines[-2].startswith("other")
+    assert lines[-1].startswith("total")
+
+
+def test_converter_profiler_records_stages():
+    """Test a profiled conversion times each stage and writes the same output."""
+    csv_content = (
+        "date,credit-account,debit-account,number,name,amount,memo\n"
+        "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+        "\n"
+        "01/16/2024,Checking,Supplies,1002,Office Depot,75.50,Paper\n"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "in.csv"
+        csv_path.write_text(csv_content)
+        plain = Path(temp_dir) / "plain.iif"
+        profiled = Path(temp_dir) / "profiled.iif"
+
+        Converter(str(csv_path), str(plain)).convert()
+        timer = StageTimer()
+        assert Converter(str(csv_path), str(profiled), profiler=timer).convert().transactions == 2
+
+        assert plain.read_bytes() == profiled.read_bytes()
+
+    assert set(timer.totals) == {"read", "parse", "validate", "write"}
+    assert timer.calls["read"] == 5  # header, three records, end of file
+    assert timer._stack == []
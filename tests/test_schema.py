@@ -0,0 +1,204 @@
+"""Tests for schema module."""
+
+import json
+import pickle
+
+import pytest
+
+from csv2iif.cache import ConversionCache
+from csv2iif.converter import Converter
+from csv2iif.csv_reader import CSVReader
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.parallel import convert_parallel
+from csv2iif.schema import ColumnSchema, RowExtractor
+from csv2iif.validation import validate_file
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+BANK_HEADER = "Memo,Amount,Debit Acct,Credit Acct,Txn Date,Payee\n"
+BANK_SCHEMA = ColumnSchema(
+    aliases={
+        "date": ["Txn Date"],
+        "credit-account": ["Credit Acct"],
+        "debit-account": ["Debit Acct"],
+        "name": ["Payee"],
+    },
+    defaults={"number": ""},
+)
+
+
+def standard_row(i: int) -> str:
+    """Helper to build one row with the standard columns."""
+    return f"01/15/2024,Sales Income,Checking,,John Doe,{i}.00,Memo {i}\n"
+
+
+def bank_row(i: int) -> str:
+    """Helper to build the same row with the bank export's columns."""
+    return f"Memo {i},{i}.00,Checking,Sales Income,01/15/2024,John Doe\n"
+
+
+@pytest.fixture
+def bank_csv(tmp_path):
+    """A bank export and the IIF text of the same rows with standard columns."""
+    standard = tmp_path / "standard.csv"
+    standard.write_text(HEADER + "".join(standard_row(i) for i in range(1, 40)))
+    Converter(str(standard), str(tmp_path / "standard.iif")).convert()
+
+    csv_file = tmp_path / "bank.csv"
+    csv_file.write_text(BANK_HEADER + "".join(bank_row(i) for i in range(1, 40)))
+    return csv_file, (tmp_path / "standard.iif").read_text()
+
+
+def test_compile_aliases_and_defaults():
+    """Test aliases are matched case-insensitively and defaults fill gaps."""
+    headers = [" txn date ", "Payee", "CREDIT ACCT", "Debit Acct", "memo", "Amount"]
+    extractor = BANK_SCHEMA.compile(headers)
+
+    row = ["01/15/2024", " ", " Sales ", "Checking", " Memo ", "5"]
+    assert extractor.extract(row) == ("01/15/2024", "Sales", "Checking", "", "", "5", "Memo")
+    assert extractor.column_mapping == {
+        "date": 0,
+        "credit-account": 2,
+        "debit-account": 3,
+        "name": 1,
+        "amount": 5,
+        "memo": 4,
+    }
+    assert extractor.width == 6
+
+
+def test_default_fills_blank_cells():
+    """Test a default replaces blank cells of a column that is present."""
+    schema = ColumnSchema(defaults={"memo": "Imported", "name": ""})
+    extractor = schema.compile(HEADER.strip().split(","))
+
+    row = ["01/15/2024", "A", "B", "1", " ", "5", "  "]
+    assert extractor.extract(row)[4:] == ("", "5", "Imported")
+
+
+def test_column_name_wins_over_alias():
+    """Test the standard column name is used before any alias."""
+    schema = ColumnSchema(aliases={"date": ["Posted"]})
+
+    extractor = schema.compile(["Posted", *HEADER.strip().split(",")])
+
+    assert extractor.column_mapping["date"] == 1
+
+
+def test_missing_required_columns():
+    """Test fields without a column or default are reported."""
+    with pytest.raises(ValueError, match="Missing required columns: amount, date"):
+        BANK_SCHEMA.compile(["Credit Acct", "Debit Acct", "Payee", "Memo"])
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({"aliases": {"payee": ["Name"]}}, "Unknown columns in schema: payee"),
+        ({"defaults": {"memo": 0}}, "Default for memo must be a string"),
+        ({"aliases": {"date": [1]}}, "Alias for date must be a string"),
+        ({"aliases": {"name": ["Memo"]}}, "'Memo' is used for both memo and name"),
+        ({"aliases": {"date": "Posted", "number": "posted"}}, "used for both date and number"),
+        ({"columns": {}}, "Unknown schema keys: columns"),
+        ({"aliases": []}, "must be JSON objects"),
+        ([], "must be a JSON object"),
+    ],
+)
+def test_invalid_schema(data, message):
+    """Test invalid schemas are rejected with a clear message."""
+    with pytest.raises(ValueError, match=message):
+        ColumnSchema.from_dict(data)
+
+
+def test_load_and_to_dict(tmp_path):
+    """Test a schema file round-trips through to_dict."""
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(BANK_SCHEMA.to_dict()))
+
+    assert ColumnSchema.load(path) == BANK_SCHEMA
+    assert ColumnSchema().to_dict() == {}
+
+    path.write_text("{")
+    with pytest.raises(ValueError, match="Invalid schema file"):
+        ColumnSchema.load(path)
+
+
+def test_extractor_pickles():
+    """Test an extractor can be sent to a worker process."""
+    extractor = BANK_SCHEMA.compile(BANK_HEADER.strip().split(","))
+
+    copy = pickle.loads(pickle.dumps(extractor))
+
+    assert isinstance(copy, RowExtractor)
+    row = bank_row(1).strip().split(",")
+    assert copy.extract(row) == extractor.extract(row)
+
+
+def test_reader_uses_schema(bank_csv):
+    """Test rows and batches read through a schema match standard columns."""
+    csv_file, _ = bank_csv
+    reader = CSVReader(str(csv_file), schema=BANK_SCHEMA)
+
+    transactions = reader.read()
+    batch = next(reader.iter_batches())
+
+    assert transactions[0].credit_account == "Sales Income"
+    assert transactions[0].date == "01/15/2024"
+    assert batch.debit_accounts[0] == "Checking"
+    assert len(batch) == len(transactions) == 39
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_with_schema(tmp_path, bank_csv, jobs):
+    """Test serial and chunked conversion give the standard output."""
+    csv_file, expected = bank_csv
+    output = tmp_path / "out.iif"
+    reader = CSVReader(str(csv_file), schema=BANK_SCHEMA)
+
+    if jobs == 1:
+        Converter(str(csv_file), str(output), schema=BANK_SCHEMA).convert()
+    else:
+        convert_parallel(reader, IIFWriter(str(output)), jobs=jobs, chunk_size=200)
+
+    assert output.read_text() == expected
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_with_schema(tmp_path, jobs):
+    """Test whole-file validation reads columns through the schema."""
+    csv_file = tmp_path / "bank.csv"
+    rows = [bank_row(i) for i in range(1, 40)]
+    rows[9] = "Memo,1.00,Checking\n"
+    csv_file.write_text(BANK_HEADER + "".join(rows))
+
+    report = validate_file(str(csv_file), jobs=jobs, chunk_size=200, schema=BANK_SCHEMA)
+
+    assert report.records == 39
+    assert [(issue.row, issue.column, issue.kind) for issue in report.issues] == [
+        (11, "date, credit-account, name", "short_row")
+    ]
+
+
+def test_schema_is_part_of_cache_key(tmp_path, bank_csv):
+    """Test a cached conversion is not reused under another schema."""
+    csv_file, _ = bank_csv
+    cache = ConversionCache(tmp_path / "cache")
+    Converter(str(csv_file), str(tmp_path / "a.iif"), cache=cache, schema=BANK_SCHEMA).convert()
+
+    other = ColumnSchema(BANK_SCHEMA.aliases, {"number": "1"})
+    result = Converter(str(csv_file), str(tmp_path / "b.iif"), cache=cache, schema=other).convert()
+
+    assert not result.cached
+    assert "\t1\tMemo 1\n" in (tmp_path / "b.iif").read_text()
+
+
+def test_incremental_rebuilds_when_schema_changes(tmp_path, bank_csv):
+    """Test an incremental run with a different schema converts in full."""
+    csv_file, _ = bank_csv
+    output = tmp_path / "out.iif"
+    Converter(str(csv_file), str(output), incremental=True, schema=BANK_SCHEMA).convert()
+
+    other = ColumnSchema(BANK_SCHEMA.aliases, {"number": "1"})
+    result = Converter(str(csv_file), str(output), incremental=True, schema=other).convert()
+
+    assert not result.appended
+    assert result.transactions == 39
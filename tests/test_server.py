@@ -0,0 +1,261 @@
+"""Tests for server module."""
+
+import asyncio
+
+import pytest
+
+from csv2iif.converter import Converter
+from csv2iif.server import ConversionServer
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+
+
+def make_csv(rows: int, bad_row: int | None = None) -> str:
+    """Helper to build CSV text, optionally with one invalid amount."""
+    lines = [
+        f"01/15/2024,Sales Income,Checking,{i},John Doe,{'abc' if i == bad_row else '1.50'},"
+        f'"Memo\nline {i}"\n'
+        for i in range(rows)
+    ]
+    return HEADER + "".join(lines)
+
+
+def expected_iif(tmp_path, csv_text: str) -> str:
+    """Helper to convert CSV text through the file-based Converter."""
+    csv_file = tmp_path / "expected.csv"
+    csv_file.write_text(csv_text, newline="")
+    Converter(str(csv_file), str(tmp_path / "expected.iif")).convert()
+    return (tmp_path / "expected.iif").read_text()
+
+
+def run(test, **options):
+    """Helper to run a coroutine against a server on a free port."""
+
+    async def main():
+        server = ConversionServer(port=0, **options)
+        await server.start()
+        try:
+            return await test(server.port)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def parse_response(data: bytes) -> tuple[int, dict[str, str], bytes, bool]:
+    """Helper to split a chunked response into status, headers, body and completeness."""
+    head, _, rest = data.partition(b"\r\n\r\n")
+    while head.startswith(b"HTTP/1.1 100"):
+        head, _, rest = rest.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = dict(line.lower().split(": ", 1) for line in lines[1:])
+
+    body = b""
+    while rest:
+        size_line, _, rest = rest.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            return status, headers, body, True
+        body += rest[:size]
+        rest = rest[size + 2 :]
+    return status, headers, body, False
+
+
+async def request(port: int, head: str, body: bytes = b"") -> tuple[int, dict, bytes, bool]:
+    """Helper to send one request and read the whole response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return parse_response(data)
+
+
+def post(csv_text: str) -> tuple[str, bytes]:
+    """Helper to build a Content-Length POST."""
+    body = csv_text.encode()
+    return f"POST /convert HTTP/1.1\r\nContent-Length: {len(body)}\r\n", body
+
+
+def test_convert_content_length(tmp_path):
+    """Test a plain upload returns the same IIF as a file conversion."""
+    csv_text = make_csv(25)
+    status, headers, body, complete = run(lambda port: request(port, *post(csv_text)))
+
+    assert status == 200
+    assert headers["transfer-encoding"] == "chunked"
+    assert complete
+    assert body.decode() == expected_iif(tmp_path, csv_text)
+
+
+def test_convert_chunked_upload(tmp_path):
+    """Test a chunked upload split mid-row, with Expect: 100-continue."""
+    csv_text = make_csv(40).encode()
+    pieces = [csv_text[i : i + 37] for i in range(0, len(csv_text), 37)]
+    body = b"".join(b"%x;ext=1\r\n%s\r\n" % (len(p), p) for p in pieces) + b"0\r\nX-T: 1\r\n\r\n"
+    head = "POST /convert?x=1 HTTP/1.1\r\nTransfer-Encoding: chunked\r\nExpect: 100-continue\r\n"
+
+    status, _, response, complete = run(lambda port: request(port, head, body), batch_size=7)
+
+    assert status == 200
+    assert complete
+    assert response.decode() == expected_iif(tmp_path, csv_text.decode())
+
+
+def test_response_starts_before_upload_ends():
+    """Test IIF is streamed back while the upload is still being sent."""
+
+    async def test(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /convert HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+        first = make_csv(20).encode()
+        writer.write(b"%x\r\n%s\r\n" % (len(first), first))
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), timeout=5)
+
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        rest = await reader.read()
+        writer.close()
+        return status_line, rest
+
+    status_line, rest = run(test, batch_size=5)
+
+    assert status_line.startswith(b"HTTP/1.1 200")
+    assert rest.endswith(b"0\r\n\r\n")
+
+
+def test_invalid_header_is_400():
+    """Test header errors are reported with a 400 status."""
+    status, _, body, _ = run(lambda port: request(port, *post("date,amount\n01/15/2024,1\n")))
+
+    assert status == 400
+    assert b"Missing required columns" in body
+
+
+def test_invalid_first_batch_is_400():
+    """Test a bad row in the first batch is reported with a 400 status."""
+    status, _, body, _ = run(lambda port: request(port, *post(make_csv(5, bad_row=2))))
+
+    assert status == 400
+    assert b"row 4" in body
+
+
+def test_account_list_missing_type_is_400():
+    """Test an account without a type fails the request before streaming."""
+    status, _, body, _ = run(
+        lambda port: request(port, *post(make_csv(50))),
+        batch_size=10,
+        account_types={"Checking": "BANK"},
+    )
+
+    assert status == 400
+    assert b"No account type for 1 accounts: Sales Income" in body
+
+
+def test_invalid_later_row_aborts_response():
+    """Test a bad row after streaming started leaves the response incomplete."""
+    timings = []
+    status, _, body, complete = run(
+        lambda port: request(port, *post(make_csv(50, bad_row=40))),
+        batch_size=10,
+        on_request=timings.append,
+    )
+
+    assert status == 200
+    assert not complete
+    assert body.startswith(b"!TRNS")
+    assert timings[0].transactions == 0
+
+
+@pytest.mark.parametrize(
+    "head,status",
+    [
+        ("GET /convert HTTP/1.1\r\n", 405),
+        ("POST /health HTTP/1.1\r\n", 405),
+        ("GET /nowhere HTTP/1.1\r\n", 404),
+        ("POST /convert HTTP/1.1\r\n", 411),
+        ("POST /convert HTTP/1.1\r\nContent-Length: x\r\n", 400),
+        ("POST /convert HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n", 400),
+        ("NONSENSE\r\n", 400),
+    ],
+)
+def test_errors(head, status):
+    """Test malformed and unsupported requests."""
+    assert run(lambda port: request(port, head))[0] == status
+
+
+def test_health():
+    """Test the health check."""
+    status, _, body, complete = run(lambda port: request(port, "GET /health HTTP/1.1\r\n"))
+
+    assert (status, body, complete) == (200, b"ok\n", True)
+
+
+def test_concurrent_requests_with_timing(tmp_path):
+    """Test many simultaneous uploads each get their own correct result and timing."""
+    csv_texts = [make_csv(10 + i) for i in range(12)]
+    timings = []
+
+    async def test(port):
+        return await asyncio.gather(*(request(port, *post(text)) for text in csv_texts))
+
+    responses = run(test, max_concurrent=3, on_request=timings.append)
+
+    for csv_text, (status, _, body, complete) in zip(csv_texts, responses, strict=True):
+        assert status == 200 and complete
+        assert body.decode() == expected_iif(tmp_path, csv_text)
+    assert sorted(t.transactions for t in timings) == [10 + i for i in range(12)]
+    for timing in timings:
+        assert timing.bytes_in > 0 and timing.bytes_out > 0
+        assert 0 < timing.first_byte_seconds <= timing.total_seconds
+
+
+@pytest.mark.parametrize(
+    "head, body",
+    [
+        ("POST /convert HTTP/1.1", b""),
+        ("POST /convert HTTP/1.1\r\nContent-Length: 1000\r\n", b"date,credit-acc"),
+        ("POST /convert HTTP/1.1\r\nTransfer-Encoding: chunked\r\n", b"5\r\ndate,"),
+    ],
+)
+def test_stalled_request_is_408(head, body):
+    """Test a client that stops sending headers or body gets a 408."""
+    timings = []
+    status, _, response, complete = run(
+        lambda port: request(port, head, body), read_timeout=0.1, on_request=timings.append
+    )
+
+    assert (status, complete) == (408, True)
+    assert b"Timed out" in response
+    assert timings[0].status == 408
+
+
+def test_stall_after_response_started_aborts():
+    """Test a body that stalls mid-stream closes the connection without the final chunk."""
+
+    async def test(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        first = make_csv(20).encode()
+        writer.write(b"POST /convert HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+        writer.write(b"%x\r\n%s\r\n" % (len(first), first))
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return parse_response(data)
+
+    status, _, body, complete = run(test, batch_size=5, read_timeout=0.1)
+
+    assert status == 200
+    assert not complete
+    assert body.startswith(b"!TRNS")
+
+
+def test_max_concurrent_must_be_positive():
+    """Test the concurrency limit and read timeout are validated."""
+    with pytest.raises(ValueError, match="max_concurrent"):
+        ConversionServer(max_concurrent=0)
+    with pytest.raises(ValueError, match="read_timeout"):
+        ConversionServer(read_timeout=0)
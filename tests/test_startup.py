@@ -0,0 +1,115 @@
+"""Startup import regression tests for csv2iif."""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import csv2iif
+from csv2iif import cli
+
+PIPELINE_MODULES = {
+    "csv2iif.converter",
+    "csv2iif.csv_reader",
+    "csv2iif.iif_writer",
+    "csv2iif.models",
+    "csv2iif.parallel",
+}
+
+
+def imported_modules(*args: str, cwd: str | None = None) -> set[str]:
+    """Run Python with -X importtime and return the names of imported modules."""
+    env = dict(os.environ)
+    src = str(Path(csv2iif.__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        check=False,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_import_package_is_lazy():
+    """Test importing the package loads none of its submodules."""
+    modules = imported_modules("-c", "import csv2iif")
+
+    assert "csv2iif" in modules
+    assert not {m for m in modules if m.startswith("csv2iif.")}
+    assert "decimal" not in modules
+
+
+def test_help_loads_only_the_cli():
+    """Test --help does not import dotenv, logging or the pipeline."""
+    modules = imported_modules("-m", "csv2iif", "--help")
+
+    assert "csv2iif.cli" in modules
+    assert not modules & PIPELINE_MODULES
+    assert not modules & {"csv2iif.logger", "dotenv", "logging", "decimal"}
+
+
+def test_validate_does_not_load_writer():
+    """Test validate imports the reader but not the writer or converter."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "in.csv"
+        csv_path.write_text(
+            "date,credit-account,debit-account,number,name,amount,memo\n"
+            "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+        )
+        modules = imported_modules("-m", "csv2iif", "validate", str(csv_path), cwd=temp_dir)
+
+    assert "csv2iif.csv_reader" in modules
+    assert not modules & {"csv2iif.converter", "csv2iif.iif_writer", "csv2iif.parallel"}
+    assert "decimal" not in modules
+
+
+def test_lazy_exports():
+    """Test public names resolve on first access and are listed by dir()."""
+    from csv2iif.converter import Converter
+
+    assert csv2iif.Converter is Converter
+    assert "CSVReader" in dir(csv2iif)
+    with pytest.raises(AttributeError, match="has no attribute 'Missing'"):
+        csv2iif.Missing  # noqa: B018
+
+
+def test_load_dotenv_only_when_env_file_exists(monkeypatch):
+    """Test python-dotenv is only called when a .env file can be found."""
+    calls = []
+    monkeypatch.setattr("dotenv.load_dotenv", calls.append)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.setattr(cli.os.path, "isfile", lambda path: False)
+        cli._load_dotenv()
+        assert calls == []
+
+        monkeypatch.undo()
+        monkeypatch.setattr("dotenv.load_dotenv", calls.append)
+        monkeypatch.chdir(temp_dir)
+        (Path(temp_dir) / ".env").write_text("LOG_LEVEL=INFO\n")
+        cli._load_dotenv()
+        assert calls == [os.path.join(os.getcwd(), ".env")]
+
+
+def test_load_dotenv_reads_working_directory_file(monkeypatch, tmp_path):
+    """Test a .env file in the working directory is the one loaded."""
+    monkeypatch.delenv("CSV2IIF_DOTENV_TEST", raising=False)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text("CSV2IIF_DOTENV_TEST=loaded\n")
+
+    try:
+        cli._load_dotenv()
+        assert os.environ.get("CSV2IIF_DOTENV_TEST") == "loaded"
+    finally:
+        os.environ.pop("CSV2IIF_DOTENV_TEST", None)
@@ -0,0 +1,96 @@
+"""Tests for symbols module."""
+
+from csv2iif.converter import Converter
+from csv2iif.csv_reader import CSVReader
+from csv2iif.iif_writer import IIFWriter
+from csv2iif.parallel import convert_parallel
+from csv2iif.symbols import SymbolStats, SymbolTable
+
+CSV = "date,credit-account,debit-account,number,name,amount,memo\n" + "".join(
+    f"01/15/2024, Sales Income ,Checking,{i},Payee {i % 3},1.00,Memo\n" for i in range(30)
+)
+TYPES = {"Sales Income": "INC", "Checking": "BANK", "Savings": "BANK"}
+
+
+def test_intern_returns_shared_string():
+    """Test equal values come back as the same object."""
+    table = SymbolTable()
+    first = table.intern("".join(["Check", "ing"]))
+    second = table.intern("".join(["Checki", "ng"]))
+
+    assert first is second
+    assert list(table) == ["Checking"]
+    assert "Checking" in table
+    assert table.stats() == SymbolStats(distinct=1, total=2)
+
+
+def test_intern_all_and_update():
+    """Test interning a column and merging another table."""
+    table = SymbolTable()
+    column = table.intern_all(["a", "b", "a"])
+    other = SymbolTable()
+    other.intern_all(["b", "c"])
+
+    table.update(other)
+
+    assert column == ["a", "b", "a"]
+    assert list(table) == ["a", "b", "c"]
+    assert table.stats() == SymbolStats(distinct=3, total=5)
+    assert table.stats().repeat_ratio == 0.4
+    assert SymbolStats(0, 0).repeat_ratio is None
+
+
+def test_reader_interns_accounts_and_names(tmp_path):
+    """Test read() and iter_batches() share strings across rows."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(CSV)
+    reader = CSVReader(str(csv_file))
+
+    transactions = reader.read()
+
+    assert all(t.credit_account is transactions[0].credit_account for t in transactions)
+    assert transactions[0].credit_account == "Sales Income"
+    assert reader.accounts.stats() == SymbolStats(distinct=2, total=60)
+    assert reader.names.stats() == SymbolStats(distinct=3, total=30)
+
+    batch = next(reader.iter_batches())
+    assert batch.debit_accounts[0] is batch.debit_accounts[-1]
+    assert reader.accounts.stats() == SymbolStats(distinct=2, total=60)
+
+
+def test_conversion_reports_symbol_stats(tmp_path):
+    """Test the conversion result includes the symbol stats."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(CSV)
+
+    result = Converter(str(csv_file), str(tmp_path / "out.iif")).convert()
+
+    assert result.symbols["accounts"] == SymbolStats(distinct=2, total=60)
+    assert result.to_dict()["symbols"]["names"] == {"distinct": 3, "total": 30}
+
+
+def test_parallel_merges_worker_tables(tmp_path):
+    """Test chunked conversion collects every worker's values."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(CSV)
+    reader = CSVReader(str(csv_file))
+
+    convert_parallel(reader, IIFWriter(str(tmp_path / "out.iif")), jobs=2, chunk_size=200)
+
+    assert reader.accounts.stats() == SymbolStats(distinct=2, total=60)
+    assert list(reader.names) == ["Payee 0", "Payee 1", "Payee 2"]
+
+
+def test_parallel_account_list_matches_serial(tmp_path):
+    """Test chunked conversion lists the accounts seen by every worker."""
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(CSV.replace("Checking,2", "Savings,2"))
+    serial = tmp_path / "serial.iif"
+    Converter(str(csv_file), str(serial), account_types=TYPES).convert()
+    output = tmp_path / "out.iif"
+    writer = IIFWriter(str(output), account_types=TYPES)
+
+    convert_parallel(CSVReader(str(csv_file)), writer, jobs=2, chunk_size=200)
+
+    assert "ACCNT\tSavings\tBANK\n" in output.read_text()
+    assert output.read_text() == serial.read_text()
@@ -0,0 +1,192 @@
+"""Tests for validation module."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from csv2iif.validation import RowIssue, validate_file, write_report
+
+HEADER = "date,credit-account,debit-account,number,name,amount,memo\n"
+GOOD = "01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment\n"
+
+
+def create_temp_csv(content: str) -> Path:
+    """Helper to create temporary CSV file."""
+    with tempfile.NamedTemporaryFile(
+        mode="w", delete=False, suffix=".csv", newline=""
+    ) as temp_file:
+        temp_file.write(content)
+        return Path(temp_file.name)
+
+
+def make_rows(count: int) -> str:
+    """Helper to build data rows with a bad date every 10th row and blank lines."""
+    lines = []
+    for i in range(count):
+        date = "13/45/2024" if i % 10 == 3 else "01/15/2024"
+        memo = f'"Line one\nline two {i}"' if i % 7 == 0 else f"Memo {i}"
+        lines.append(f"{date},Sales Income,Checking,{i},John Doe,{i + 1}.50,{memo}")
+        if i % 11 == 0:
+            lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def test_validate_file_collects_every_error():
+    """Test every bad row is reported with its row, column and kind."""
+    content = (
+        HEADER
+        + GOOD
+        + "13/45/2024,Sales Income,Checking,1002,Jane,10.00,Bad date\n"
+        + "\n"
+        + "01/15/2024,,Checking,1003,Jane,10.00,\n"
+        + "01/15/2024,Sales Income,Checking,1004,Jane,abc,Bad amount\n"
+        + "01/15/2024,Sales Income,Checking,1005,Jane,-5.00,Negative\n"
+        + "01/15/2024,Sales Income\n"
+        + GOOD
+    )
+    csv_file = create_temp_csv(content)
+
+    try:
+        report = validate_file(str(csv_file))
+    finally:
+        csv_file.unlink()
+
+    assert report.records == 8
+    assert [(i.row, i.column, i.kind) for i in report.issues] == [
+        (3, "date", "invalid_date"),
+        (5, "credit-account, memo", "missing_required"),
+        (6, "amount", "invalid_amount"),
+        (7, "amount", "amount_not_positive"),
+        (8, "debit-account, number, name, amount, memo", "short_row"),
+    ]
+    assert report.issues[4].reason == "Expected at least 7 columns, found 2"
+    assert not report.ok
+    assert not report.truncated
+    assert sum(report.histogram().values()) == 5
+
+
+def test_validate_file_valid():
+    """Test a clean file produces an empty report."""
+    csv_file = create_temp_csv(HEADER + GOOD + GOOD)
+
+    try:
+        report = validate_file(str(csv_file))
+    finally:
+        csv_file.unlink()
+
+    assert report.ok
+    assert report.records == 2
+    assert "0 errors in 2 records" in report.format_text()
+
+
+def test_validate_file_max_errors():
+    """Test the scan stops once the error limit is reached."""
+    csv_file = create_temp_csv(HEADER + make_rows(200))
+
+    try:
+        report = validate_file(str(csv_file), max_errors=3)
+    finally:
+        csv_file.unlink()
+
+    assert len(report.issues) == 3
+    assert report.truncated
+    assert "stopped at --max-errors" in report.format_text()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_file_exactly_max_errors_is_not_truncated(jobs):
+    """Test a file with exactly the error limit is reported in full."""
+    csv_file = create_temp_csv(HEADER + make_rows(20))
+
+    try:
+        report = validate_file(str(csv_file), jobs=jobs, max_errors=2, chunk_size=200)
+    finally:
+        csv_file.unlink()
+
+    assert len(report.issues) == 2
+    assert not report.truncated
+    assert "stopped at --max-errors" not in report.format_text()
+
+
+@pytest.mark.parametrize("max_errors", [None, 5])
+def test_validate_file_parallel_matches_serial(max_errors):
+    """Test chunked parallel validation reports the same rows as a serial scan."""
+    csv_file = create_temp_csv(HEADER + make_rows(500))
+
+    try:
+        serial = validate_file(str(csv_file), max_errors=max_errors)
+        parallel = validate_file(str(csv_file), jobs=2, max_errors=max_errors, chunk_size=2048)
+    finally:
+        csv_file.unlink()
+
+    assert parallel.issues == serial.issues
+    assert len(serial.issues) == (max_errors or 50)
+    if max_errors is None:
+        assert parallel.records == serial.records
+
+
+def test_validate_file_parallel_with_stray_quotes_matches_serial(tmp_path):
+    """Test quotes inside unquoted fields do not change what parallel validation reports."""
+    rows = []
+    for i in range(400):
+        date = "13/45/2024" if i % 50 == 3 else "01/15/2024"
+        memo = '2" PVC pipe' if i % 9 == 0 else f"Memo {i}"
+        if i % 13 == 0:
+            memo = f'"Line one\nline ""two"" {i}"'
+        rows.append(f"{date},Sales Income,Checking,{i},John Doe,5.00,{memo}\n")
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text(HEADER + "".join(rows), newline="")
+
+    serial = validate_file(str(csv_file))
+    parallel = validate_file(str(csv_file), jobs=2, chunk_size=512)
+
+    assert parallel.issues == serial.issues
+    assert [issue.row for issue in serial.issues] == [5, 55, 105, 155, 205, 255, 305, 355]
+    assert parallel.records == serial.records == 400
+
+
+def test_validate_file_missing_columns():
+    """Test a bad header still fails fast."""
+    csv_file = create_temp_csv("date,amount\n01/15/2024,1.00\n")
+
+    try:
+        with pytest.raises(ValueError, match="Missing required columns"):
+            validate_file(str(csv_file), jobs=2)
+    finally:
+        csv_file.unlink()
+
+
+def test_validate_file_errors():
+    """Test missing, empty files and bad arguments are rejected."""
+    with pytest.raises(FileNotFoundError):
+        validate_file("/nonexistent/file.csv")
+
+    csv_file = create_temp_csv("")
+    try:
+        with pytest.raises(ValueError, match="empty"):
+            validate_file(str(csv_file))
+        with pytest.raises(ValueError, match="jobs"):
+            validate_file(str(csv_file), jobs=0)
+        with pytest.raises(ValueError, match="max_errors"):
+            validate_file(str(csv_file), max_errors=0)
+    finally:
+        csv_file.unlink()
+
+
+def test_write_report_json():
+    """Test the JSON report lists errors and the histogram."""
+    csv_file = create_temp_csv(HEADER + make_rows(20))
+    report_file = csv_file.with_suffix(".json")
+
+    try:
+        write_report(validate_file(str(csv_file)), report_file, "json")
+        data = json.loads(report_file.read_text())
+    finally:
+        csv_file.unlink()
+        report_file.unlink(missing_ok=True)
+
+    assert data["error_count"] == 2
+    assert data["histogram"] == {"invalid_date": 2}
+    assert RowIssue(**data["errors"][0]).kind == "invalid_date"
@@ -0,0 +1,173 @@
+"""Tests for watch module."""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from csv2iif import watch
+from csv2iif.batch import _convert_one
+from csv2iif.watch import Watcher, WatchStats
+
+VALID = """date,credit-account,debit-account,number,name,amount,memo
+01/15/2024,Sales Income,Checking,1001,John Doe,500.00,Payment
+01/16/2024,Sales Income,Checking,1002,Jane Doe,20.00,Payment
+"""
+INVALID = """date,credit-account,debit-account,number,name,amount,memo
+13/45/2024,Sales Income,Checking,1001,John Doe,500.00,Payment
+"""
+
+
+def crash_on_crash_files(input_path, output_path, cache=None):
+    """Worker function that kills its process for files named crash*.csv."""
+    if input_path.name.startswith("crash"):
+        os._exit(1)
+    return _convert_one(input_path, output_path, cache)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    """Inbox and outbox directories."""
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    return inbox, tmp_path / "outbox"
+
+
+def test_converts_and_moves_files(dirs):
+    """Test good files go to done and bad ones to failed with an error file."""
+    inbox, outbox = dirs
+    (inbox / "good.csv").write_text(VALID)
+    (inbox / "bad.csv").write_text(INVALID)
+    (inbox / "notes.txt").write_text("ignored")
+
+    with Watcher(inbox, outbox, jobs=2) as watcher:
+        watcher.poll()
+        assert watcher.stats.running == 0
+        watcher.poll()
+        assert watcher.stats.running == 2
+        watcher.drain()
+
+    assert (outbox / "good.iif").read_text().count("\nENDTRNS\n") == 2
+    assert not (outbox / "bad.iif").exists()
+    assert (inbox / "done" / "good.csv").exists()
+    assert (inbox / "failed" / "bad.csv").exists()
+    assert "row 2" in (inbox / "failed" / "bad.csv.error").read_text()
+    assert (inbox / "notes.txt").exists()
+
+    stats = watcher.stats
+    assert (stats.converted, stats.failed, stats.transactions) == (1, 1, 2)
+    assert stats.max_latency_seconds >= stats.last_latency_seconds > 0
+    assert stats.mean_latency_seconds is not None
+
+
+def test_waits_for_file_to_stop_changing(dirs):
+    """Test a file that grows between polls is not converted yet."""
+    inbox, outbox = dirs
+    csv_file = inbox / "upload.csv"
+    csv_file.write_text(VALID.splitlines(keepends=True)[0])
+
+    with Watcher(inbox, outbox) as watcher:
+        watcher.poll()
+        csv_file.write_text(VALID)
+        watcher.poll()
+        assert watcher.stats.running == 0
+        watcher.poll()
+        assert watcher.stats.running == 1
+
+    assert (inbox / "done" / "upload.csv").exists()
+
+
+def test_queue_depth_is_bounded_by_jobs(dirs):
+    """Test extra files wait in the queue and queued files stay in the inbox on exit."""
+    inbox, outbox = dirs
+    for i in range(3):
+        (inbox / f"{i}.csv").write_text(VALID)
+
+    with Watcher(inbox, outbox, jobs=1) as watcher:
+        watcher.poll()
+        watcher.poll()
+        assert (watcher.stats.queued, watcher.stats.running) == (2, 1)
+
+    assert watcher.stats.converted == 1
+    assert len(list(inbox.glob("*.csv"))) == 2
+
+
+def test_name_collision_in_done(dirs):
+    """Test a second file with the same name does not overwrite the first."""
+    inbox, outbox = dirs
+    (inbox / "done").mkdir()
+    (inbox / "done" / "a.csv").write_text("earlier")
+    (inbox / "a.csv").write_text(VALID)
+
+    Watcher(inbox, outbox, interval=0.01).run(once=True)
+
+    assert (inbox / "done" / "a.csv").read_text() == "earlier"
+    assert (inbox / "done" / "a.1.csv").read_text() == VALID
+
+
+def test_run_until_stopped_with_status_file(dirs):
+    """Test run() polls until the stop event is set and keeps the status file current."""
+    inbox, outbox = dirs
+    status = inbox.parent / "status.json"
+    (inbox / "a.csv").write_text(VALID)
+    stop = threading.Event()
+    watcher = Watcher(inbox, outbox, interval=0.01, status_path=status)
+
+    def stop_when_done():
+        while not (inbox / "done" / "a.csv").exists():
+            stop.wait(0.01)
+        stop.set()
+
+    thread = threading.Thread(target=stop_when_done)
+    thread.start()
+    stats = watcher.run(stop)
+    thread.join()
+
+    assert stats.converted == 1
+    assert json.loads(status.read_text())["converted"] == 1
+
+
+def test_invalid_arguments(dirs, tmp_path):
+    """Test bad directories and settings are rejected."""
+    inbox, outbox = dirs
+    with pytest.raises(NotADirectoryError):
+        Watcher(tmp_path / "missing", outbox)
+    with pytest.raises(ValueError, match="jobs"):
+        Watcher(inbox, outbox, jobs=0)
+    with pytest.raises(ValueError, match="interval"):
+        Watcher(inbox, outbox, interval=0)
+
+
+def test_stats_without_finished_files():
+    """Test the mean latency is undefined before any file finishes."""
+    assert WatchStats().mean_latency_seconds is None
+    assert WatchStats().to_dict()["mean_latency_seconds"] is None
+
+
+def test_outputs_go_to_outbox_not_inbox(dirs):
+    """Test outputs are named after the input in the outbox."""
+    inbox, outbox = dirs
+    (inbox / "Bank Export.CSV").write_text(VALID)
+
+    stats = Watcher(inbox, outbox, interval=0.01).run(once=True)
+
+    assert stats.converted == 1
+    assert [p.name for p in Path(outbox).iterdir()] == ["Bank Export.iif"]
+
+
+def test_file_that_kills_workers_is_failed_after_retry(dirs, monkeypatch):
+    """Test a file that breaks the pool is retried once, then marked failed."""
+    monkeypatch.setattr(watch, "_convert_one", crash_on_crash_files)
+    inbox, outbox = dirs
+    status = inbox.parent / "status.json"
+    (inbox / "crash.csv").write_text(VALID)
+    (inbox / "good.csv").write_text(VALID)
+
+    stats = Watcher(inbox, outbox, interval=0.01, status_path=status).run(once=True)
+
+    assert (stats.converted, stats.failed, stats.queued, stats.running) == (1, 1, 0, 0)
+    assert json.loads(status.read_text())["failed"] == 1
+    assert (inbox / "done" / "good.csv").exists()
+    assert "Worker failed" in (inbox / "failed" / "crash.csv.error").read_text()